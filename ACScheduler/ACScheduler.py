@@ -3,6 +3,36 @@ from tensorflow.keras.layers import Dense
 from tensorflow.keras import layers,models
 import numpy as np
 from env.platform import *
+from profiling import profiler
+from inference import MASKED_LOGIT, save_networks
+
+def masked_logits(logits, mask):
+    # 只保留 mask 为 True 的动作；某一行没有任何可行动作时保留该行全部动作，由环境推进时间
+    mask = tf.convert_to_tensor(mask, dtype=tf.bool)
+    mask = tf.logical_or(mask, tf.logical_not(tf.reduce_any(mask, axis=-1, keepdims=True)))
+    return tf.where(mask, logits, tf.fill(tf.shape(logits), tf.constant(MASKED_LOGIT, logits.dtype)))
+
+def behaviour_cloning_step(model, optimizer, inputs, labels, masks):
+    # 一个小批量的行为克隆：logits 按样本展平后只在可行动作上做交叉熵，更新 model 的参数并返回该批的损失
+    with tf.GradientTape() as tape:
+        logits = tf.reshape(model(inputs), [len(labels), -1])
+        logits = masked_logits(logits, np.reshape(masks, (len(labels), -1)))
+        loss = tf.reduce_mean(tf.nn.sparse_softmax_cross_entropy_with_logits(labels=labels, logits=logits))
+    grads = tape.gradient(loss, model.trainable_variables)
+    optimizer.apply_gradients(zip(grads, model.trainable_variables))
+    return float(loss)
+
+def behaviour_cloning(model, optimizer, batches, epochs):
+    # batches(epoch) 产生该 epoch 的 (输入, 标签, 可行掩码) 小批量；返回最后一个 epoch 的平均损失
+    loss = 0.0
+    for epoch in range(epochs):
+        losses = [behaviour_cloning_step(model, optimizer, inputs, labels, masks) for inputs, labels, masks in batches(epoch)]
+        loss = float(np.mean(losses)) if losses else 0.0
+    return loss
+
+def dense_layers(model):
+    # 模型中按前向顺序排列的 (kernel, bias, 激活函数名)
+    return [(layer.kernel.numpy(), layer.bias.numpy(), layer.activation.__name__) for layer in model.layers]
 
 class ActorNetwork(models.Model):
     """
@@ -37,25 +67,128 @@ class CriticNetwork(models.Model):
         x = self.dense3(x)
         return self.value(x)
     
+class PairEncoder(models.Model):
+    """
+    对最后一维做的两层全连接编码，前面可以有任意多个维度(批、任务或节点)，所有行共享权重
+    """
+    def __init__(self, hidden_dim, output_dim):
+        super(PairEncoder, self).__init__()
+        self.hidden = Dense(hidden_dim, activation='relu')
+        self.output_layer = Dense(output_dim)
+    def call(self, inputs):
+        return self.output_layer(self.hidden(inputs))
+
+class PairScoringActor(models.Model):
+    """
+    与节点数无关的放置策略：就绪任务和节点分别经过共享的全连接编码器得到 query/key，
+    每个 (就绪任务, 节点) 对的 logit = query·key/sqrt(embed_dim) + 任务-节点特征的线性项。
+    输入是 env.pair_features.PairFeatures 产生的矩阵，可带批维：(B, R, Ft), (B, N, Fn), (B, R, N, Fp) -> (B, R, N)，
+    权重与集群规模无关，在小集群上训练后可直接用于更大的集群。
+    """
+    def __init__(self, embed_dim=32, hidden_dim=64, learning_rate=0.001):
+        super(PairScoringActor, self).__init__()
+        self.embed_dim = embed_dim
+        self.task_encoder = PairEncoder(hidden_dim, embed_dim)
+        self.node_encoder = PairEncoder(hidden_dim, embed_dim)
+        self.pair_scorer = Dense(1)
+        self.pretrain_optimizer = tf.keras.optimizers.Adam(learning_rate=learning_rate)
+    def call(self, inputs):
+        task_features, node_features, pair_features = inputs
+        query = self.task_encoder(task_features)
+        key = self.node_encoder(node_features)
+        scores = tf.matmul(query, key, transpose_b=True) / np.sqrt(self.embed_dim).astype(np.float32)
+        return scores + tf.squeeze(self.pair_scorer(pair_features), axis=-1)
+    def pair_logits(self, observation):
+        # 单个 PairObservation 的 (就绪任务数, 节点数) logits，供 env.pair_features.schedule_pairs 使用
+        return self((tf.convert_to_tensor(observation.task_features), tf.convert_to_tensor(observation.node_features),
+                     tf.convert_to_tensor(observation.pair_features))).numpy()
+    def export_weights(self, path):
+        # 供不依赖 TensorFlow 的 inference.PairPolicyEngine 加载
+        return save_networks(path, task_encoder=dense_layers(self.task_encoder), node_encoder=dense_layers(self.node_encoder),
+                             pair_scorer=[(self.pair_scorer.kernel.numpy(), self.pair_scorer.bias.numpy(), 'linear')])
+    def pretrain(self, demonstrations, epochs=10, batch_size=32, seed=0):
+        """
+        行为克隆：demonstrations 是 heuristics.collect_pair_demonstrations 生成的 [(PairObservation, 任务行号, 节点下标)]，
+        在每一步所有可行的 (任务, 节点) 对上做交叉熵训练。一个批内的观测补齐到相同的任务数和节点数，补齐部分被掩码。
+        返回最后一个 epoch 的平均损失。
+        """
+        rng = np.random.default_rng(seed)
+
+        def batches(epoch):
+            order = rng.permutation(len(demonstrations))
+            for start in range(0, len(order), batch_size):
+                batch = [demonstrations[k] for k in order[start:start + batch_size]]
+                tasks = max(len(observation) for observation, _, _ in batch)
+                nodes = max(len(observation.node_features) for observation, _, _ in batch)
+                task_features = np.zeros((len(batch), tasks, batch[0][0].task_features.shape[1]), dtype=np.float32)
+                node_features = np.zeros((len(batch), nodes, batch[0][0].node_features.shape[1]), dtype=np.float32)
+                pair_features = np.zeros((len(batch), tasks, nodes, batch[0][0].pair_features.shape[2]), dtype=np.float32)
+                masks = np.zeros((len(batch), tasks, nodes), dtype=bool)
+                labels = np.zeros(len(batch), dtype=np.int32)
+                for b, (observation, row, node) in enumerate(batch):
+                    r, n = observation.pair_features.shape[:2]
+                    task_features[b, :r] = observation.task_features
+                    node_features[b, :n] = observation.node_features
+                    pair_features[b, :r, :n] = observation.pair_features
+                    masks[b, :r, :n] = observation.masks
+                    labels[b] = row * nodes + node
+                yield (task_features, node_features, pair_features), labels, masks
+
+        return behaviour_cloning(self, self.pretrain_optimizer, batches, epochs)
+
 class DistributedActorCritic:
-    def __init__(self, state_dim, action_dim,actor_lr=0.001, critic_lr=0.001):
+    def __init__(self, state_dim, action_dim,actor_lr=0.001, critic_lr=0.001, gae_lambda=0.95, entropy_coef=0.01):
+        self.state_dim = state_dim
+        self.action_dim = action_dim
         self.actor = ActorNetwork(state_dim, action_dim)
         self.critic = CriticNetwork(state_dim)
         self.actor_optimizer = tf.keras.optimizers.Adam(learning_rate=actor_lr)
         self.critic_optimizer = tf.keras.optimizers.Adam(learning_rate=critic_lr)
-    def select_action(self,state):
+        # 行为克隆预训练单独使用的优化器，预训练积累的 Adam 动量不会带入之后的强化学习更新
+        self.pretrain_optimizer = tf.keras.optimizers.Adam(learning_rate=actor_lr)
+        self.gae_lambda = gae_lambda
+        self.entropy_coef = entropy_coef
+        # 轨迹更新编译成固定输入签名的计算图：时间维 T 和环境维 K 可变，状态维固定
+        self._compiled_update = tf.function(self._trajectory_update, input_signature=[
+            tf.TensorSpec([None, None, state_dim], tf.float32),  # states [T, K, D]
+            tf.TensorSpec([None, None], tf.int32),  # actions [T, K]
+            tf.TensorSpec([None, None], tf.float32),  # rewards [T, K]
+            tf.TensorSpec([None, None], tf.float32),  # dones [T, K]
+            tf.TensorSpec([None, state_dim], tf.float32),  # last_states [K, D]，用于自举最后一步之后的价值
+            tf.TensorSpec([], tf.float32),  # gamma
+            tf.TensorSpec([None, None, action_dim], tf.bool),  # masks [T, K, A]，采样时的可行动作
+        ])
+    def export_weights(self, path):
+        # 把 actor/critic 的全连接层权重写成扁平文件，供不依赖 TensorFlow 的 inference.PolicyEngine 加载
+        return save_networks(path, actor=dense_layers(self.actor), critic=dense_layers(self.critic))
+    def select_action(self,state,mask=None):
+        # mask 为环境的 action_mask()，只在放得下当前任务的节点中采样
         state_tensor = tf.convert_to_tensor(np.expand_dims(state,axis=0), dtype=tf.float32)
         logits = self.actor(state_tensor)
+        if mask is not None:
+            logits = masked_logits(logits, np.expand_dims(mask, axis=0))
         action = tf.random.categorical(logits, 1)[0, 0].numpy()
         return action
-    def update(self,state,action,reward,next_state,gamma):
-        state = tf.convert_to_tensor(np.expand_dims(state, axis=0), dtype=tf.float32)
-        next_state = tf.convert_to_tensor(np.expand_dims(next_state, axis=0), dtype=tf.float32)
+    def select_actions(self,states,masks=None):
+        # 对一批状态(例如 VectorCloudEdgeEnv 的堆叠观测)做一次前向计算，每个状态采样一个动作
+        logits = self.actor(tf.convert_to_tensor(states, dtype=tf.float32))
+        if masks is not None:
+            logits = masked_logits(logits, masks)
+        return tf.random.categorical(logits, 1)[:, 0].numpy()
+    def update(self,state,action,reward,next_state,gamma,done=False):
+        # 支持单条转移，也支持第一维为批大小的一批转移；done 为真的转移不再自举下一状态的价值
+        state = np.asarray(state, dtype=np.float32)
+        batched = state.ndim == 2
+        state = tf.convert_to_tensor(state if batched else np.expand_dims(state, axis=0), dtype=tf.float32)
+        next_state = tf.convert_to_tensor(next_state if batched else np.expand_dims(next_state, axis=0), dtype=tf.float32)
+        action = tf.reshape(tf.convert_to_tensor(action, dtype=tf.int32), [-1])
+        reward = tf.reshape(tf.convert_to_tensor(reward, dtype=tf.float32), [-1])
+        not_done = 1.0 - tf.reshape(tf.cast(done, tf.float32), [-1])
 
         with tf.GradientTape() as critic_tape:
-            state_value = self.critic(state)
-            next_state_value = self.critic(next_state)
-            advantage = reward + gamma * next_state_value - state_value
+            state_value = tf.squeeze(self.critic(state), axis=-1)
+            next_state_value = tf.squeeze(self.critic(next_state), axis=-1)
+            advantage = reward + gamma * not_done * tf.stop_gradient(next_state_value) - state_value
             critic_loss = tf.reduce_mean(tf.square(advantage))
 
         critic_grads = critic_tape.gradient(critic_loss, self.critic.trainable_variables)
@@ -63,103 +196,170 @@ class DistributedActorCritic:
 
         with tf.GradientTape() as actor_tape:
             logits = self.actor(state)
-            actor_loss = -tf.reduce_mean(tf.nn.sparse_softmax_cross_entropy_with_logits(labels=[action], logits=logits) * advantage)
+            # 交叉熵即 -log pi(a|s)，最小化 交叉熵*优势 等价于沿策略梯度方向提高优势为正的动作概率
+            actor_loss = tf.reduce_mean(tf.nn.sparse_softmax_cross_entropy_with_logits(labels=action, logits=logits) * tf.stop_gradient(advantage))
         
         actor_grads = actor_tape.gradient(actor_loss, self.actor.trainable_variables)
         self.actor_optimizer.apply_gradients(zip(actor_grads, self.actor.trainable_variables))
 
-def train_distributed_actor_critic(env, agent, gamma=0.99, num_episodes=1000, time_slice=10):
+    def pretrain_actor(self, states, actions, masks=None, epochs=10, batch_size=256, seed=0):
+        """
+        行为克隆：用示范数据(例如 heuristics.collect_demonstrations 生成的启发式调度)做有监督的交叉熵训练，
+        为强化学习提供更好的初始策略。返回最后一个 epoch 的平均损失。
+        """
+        states = np.asarray(states, dtype=np.float32)
+        actions = np.asarray(actions, dtype=np.int32)
+        masks = np.ones((len(actions), self.action_dim), dtype=bool) if masks is None else np.asarray(masks, dtype=bool)
+        rng = np.random.default_rng(seed)
+
+        def batches(epoch):
+            order = rng.permutation(len(actions))
+            for start in range(0, len(order), batch_size):
+                batch = order[start:start + batch_size]
+                yield states[batch], actions[batch], masks[batch]
+
+        return behaviour_cloning(self.actor, self.pretrain_optimizer, batches, epochs)
+
+    def pretrain_actor_from_store(self, store, epochs=10, batch_size=256, seed=0, shuffle_buffer=65536):
+        """
+        与 pretrain_actor 相同的行为克隆，但数据来自 trajectories.TrajectoryStore：每个 epoch 从内存映射的列文件中
+        流式读取打乱的小批量，不把整个数据集载入内存。返回最后一个 epoch 的平均损失。
+        """
+        def batches(epoch):
+            for batch in store.minibatches(batch_size, columns=('observations', 'masks', 'actions'),
+                                           shuffle_buffer=shuffle_buffer, seed=seed + epoch):
+                yield batch['observations'], batch['actions'], batch['masks']
+
+        return behaviour_cloning(self.actor, self.pretrain_optimizer, batches, epochs)
+
+    def update_trajectory(self, states, actions, rewards, dones, last_states, gamma, masks=None):
+        """
+        用一段 T 步、K 个环境的轨迹做一次更新：GAE(lambda) 优势估计(lambda=1 即 T 步回报)，
+        actor 和 critic 的损失在同一个梯度带里计算，整个过程运行在编译好的计算图中。
+        masks[T, K, A] 是采样时使用的动作掩码，策略梯度和熵都在掩码后的分布上计算；不提供时视为全部可行。
+        返回 (actor_loss, critic_loss)。
+        """
+        if masks is None:
+            masks = np.ones(np.shape(actions) + (self.action_dim,), dtype=bool)
+        actor_loss, critic_loss = self._compiled_update(
+            tf.convert_to_tensor(states, dtype=tf.float32), tf.convert_to_tensor(actions, dtype=tf.int32),
+            tf.convert_to_tensor(rewards, dtype=tf.float32), tf.convert_to_tensor(dones, dtype=tf.float32),
+            tf.convert_to_tensor(last_states, dtype=tf.float32), tf.constant(gamma, dtype=tf.float32),
+            tf.convert_to_tensor(masks, dtype=tf.bool))
+        return float(actor_loss), float(critic_loss)
+
+    def _trajectory_update(self, states, actions, rewards, dones, last_states, gamma, masks):
+        shape = tf.shape(actions)
+        flat_states = tf.reshape(states, [-1, self.state_dim])
+        flat_actions = tf.reshape(actions, [-1])
+        last_values = tf.squeeze(self.critic(last_states), axis=-1)
+
+        with tf.GradientTape(persistent=True) as tape:
+            values = tf.reshape(tf.squeeze(self.critic(flat_states), axis=-1), shape)
+            next_values = tf.concat([tf.stop_gradient(values[1:]), last_values[None]], axis=0)
+            not_done = 1.0 - dones
+            deltas = rewards + gamma * not_done * next_values - tf.stop_gradient(values)
+            # 从最后一步向前累积 GAE 优势
+            advantages = tf.scan(lambda acc, x: x[0] + gamma * self.gae_lambda * x[1] * acc,
+                                 (deltas, not_done), initializer=tf.zeros_like(last_values), reverse=True)
+            returns = tf.stop_gradient(advantages + values)
+            critic_loss = tf.reduce_mean(tf.square(returns - values))
+
+            logits = masked_logits(self.actor(flat_states), tf.reshape(masks, [-1, self.action_dim]))
+            cross_entropy = tf.nn.sparse_softmax_cross_entropy_with_logits(labels=flat_actions, logits=logits)
+            entropy = -tf.reduce_sum(tf.nn.softmax(logits) * tf.nn.log_softmax(logits), axis=-1)
+            actor_loss = tf.reduce_mean(cross_entropy * tf.stop_gradient(tf.reshape(advantages, [-1]))) - self.entropy_coef * tf.reduce_mean(entropy)
+
+        critic_grads = tape.gradient(critic_loss, self.critic.trainable_variables)
+        actor_grads = tape.gradient(actor_loss, self.actor.trainable_variables)
+        del tape
+        self.critic_optimizer.apply_gradients(zip(critic_grads, self.critic.trainable_variables))
+        self.actor_optimizer.apply_gradients(zip(actor_grads, self.actor.trainable_variables))
+        return actor_loss, critic_loss
+
+def train_vectorized_actor_critic(vec_env, agent, gamma=0.99, num_steps=10000, rollout_length=32):
+    """
+    在 VectorCloudEdgeEnv 上训练：每步对 K 个环境的观测做一次批量前向，
+    每收集 rollout_length 步就用这段 [T, K] 轨迹做一次编译好的更新。返回训练期间结束的所有episode信息。
+    """
+    num_envs = vec_env.num_envs
+    states = np.zeros((rollout_length, num_envs, vec_env.observation_dim), dtype=np.float32)
+    actions = np.zeros((rollout_length, num_envs), dtype=np.int32)
+    rewards = np.zeros((rollout_length, num_envs), dtype=np.float32)
+    dones = np.zeros((rollout_length, num_envs), dtype=np.float32)
+    masks = np.zeros((rollout_length, num_envs, vec_env.action_dim), dtype=bool)
+    observations = vec_env.reset()
+    episodes = []
+    for step in range(num_steps):
+        t = step % rollout_length
+        states[t] = observations
+        masks[t] = vec_env.action_masks
+        actions[t] = agent.select_actions(observations, masks[t])
+        observations, rewards[t], dones[t], infos = vec_env.step(actions[t])
+        if t == rollout_length - 1:
+            agent.update_trajectory(states, actions, rewards, dones, observations, gamma, masks)
+        for info in infos:
+            episodes.append(info)
+            print(f"Env {info['env']} episode finished: return={info['episode_return']:.1f}, makespan={info['makespan']:.1f}")
+    return episodes
+
+def train_distributed_actor_critic(env, agent, gamma=0.99, num_episodes=1000, time_slice=10, recorder=None):
+    """
+    在单个环境上训练：每收集 time_slice 步(或episode结束)就用这段轨迹做一次编译好的批量更新。
+    开启 profiling.profiler 时记录观测、动作选择、环境推进和更新各阶段的耗时，每个episode结束时保存一条摘要。
+    recorder(trajectories.TrajectoryWriter)不为空时，每段轨迹连同更新前 critic 给出的状态价值一起追加写入，每个episode为一块。
+    """
+    states = np.zeros((time_slice, 1, env.observation_dim), dtype=np.float32)
+    actions = np.zeros((time_slice, 1), dtype=np.int32)
+    rewards = np.zeros((time_slice, 1), dtype=np.float32)
+    dones = np.zeros((time_slice, 1), dtype=np.float32)
+    masks = np.zeros((time_slice, 1, env.action_dim), dtype=bool)
     for episode in range(num_episodes):
-        state = env.reset()
+        env.reset()
+        state = env.get_observation().copy()
         done = False
-        tatal_reward = 0
+        total_reward = 0
 
         while not done:
-            actions = []
-            
-            
-
-        while not done:
-            #计算策略网络（actor network）和值函数网络（critic network）的梯度
-            with tf.GradientTape() as actor_tape, tf.GradientTape() as critic_tape:
-                resource_utilization = np.array(env.get_state()['resource_state']).flatten()
-                task_history_vector = np.array(list(env.get_state()['task_history']))
-                
-                state_tensor = tf.convert_to_tensor(np.concatenate([resource_utilization, task_history_vector]), dtype=tf.float32)
-
-                policy_logits = actor(state_tensor)
-                action_probabilities = tf.nn.softmax(policy_logits)
-                actions = []
-                for _ in range(time_slice):
-                    action_index = tf.random.categorical(policy_logits, 1)[0, 0].numpy()
-                    task = env.pending_tasks[0]
-                    docker = Docker(container_id=f'container_{task.task_id}', cpu=task.runtime, ram=task.runtime, storage=task.runtime)
-                    nodes = env.cloud_masters + env.edge_masters + [worker for master in env.cloud_masters + env.edge_masters for worker in master.workers]
-                    node = nodes[action_index]
-                    actions.append((task, docker, node))
-
-                next_state, reward, done = env.step(actions)
-                next_resource_utilization = np.array(next_state['resource_utilization']).flatten()
-                next_task_history_vector = np.array(list(next_state['task_history']))
-                next_state_tensor = tf.convert_to_tensor(np.concatenate([next_resource_utilization, next_task_history_vector]), dtype=tf.float32)
-
-                value = critic(state_tensor)
-                next_value = critic(next_state_tensor)
-                advantage = reward + gamma * next_value - value
-
-                policy_loss = -tf.reduce_mean(tf.nn.sparse_softmax_cross_entropy_with_logits(labels=action_index, logits=policy_logits) * advantage)
-                value_loss = tf.reduce_mean(tf.square(advantage))
-
-                total_loss = policy_loss + value_loss
-
-            actor_grads = actor_tape.gradient(total_loss, actor.trainable_variables)
-            critic_grads = critic_tape.gradient(total_loss, critic.trainable_variables)
-            actor_optimizer.apply_gradients(zip(actor_grads, actor.trainable_variables))
-            critic_optimizer.apply_gradients(zip(critic_grads, critic.trainable_variables))
-
-            state = next_state
-            if done:
-                print(f"Episode {episode + 1}/{num_episodes} completed")
+            steps = 0
+            while steps < time_slice and not done:
+                with profiler.span('train.action_mask'):
+                    masks[steps, 0] = env.action_mask()
+                with profiler.span('train.select_action'):
+                    action_index = agent.select_action(state, masks[steps, 0])
+                with profiler.span('train.env_step'):
+                    _, reward, done = env.step([env.make_action(action_index)])
+                states[steps, 0] = state
+                actions[steps, 0] = action_index
+                rewards[steps, 0] = reward
+                dones[steps, 0] = done
+                total_reward += reward
+                with profiler.span('train.observation'):
+                    state = env.get_observation().copy()
+                steps += 1
+            if recorder is not None:
+                with profiler.span('train.record'):
+                    values = tf.squeeze(agent.critic(states[:steps, 0]), axis=-1).numpy()
+                    recorder.append_batch(states[:steps, 0], masks[:steps, 0], actions[:steps, 0], rewards[:steps, 0],
+                                          dones[:steps, 0], values)
+            with profiler.span('train.update'):
+                agent.update_trajectory(states[:steps], actions[:steps], rewards[:steps], dones[:steps], state[None], gamma, masks[:steps])
+
+        if recorder is not None:
+            recorder.end_episode(total_reward=total_reward, makespan=env.get_makespan())
+        profiler.end_episode(tasks=len(env.tasks), total_reward=float(total_reward), makespan=float(env.get_makespan()))
+        print(f"Episode {episode + 1}/{num_episodes} completed, total reward: {total_reward:.2f}, makespan: {env.get_makespan():.2f}")
 
 def execute_policy(env, actor):
-    state = env.reset()
+    # 用训练好的 actor 贪心地调度整个工作流：每步在放得下当前任务的节点中选概率最大的一个，返回 makespan
+    env.reset()
     done = False
     while not done:
-        resource_utilization = np.array(env.get_state()['resource_utilization']).flatten()
-        task_history_vector = np.array(list(env.get_state()['task_history']))
-        state_tensor = tf.convert_to_tensor(np.concatenate([resource_utilization, task_history_vector]), dtype=tf.float32)
-
-        policy_logits = actor(state_tensor)
-        action_probabilities = tf.nn.softmax(policy_logits)
-        action_index = tf.argmax(action_probabilities).numpy()
-
-        task = env.pending_tasks[0]
-        docker = Docker(container_id=f'container_{task.task_id}', cpu=task.runtime, ram=task.runtime, storage=task.runtime)
-        nodes = env.cloud_masters + env.edge_masters + [worker for master in env.cloud_masters + env.edge_masters for worker in master.workers]
-        node = nodes[action_index]
-
-        actions = [(task, docker, node)]
-        next_state, reward, done = env.step(actions)
-        state = next_state
+        state_tensor = tf.convert_to_tensor(env.get_observation()[None], dtype=tf.float32)
+        policy_logits = masked_logits(actor(state_tensor), env.action_mask()[None])
+        action_index = int(tf.argmax(policy_logits, axis=-1)[0])
+
+        _, reward, done = env.step([env.make_action(action_index)])
         if done:
             print("Execution completed")
-        
-
-
-
-
-
-
-
-                    
-
-        
-
-
-
-
-
-
-
-
-
+    return env.get_makespan()
@@ -0,0 +1,240 @@
+"""
+单机多进程的 actor-learner 训练(A3C/IMPALA 风格)：
+每个 actor 进程运行自己的 CloudEdgeEnv 和一份 ActorNetwork，把固定长度的轨迹写入共享内存；
+learner(主进程)凑齐一批轨迹后做一次编译好的 update_trajectory，再通过共享内存把新的 actor 权重广播给所有 actor。
+actor 使用的权重可能落后 learner 几个版本，这里与 A3C 一样直接按同策略处理，不做 V-trace 修正。
+"""
+import multiprocessing as mp
+import os
+import queue
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+FLOAT_BYTES = 4
+
+
+class TrajectorySlot:
+    """
+    一个 actor 的共享内存轨迹槽：states[T, D]、actions[T]、rewards[T]、dones[T]、last_state[D] 和采样时的动作掩码 masks[T, A]，
+    全部是同一块共享内存上的 NumPy 视图，写入和读取都不经过 pickle。
+    """
+    def __init__(self, rollout_length, state_dim, action_dim, name=None):
+        self.rollout_length = rollout_length
+        self.state_dim = state_dim
+        self.action_dim = action_dim
+        size = FLOAT_BYTES * (rollout_length * state_dim + 3 * rollout_length + state_dim) + rollout_length * action_dim
+        self.shm = shared_memory.SharedMemory(name=name, create=name is None, size=size)
+        self.name = self.shm.name
+        offset = 0
+        self.states, offset = self._view(np.float32, (rollout_length, state_dim), offset)
+        self.actions, offset = self._view(np.int32, (rollout_length,), offset)
+        self.rewards, offset = self._view(np.float32, (rollout_length,), offset)
+        self.dones, offset = self._view(np.float32, (rollout_length,), offset)
+        self.last_state, offset = self._view(np.float32, (state_dim,), offset)
+        self.masks, offset = self._view(np.bool_, (rollout_length, action_dim), offset)
+
+    def _view(self, dtype, shape, offset):
+        array = np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=offset)
+        return array, offset + array.nbytes
+
+    def close(self, unlink=False):
+        # 先释放视图再关闭共享内存，否则 close 会因为仍有导出的缓冲区而失败
+        self.states = self.actions = self.rewards = self.dones = self.last_state = self.masks = None
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+class WeightBuffer:
+    # 共享内存中的扁平 float32 权重，按 shapes 切分还原成 Keras 的权重列表
+    def __init__(self, shapes, name=None):
+        self.shapes = shapes
+        self.sizes = [int(np.prod(shape)) for shape in shapes]
+        size = FLOAT_BYTES * max(sum(self.sizes), 1)
+        self.shm = shared_memory.SharedMemory(name=name, create=name is None, size=size)
+        self.name = self.shm.name
+        self.flat = np.ndarray((sum(self.sizes),), dtype=np.float32, buffer=self.shm.buf)
+
+    def write(self, weights):
+        offset = 0
+        for weight, size in zip(weights, self.sizes):
+            self.flat[offset:offset + size] = np.ravel(weight)
+            offset += size
+
+    def read(self):
+        weights = []
+        offset = 0
+        for shape, size in zip(self.shapes, self.sizes):
+            weights.append(self.flat[offset:offset + size].reshape(shape).copy())
+            offset += size
+        return weights
+
+    def close(self, unlink=False):
+        self.flat = None
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+def _actor_worker(worker_id, env_factory, seed, rollout_length, slot_name, weight_name, weight_shapes,
+                  weight_version, weight_lock, slot_free, ready_queue, episode_queue, stop_event):
+    # 每个 actor 只用一个线程做推理，多个进程并行才能占满所有核
+    os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '3')
+    import tensorflow as tf
+    from ACScheduler import ActorNetwork, masked_logits
+    tf.config.threading.set_intra_op_parallelism_threads(1)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+    tf.random.set_seed(seed)
+
+    env = env_factory()
+    actor = ActorNetwork(env.observation_dim, env.action_dim)
+    actor(np.zeros((1, env.observation_dim), dtype=np.float32))
+    slot = TrajectorySlot(rollout_length, env.observation_dim, env.action_dim, name=slot_name)
+    weights = WeightBuffer(weight_shapes, name=weight_name)
+    local_version = -1
+
+    @tf.function(input_signature=[tf.TensorSpec([1, env.observation_dim], tf.float32), tf.TensorSpec([1, env.action_dim], tf.bool)])
+    def sample(state, mask):
+        return tf.random.categorical(masked_logits(actor(state), mask), 1)[0, 0]
+
+    env.reset()
+    state = env.get_observation().copy()
+    episode_return = 0.0
+    try:
+        while not stop_event.is_set():
+            if weight_version.value != local_version:
+                with weight_lock:
+                    local_version = weight_version.value
+                    actor.set_weights(weights.read())
+            # 等待 learner 取走上一段轨迹后再覆盖槽
+            while not slot_free.wait(timeout=0.1):
+                if stop_event.is_set():
+                    return
+            slot_free.clear()
+            for t in range(rollout_length):
+                slot.masks[t] = env.action_mask()
+                action = int(sample(state[None], slot.masks[t][None]))
+                _, reward, done = env.step([env.make_action(action)])
+                slot.states[t] = state
+                slot.actions[t] = action
+                slot.rewards[t] = reward
+                slot.dones[t] = done
+                episode_return += reward
+                if done:
+                    episode_queue.put((worker_id, time.time(), float(episode_return), float(env.get_makespan())))
+                    episode_return = 0.0
+                    env.reset()
+                state = env.get_observation().copy()
+            slot.last_state[:] = state
+            ready_queue.put(worker_id)
+    finally:
+        slot.close()
+        weights.close()
+
+
+def _next_ready(ready_queue, workers):
+    # 等待下一个写好轨迹的 actor；actor 进程异常退出时报错而不是一直阻塞
+    while True:
+        try:
+            return ready_queue.get(timeout=1.0)
+        except queue.Empty:
+            dead = [worker for worker in workers if not worker.is_alive()]
+            if dead:
+                raise RuntimeError(f"Actor process exited with code {dead[0].exitcode}.")
+
+
+def train_actor_learner(env_factory, num_workers=None, rollout_length=32, batch_workers=None, gamma=0.99,
+                        max_updates=1000, target_reward=None, reward_window=10, time_limit=None, agent=None, seed=0):
+    """
+    启动 num_workers 个 actor 进程并在当前进程中运行 learner。
+    每次更新使用 batch_workers 个 actor 的轨迹(默认全部)，拼成 [T, K] 批次。
+    最近 reward_window 个episode的平均回报达到 target_reward、更新次数达到 max_updates 或超过 time_limit 秒时停止。
+    返回包含 agent、更新次数、耗时、达到目标的时间以及 (时间, 回报, makespan) 历史的字典。
+    """
+    from ACScheduler import DistributedActorCritic
+
+    num_workers = num_workers or os.cpu_count()
+    batch_workers = min(batch_workers or num_workers, num_workers)
+    probe = env_factory()
+    state_dim, action_dim = probe.observation_dim, probe.action_dim
+    del probe
+    if agent is None:
+        agent = DistributedActorCritic(state_dim, action_dim)
+    agent.actor(np.zeros((1, state_dim), dtype=np.float32))
+
+    context = mp.get_context('spawn')  # TensorFlow 在 fork 出的子进程中不安全
+    initial_weights = agent.actor.get_weights()
+    weights = WeightBuffer([w.shape for w in initial_weights])
+    weights.write(initial_weights)
+    weight_version = context.Value('l', 0, lock=False)
+    weight_lock = context.Lock()
+    ready_queue = context.Queue()
+    episode_queue = context.Queue()
+    stop_event = context.Event()
+    slots = [TrajectorySlot(rollout_length, state_dim, action_dim) for _ in range(num_workers)]
+    slot_free = [context.Event() for _ in range(num_workers)]
+    for event in slot_free:
+        event.set()
+
+    workers = [context.Process(target=_actor_worker, daemon=True, args=(
+        i, env_factory, seed + i, rollout_length, slots[i].name, weights.name, weights.shapes,
+        weight_version, weight_lock, slot_free[i], ready_queue, episode_queue, stop_event)) for i in range(num_workers)]
+    for worker in workers:
+        worker.start()
+
+    states = np.zeros((rollout_length, batch_workers, state_dim), dtype=np.float32)
+    actions = np.zeros((rollout_length, batch_workers), dtype=np.int32)
+    rewards = np.zeros((rollout_length, batch_workers), dtype=np.float32)
+    dones = np.zeros((rollout_length, batch_workers), dtype=np.float32)
+    last_states = np.zeros((batch_workers, state_dim), dtype=np.float32)
+    masks = np.zeros((rollout_length, batch_workers, action_dim), dtype=bool)
+
+    history = []
+    updates = 0
+    reached_at = None
+    start = time.time()
+    try:
+        while updates < max_updates and (time_limit is None or time.time() - start < time_limit):
+            for k in range(batch_workers):
+                worker_id = _next_ready(ready_queue, workers)
+                slot = slots[worker_id]
+                states[:, k] = slot.states
+                actions[:, k] = slot.actions
+                rewards[:, k] = slot.rewards
+                dones[:, k] = slot.dones
+                last_states[k] = slot.last_state
+                masks[:, k] = slot.masks
+                slot_free[worker_id].set()
+            agent.update_trajectory(states, actions, rewards, dones, last_states, gamma, masks)
+            updates += 1
+            with weight_lock:
+                weights.write(agent.actor.get_weights())
+                weight_version.value += 1
+
+            while True:
+                try:
+                    _, finished_at, episode_return, makespan = episode_queue.get_nowait()
+                except queue.Empty:
+                    break
+                history.append((finished_at - start, episode_return, makespan))
+            if target_reward is not None and len(history) >= reward_window:
+                recent = np.mean([episode_return for _, episode_return, _ in history[-reward_window:]])
+                if recent >= target_reward:
+                    reached_at = time.time() - start
+                    break
+    finally:
+        stop_event.set()
+        for event in slot_free:
+            event.set()
+        for worker in workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+        for slot in slots:
+            slot.close(unlink=True)
+        weights.close(unlink=True)
+
+    return {'agent': agent, 'updates': updates, 'elapsed': time.time() - start, 'reached_target_at': reached_at,
+            'history': history}
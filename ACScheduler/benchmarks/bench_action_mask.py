@@ -0,0 +1,48 @@
+"""
+动作掩码基准：随机策略分别在全部节点上均匀采样和只在 action_mask() 允许的节点上采样，
+比较每个episode的步数、放置失败(节点放不下容器)的步数和 makespan，并给出 action_mask() 本身的耗时。
+集群越大、工作流越宽，随机选到已满节点的概率越高，掩码节省的步数越多。
+
+用法(在 ACScheduler 目录下)：python benchmarks/bench_action_mask.py
+"""
+import time
+
+import numpy as np
+
+from common import load_workflow, make_env, montage_paths
+
+
+def run_episode(env, rng, use_mask):
+    env.reset()
+    steps = failed = 0
+    done = False
+    while not done:
+        mask = env.action_mask()
+        feasible = np.flatnonzero(mask)
+        if use_mask and len(feasible):
+            action = int(rng.choice(feasible))
+        else:
+            action = int(rng.integers(env.action_dim))
+        failed += not mask[action]
+        _, _, done = env.step([env.make_action(action)])
+        steps += 1
+    return steps, failed, env.get_makespan()
+
+
+def main():
+    print(f"{'tasks':>6} {'steps':>7} {'failed':>7} {'makespan':>9} | {'masked steps':>12} {'failed':>7} {'makespan':>9} | {'mask(us)':>9}")
+    for path in montage_paths():
+        parser = load_workflow(path)
+        env = make_env(parser)
+        unmasked = run_episode(env, np.random.default_rng(0), use_mask=False)
+        masked = run_episode(env, np.random.default_rng(0), use_mask=True)
+        env.reset()
+        start = time.perf_counter()
+        for _ in range(1000):
+            env.action_mask()
+        mask_time = (time.perf_counter() - start) / 1000
+        print(f"{len(env.tasks):>6} {unmasked[0]:>7} {unmasked[1]:>7} {unmasked[2]:>9.1f} | {masked[0]:>12} {masked[1]:>7} {masked[2]:>9.1f} | {mask_time * 1e6:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
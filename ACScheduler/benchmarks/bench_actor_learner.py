@@ -0,0 +1,36 @@
+"""
+actor-learner 多进程训练的扩展性基准：actor 进程数从 1 增加到 N，
+记录达到目标回报(最近10个episode的平均回报)所需的墙钟时间，以及每秒的更新数和episode数。
+
+用法(在 ACScheduler 目录下)：python benchmarks/bench_actor_learner.py [目标回报] [最多actor数] [时间上限(秒)]
+"""
+import os
+import sys
+
+from common import WORKFLOW_DIR
+
+from actor_learner import train_actor_learner
+from env.vector_env import make_env_fn
+import run
+
+
+def main():
+    target_reward = float(sys.argv[1]) if len(sys.argv) > 1 else -505.0
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    time_limit = float(sys.argv[3]) if len(sys.argv) > 3 else 300.0
+    env_factory = make_env_fn(os.path.join(WORKFLOW_DIR, 'MONTAGE.n.50.0.dax'), run.cloud_masters, run.edge_masters, topology=run.topology)
+
+    worker_counts = sorted({1, max_workers} | {2 ** i for i in range(1, 8) if 2 ** i < max_workers})
+    print(f"{'workers':>8} {'to target(s)':>13} {'updates/s':>10} {'episodes/s':>11} {'best avg return':>16}")
+    for num_workers in worker_counts:
+        result = train_actor_learner(env_factory, num_workers=num_workers, max_updates=10 ** 9,
+                                     target_reward=target_reward, time_limit=time_limit)
+        returns = [episode_return for _, episode_return, _ in result['history']]
+        best = max((sum(returns[i - 10:i]) / 10 for i in range(10, len(returns) + 1)), default=float('nan'))
+        reached = f"{result['reached_target_at']:.1f}" if result['reached_target_at'] is not None else 'not reached'
+        print(f"{num_workers:>8} {reached:>13} {result['updates'] / result['elapsed']:>10.2f} "
+              f"{len(returns) / result['elapsed']:>11.2f} {best:>16.1f}")
+
+
+if __name__ == '__main__':
+    main()
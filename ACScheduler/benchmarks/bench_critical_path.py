@@ -0,0 +1,37 @@
+"""
+makespan 下界跟踪基准：在自带的 Montage 工作流上用随机可行策略跑完整个episode，
+比较 reward_mode='cost' 与 'makespan' 的每步耗时(增量跟踪的额外开销)，
+以及每步都按拓扑序重新计算 bottom level 的开销；同时报告初始下界、最终 makespan 和下界的最大相对误差。
+
+用法(在 ACScheduler 目录下)：python benchmarks/bench_critical_path.py
+"""
+import time
+
+import numpy as np
+
+from common import load_workflow, make_env, montage_paths, random_episode
+
+
+def main():
+    print(f"{'tasks':>6} {'cost(us)':>9} {'makespan(us)':>13} {'recompute(us)':>14} {'initial bound':>14} "
+          f"{'makespan':>9} {'max gap':>8}")
+    for path in montage_paths()[::3]:
+        workflow = load_workflow(path)
+        step = {}
+        for mode in ('cost', 'makespan'):
+            env = make_env(workflow, reward_mode=mode)
+            initial = env.makespan_lower_bound()
+            # 记录每步之后的下界
+            bounds = []
+            _, step[mode] = random_episode(env, after_step=lambda env: bounds.append(env.makespan_lower_bound()))
+        start = time.perf_counter()
+        for _ in range(10):
+            env.task_table.bottom_levels()
+        recompute = (time.perf_counter() - start) / 10
+        makespan = env.get_makespan()
+        print(f"{len(env.tasks):>6} {step['cost'] * 1e6:>9.1f} {step['makespan'] * 1e6:>13.1f} {recompute * 1e6:>14.1f} "
+              f"{initial:>14.1f} {makespan:>9.1f} {(makespan - np.array(bounds)).max() / makespan:>8.1%}")
+
+
+if __name__ == '__main__':
+    main()
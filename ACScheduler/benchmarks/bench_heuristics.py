@@ -0,0 +1,29 @@
+"""
+启发式基线基准：在自带的 Montage 工作流上用 HEFT、PEFT、Min-Min 调度整个episode，
+统计调度耗时(含预计算和环境推进)与 makespan，并与在可行节点中均匀随机选择的策略对比。
+
+用法(在 ACScheduler 目录下)：python benchmarks/bench_heuristics.py
+"""
+import time
+
+from common import load_workflow, make_env, montage_paths, random_makespan
+
+from heuristics import SCHEDULERS
+
+
+def main():
+    header = f"{'tasks':>6} {'random':>9}" + ''.join(f" {name + '(s)':>12} {'time(ms)':>9}" for name in SCHEDULERS)
+    print(header)
+    for path in montage_paths():
+        parser = load_workflow(path)
+        env = make_env(parser)
+        row = f"{len(env.tasks):>6} {random_makespan(env):>9.1f}"
+        for scheduler_cls in SCHEDULERS.values():
+            start = time.perf_counter()
+            makespan, _ = scheduler_cls(env).run()
+            row += f" {makespan:>12.1f} {(time.perf_counter() - start) * 1e3:>9.1f}"
+        print(row)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+TensorFlow 与纯 NumPy 推理对比：导出一个(随机初始化的)DistributedActorCritic 的权重，
+检查 inference.PolicyEngine 复现的 logits/价值与 TensorFlow 一致，并比较
+- 新进程中 导入+加载 的启动耗时(导入 ACScheduler 需要加载 TensorFlow，PolicyEngine 不需要)
+- 不同批大小下每次前向计算的耗时(TensorFlow eager 调用 vs NumPy)
+
+用法(在 ACScheduler 目录下)：python benchmarks/bench_inference.py
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '3')
+
+import numpy as np
+
+from common import ROOT
+
+from inference import PolicyEngine
+
+STATE_DIM = 815
+ACTION_DIM = 30
+
+
+def startup_time(code):
+    # 新进程中执行 code 的耗时(秒)和结束时的常驻内存(MB)
+    script = ("import time; start = time.perf_counter()\n" + code + "\nelapsed = time.perf_counter() - start\n"
+              "rss = next(int(line.split()[1]) for line in open('/proc/self/status') if line.startswith('VmRSS'))\n"
+              "print(elapsed, rss / 1024)")
+    output = subprocess.run([sys.executable, '-c', script], cwd=ROOT, capture_output=True, text=True, check=True,
+                            env={**os.environ, 'TF_CPP_MIN_LOG_LEVEL': '3'}).stdout.split()
+    return float(output[-2]), float(output[-1])
+
+
+def per_call(fn, calls):
+    fn()
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls
+
+
+def main():
+    from ACScheduler import DistributedActorCritic
+    import tensorflow as tf
+
+    rng = np.random.default_rng(0)
+    agent = DistributedActorCritic(STATE_DIM, ACTION_DIM)
+    path = os.path.join(tempfile.mkdtemp(prefix='policy-'), 'policy.weights')
+    states = rng.normal(size=(256, STATE_DIM)).astype(np.float32)
+    agent.actor(states[:1])
+    agent.critic(states[:1])
+    agent.export_weights(path)
+    engine = PolicyEngine(path)
+
+    logits_error = np.abs(engine.logits(states) - agent.actor(states).numpy()).max()
+    values_error = np.abs(engine.values(states) - agent.critic(states).numpy()[:, 0]).max()
+    print(f"weights file {os.path.getsize(path) / 2 ** 10:.1f}KB, max |logit diff| {logits_error:.2e}, "
+          f"max |value diff| {values_error:.2e}")
+
+    tf_start, tf_rss = startup_time("from ACScheduler import DistributedActorCritic")
+    np_start, np_rss = startup_time(f"from inference import PolicyEngine; PolicyEngine({path!r})")
+    print(f"startup: TensorFlow import {tf_start:.2f}s ({tf_rss:.0f}MB RSS), "
+          f"PolicyEngine import+load {np_start * 1e3:.1f}ms ({np_rss:.0f}MB RSS)")
+
+    print(f"{'batch':>6} {'tf(us)':>9} {'numpy(us)':>10} {'numpy/state(us)':>16}")
+    for batch in (1, 8, 64, 256):
+        inputs = states[:batch]
+        tensor = tf.convert_to_tensor(inputs)
+        tf_time = per_call(lambda: agent.actor(tensor).numpy(), 200)
+        np_time = per_call(lambda: engine.logits(inputs), 2000)
+        print(f"{batch:>6} {tf_time * 1e6:>9.1f} {np_time * 1e6:>10.1f} {np_time * 1e6 / batch:>16.2f}")
+
+
+if __name__ == '__main__':
+    main()
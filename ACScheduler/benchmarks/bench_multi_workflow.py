@@ -0,0 +1,35 @@
+"""
+多工作流到达模式基准：同样数量的工作流以不同的泊松到达率进入共享集群，
+到达越密集同时在途的工作流越多。记录每步耗时(应与在途数量基本无关)、平均在途工作流数，以及 slowdown 的均值/P95。
+
+用法(在 ACScheduler 目录下)：python benchmarks/bench_multi_workflow.py [--count 40] [--pattern 'MONTAGE.n.[1-3]00.0.dax']
+"""
+import argparse
+
+from common import WORKFLOW_DIR, random_episode
+
+from env.arrivals import MultiWorkflowEnv
+import run
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=40, help='到达的工作流数')
+    parser.add_argument('--pattern', default='MONTAGE.n.[1-3]00.0.dax')
+    args = parser.parse_args()
+
+    print(f"{'rate(/s)':>9} {'tasks':>6} {'steps':>6} {'in flight':>10} {'step(us)':>9} {'makespan':>9} "
+          f"{'slowdown':>9} {'p95':>7}")
+    for rate in (0.01, 0.05, 0.2, 1.0, 10.0):
+        env = MultiWorkflowEnv.from_directory(run.cloud_masters, run.edge_masters, WORKFLOW_DIR, args.count,
+                                              process='poisson', rate=rate, pattern=args.pattern, topology=run.topology)
+        # 统计每步时在途(已到达但未完成)的工作流数
+        in_flight = []
+        steps, step_s = random_episode(env, before_step=lambda env: in_flight.append(env.workflows_in_flight()))
+        summary = env.slowdown_summary()
+        print(f"{rate:>9} {len(env.tasks):>6} {steps:>6} {sum(in_flight) / steps:>10.1f} {step_s * 1e6:>9.1f} "
+              f"{env.get_makespan():>9.1f} {summary['mean']:>9.2f} {summary['p95']:>7.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+流级网络竞争模型基准：
+1. 同一工作流、同一(轮询)放置策略下，静态带宽与 max-min 公平分享(network=True)的 makespan、每步耗时和事件数；
+2. FlowNetwork 本身在大量并发流下每次开始/结束一条流的重新分配开销(只重算受影响的连通分量)。
+
+用法(在 ACScheduler 目录下)：python benchmarks/bench_network.py [--flows 1000 5000]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from common import load_workflow, make_env, montage_paths
+
+from env.network import FlowNetwork
+from env.topology_builder import TopologySpec, build_platform
+
+
+def run_episode(parser, network):
+    env = make_env(parser, network=network)
+    nodes = env.node_list
+    steps = 0
+    done = False
+    start = time.perf_counter()
+    while not done:
+        task = next(iter(env.ready_tasks.values()))
+        docker = env.make_docker(task)
+        node = next((nodes[(steps + i) % len(nodes)] for i in range(len(nodes)) if nodes[(steps + i) % len(nodes)].can_allocate(docker)), nodes[0])
+        _, _, done = env.step([(task, docker, node)])
+        steps += 1
+    return steps, time.perf_counter() - start, env
+
+
+def flow_churn(topology, flows, operations, rng):
+    # 先建立 flows 条随机端点的并发流，再交替地结束一条、开始一条，统计每次操作的平均耗时和受影响的流数
+    network = FlowNetwork(topology)
+    hosts = len(topology.host_ids)
+    pairs = rng.integers(hosts, size=(flows + operations, 2))
+    pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+    live = [network.start_flow(0.0, int(i), int(j), 1e8, 0)[0] for i, j in pairs[:flows].tolist()]
+    affected = 0
+    start = time.perf_counter()
+    for k, (i, j) in enumerate(pairs[flows:flows + operations // 2].tolist()):
+        now = 1e-3 * (k + 1)
+        _, updates = network.finish_flow(now, live.pop(rng.integers(len(live))))
+        affected += len(updates)
+        f, updates = network.start_flow(now, int(i), int(j), 1e8, 0)
+        affected += len(updates)
+        live.append(f)
+    elapsed = time.perf_counter() - start
+    count = 2 * min(operations // 2, len(pairs) - flows)
+    return elapsed / count, affected / count
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--flows', type=int, nargs='+', default=[100, 1000, 5000])
+    parser.add_argument('--operations', type=int, default=400)
+    args = parser.parse_args()
+
+    print(f"{'tasks':>6} {'makespan static':>16} {'makespan shared':>16} {'step static(us)':>16} "
+          f"{'step shared(us)':>16} {'events':>7}")
+    for path in montage_paths()[::3]:
+        workflow = load_workflow(path)
+        steps, static_s, static_env = run_episode(workflow, False)
+        _, shared_s, shared_env = run_episode(workflow, True)
+        print(f"{len(workflow.get_tasks()):>6} {static_env.get_makespan():>16.1f} {shared_env.get_makespan():>16.1f} "
+              f"{static_s / steps * 1e6:>16.1f} {shared_s / steps * 1e6:>16.1f} {shared_env.event_count:>7}")
+
+    print()
+    print(f"{'hosts':>6} {'flows':>6} {'per op(us)':>11} {'rates changed':>14}")
+    rng = np.random.default_rng(0)
+    for spec in (TopologySpec(), TopologySpec(edge_clusters=50, hosts_per_edge_cluster=20)):
+        topology = build_platform(spec).topology
+        for flows in args.flows:
+            per_op, affected = flow_churn(topology, flows, args.operations, rng)
+            print(f"{len(topology.host_ids):>6} {flows:>6} {per_op * 1e6:>11.1f} {affected:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+观测编码基准：对比旧做法(deque 中的记录每步 np.array(list(...)) 再与资源状态 np.concatenate)
+和 ObservationEncoder(预分配环形缓冲区 + 连续 float32 观测)每步的耗时与内存分配。
+
+用法(在 ACScheduler 目录下)：python benchmarks/bench_observation.py
+"""
+import time
+import tracemalloc
+from collections import deque
+
+import numpy as np
+
+import common  # 把 ACScheduler 目录加入 sys.path
+
+from env.env_run import HISTORY_LENGTHS, HISTORY_WIDTH
+from env.observation import RingBuffer, ObservationEncoder
+
+BASE_DIM = 30 * 6 + 5
+STEPS = 20000
+
+
+def deque_step(histories, base, record):
+    for history in histories:
+        history.append(tuple(record))
+    return np.concatenate([base] + [np.array(list(history), dtype=np.float32).reshape(-1) for history in histories])
+
+
+def encoder_step(encoder, record):
+    for ring in encoder.histories:
+        ring.append(record)
+    return encoder.encode()
+
+
+def measure(step):
+    step()
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(STEPS):
+        step()
+    elapsed = (time.perf_counter() - start) / STEPS
+    allocated = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, allocated
+
+
+def main():
+    record = np.arange(HISTORY_WIDTH, dtype=np.float32)
+    base = np.zeros(BASE_DIM, dtype=np.float32)
+    histories = [deque(maxlen=length) for length in HISTORY_LENGTHS.values()]
+    encoder = ObservationEncoder(BASE_DIM, [RingBuffer(length, HISTORY_WIDTH) for length in HISTORY_LENGTHS.values()])
+
+    print(f"observation dim {encoder.dim}, {STEPS} steps")
+    print(f"{'method':<10} {'step(us)':>9} {'peak alloc(KB)':>15}")
+    for name, step in (('deque', lambda: deque_step(histories, base, record)),
+                       ('encoder', lambda: encoder_step(encoder, record))):
+        elapsed, allocated = measure(step)
+        print(f"{name:<10} {elapsed * 1e6:>9.2f} {allocated / 2 ** 10:>15.1f}")
+
+
+if __name__ == '__main__':
+    main()
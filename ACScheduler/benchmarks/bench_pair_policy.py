@@ -0,0 +1,102 @@
+"""
+(任务, 节点) 打分策略基准：在默认平台上用 HEFT 的示范数据对 PairScoringActor 做行为克隆，导出给 PairPolicyEngine，
+然后不重新训练，直接在边缘集群数不同的平台(TopologySpec.edge_clusters)上调度同一个 Montage 工作流，报告
+- 节点数、每步平均就绪任务数、调度决策步数(一次前向计算放置多个任务)
+- 每步的特征编码耗时、NumPy/TensorFlow 前向计算耗时、贪心分配耗时，以及平均到每个放置任务的总推理耗时
+- PairPolicyEngine、HEFT 和随机可行策略的 makespan
+原有的 ActorNetwork 输出维数固定为训练平台的节点数，换到其他规模的平台需要重新训练，不在对比之列。
+
+用法(在 ACScheduler 目录下)：python benchmarks/bench_pair_policy.py [--clusters 4,16,64,256] [--tasks 100]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '3')
+
+import numpy as np
+
+from common import load_workflow, make_env, montage_path, random_makespan
+
+from env.pair_features import PairFeatures, assign_pairs
+from env.topology_builder import TopologySpec, build_platform
+from heuristics import HEFT, collect_pair_demonstrations
+from inference import PairPolicyEngine
+import run
+
+
+def train(epochs):
+    from ACScheduler import PairScoringActor
+    actor = PairScoringActor()
+    demonstrations = []
+    # 节点对象属于最后一个构建的环境，依次构建、依次收集
+    for tasks in (50, 100):
+        env = make_env(load_workflow(montage_path(tasks)))
+        demonstrations += collect_pair_demonstrations(env, HEFT(env))
+    loss = actor.pretrain(demonstrations, epochs=epochs)
+    path = os.path.join(tempfile.mkdtemp(prefix='pair-policy-'), 'pair.weights')
+    actor.export_weights(path)
+    print(f"trained on {len(demonstrations)} HEFT decisions ({len(run.cloud_masters + run.edge_masters)} masters), "
+          f"final loss {loss:.3f}")
+    return actor, PairPolicyEngine(path)
+
+
+def timed_schedule(env, engine, actor):
+    # 与 env.pair_features.schedule_pairs 相同的流程，分别计时各阶段；TensorFlow 前向只计时不使用结果
+    features = PairFeatures(env)
+    env.reset()
+    done = False
+    timings = np.zeros(4)  # 特征编码、NumPy 前向、TensorFlow 前向、分配
+    steps = decisions = placed = ready = 0
+    while not done:
+        start = time.perf_counter()
+        observation = features.observe()
+        timings[0] += time.perf_counter() - start
+        actions = []
+        if len(observation):
+            start = time.perf_counter()
+            logits = engine.pair_logits(observation)
+            timings[1] += time.perf_counter() - start
+            start = time.perf_counter()
+            actor.pair_logits(observation)
+            timings[2] += time.perf_counter() - start
+            start = time.perf_counter()
+            rows, nodes = assign_pairs(logits, observation.masks, env.task_demand[observation.tasks],
+                                       env.cluster_state.free, env.cluster_state.rows)
+            timings[3] += time.perf_counter() - start
+            actions = features.actions(observation.tasks[rows], nodes)
+            decisions += 1
+            placed += len(actions)
+            ready += len(observation)
+        _, _, done = env.step(actions)
+        steps += 1
+    return env.get_makespan(), decisions, placed, ready, timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clusters', default='4,16,64,256', help='逗号分隔的边缘集群数')
+    parser.add_argument('--tasks', type=int, default=100, help='调度的 Montage 工作流规模')
+    parser.add_argument('--epochs', type=int, default=30)
+    args = parser.parse_args()
+
+    actor, engine = train(args.epochs)
+    workflow = load_workflow(montage_path(args.tasks))
+    print(f"{'clusters':>8} {'nodes':>6} {'decisions':>9} {'ready':>6} {'encode(ms)':>11} {'numpy(ms)':>10} "
+          f"{'tf(ms)':>7} {'assign(ms)':>11} {'per task(ms)':>13} {'pair':>7} {'HEFT':>7} {'random':>7}")
+    for clusters in (int(value) for value in args.clusters.split(',')):
+        platform = build_platform(TopologySpec(edge_clusters=clusters))
+        env = make_env(workflow, platform)
+        makespan, decisions, placed, ready, timings = timed_schedule(env, engine, actor)
+        heft, _ = HEFT(env).run()
+        random = random_makespan(env)
+        per_step = timings / max(decisions, 1) * 1e3
+        per_task = (timings[0] + timings[1] + timings[3]) / max(placed, 1) * 1e3
+        print(f"{clusters:>8} {env.action_dim:>6} {decisions:>9} {ready / max(decisions, 1):>6.1f} {per_step[0]:>11.2f} "
+              f"{per_step[1]:>10.2f} {per_step[2]:>7.2f} {per_step[3]:>11.2f} {per_task:>13.2f} "
+              f"{makespan:>7.1f} {heft:>7.1f} {random:>7.1f}")
+
+
+if __name__ == '__main__':
+    main()
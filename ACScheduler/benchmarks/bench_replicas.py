@@ -0,0 +1,37 @@
+"""
+副本注册表基准：同一工作流分别在 不记录副本(总从生产者/终端传输) 和 replicas=True 下用 HEFT 与随机策略调度，
+比较每个工作流的跨主机传输量、命中本地副本的输入数和 makespan；--capacity 可限制每台主机的副本容量以观察 LRU 淘汰。
+
+用法(在 ACScheduler 目录下)：python benchmarks/bench_replicas.py [--capacity 50e6]
+"""
+import argparse
+
+from common import load_workflow, make_env, montage_paths, random_makespan
+
+from heuristics import HEFT
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--capacity', type=float, default=None, help='每台主机的副本缓存容量(字节)，缺省为主机的总存储')
+    args = parser.parse_args()
+
+    print(f"{'tasks':>6} {'policy':>7} {'GB before':>10} {'GB after':>9} {'saved':>6} {'hits':>6} {'evicted':>8} "
+          f"{'makespan before':>16} {'makespan after':>15}")
+    for path in montage_paths()[::3]:
+        workflow = load_workflow(path)
+        # 节点对象属于最后一个构建的环境，两种设置依次构建、依次运行
+        results = []
+        for replicas in (False, True):
+            env = make_env(workflow, replicas=replicas, replica_capacity=args.capacity)
+            for policy, schedule in (('HEFT', lambda: HEFT(env).run()[0]), ('random', lambda: random_makespan(env))):
+                makespan = schedule()
+                results.append((policy, makespan, env.network_bytes, env.replicas.stats() if replicas else None))
+        for (policy, makespan, before, _), (_, replica_makespan, after, stats) in zip(results[:2], results[2:]):
+            print(f"{len(workflow.get_tasks()):>6} {policy:>7} {before / 1e9:>10.2f} {after / 1e9:>9.2f} "
+                  f"{1 - after / before:>6.0%} {stats['hits']:>6} {stats['evictions']:>8} "
+                  f"{makespan:>16.1f} {replica_makespan:>15.1f}")
+
+
+if __name__ == '__main__':
+    main()
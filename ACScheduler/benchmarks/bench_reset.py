@@ -0,0 +1,36 @@
+"""
+CloudEdgeEnv 快照/恢复开销基准：对比重新构建环境、reset() 以及 snapshot()/restore() 的耗时。
+任务状态全部存放在定长数组中，restore 只是几次数组拷贝加上就绪队列和事件队列的重建。
+
+用法(在 ACScheduler 目录下)：python benchmarks/bench_reset.py
+"""
+import time
+
+from common import load_workflow, make_env, montage_paths
+
+
+def timed(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    print(f"{'tasks':>6} {'construct(ms)':>14} {'reset(us)':>10} {'snapshot(us)':>13} {'restore(us)':>12}")
+    for path in montage_paths():
+        parser = load_workflow(path)
+        construct = timed(lambda: make_env(parser), 3)
+        env = make_env(parser)
+        # 跑到episode中途再做快照，事件队列和运行中的任务都不为空
+        for step in range(len(env.tasks) // 2):
+            env.step([env.make_action(step % env.action_dim)])
+        snapshot = env.snapshot()
+        snapshot_time = timed(env.snapshot, 200)
+        restore_time = timed(lambda: env.restore(snapshot), 200)
+        reset_time = timed(env.reset, 200)
+        print(f"{len(env.tasks):>6} {construct * 1e3:>14.2f} {reset_time * 1e6:>10.1f} {snapshot_time * 1e6:>13.1f} {restore_time * 1e6:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
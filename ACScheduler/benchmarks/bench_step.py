@@ -0,0 +1,38 @@
+"""
+CloudEdgeEnv.step 开销基准：在自带的 Montage 工作流(50~1000个任务)上跑完整个episode，
+统计每步的平均耗时和处理的事件数。就绪队列增量维护后，每步耗时应与工作流规模基本无关；
+事件驱动的仿真中事件数与任务数成正比(每个任务3个事件)。
+
+用法(在 ACScheduler 目录下)：python benchmarks/bench_step.py
+"""
+import time
+
+from common import load_workflow, make_env, montage_paths
+
+
+def run_episode(parser):
+    env = make_env(parser)
+    nodes = env.node_list
+    steps = 0
+    done = False
+    start = time.perf_counter()
+    while not done:
+        task = next(iter(env.ready_tasks.values()))
+        docker = env.make_docker(task)
+        # 轮询选择第一个放得下的节点
+        node = next((nodes[(steps + i) % len(nodes)] for i in range(len(nodes)) if nodes[(steps + i) % len(nodes)].can_allocate(docker)), nodes[0])
+        _, _, done = env.step([(task, docker, node)])
+        steps += 1
+    return steps, time.perf_counter() - start, env
+
+
+def main():
+    print(f"{'tasks':>6} {'steps':>6} {'events':>7} {'episode(ms)':>12} {'step(us)':>10} {'makespan(s)':>12}")
+    for path in montage_paths():
+        parser = load_workflow(path)
+        steps, elapsed, env = run_episode(parser)
+        print(f"{len(parser.get_tasks()):>6} {steps:>6} {env.event_count:>7} {elapsed * 1e3:>12.1f} {elapsed / steps * 1e6:>10.1f} {env.get_makespan():>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
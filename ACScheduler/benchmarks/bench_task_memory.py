@@ -0,0 +1,104 @@
+"""
+任务表内存与遍历基准：在 workflows/ 中的各个 Montage 工作流上比较
+逐任务对象(每个文件一个字典、父子任务列表、文件名 -> bool 字典的旧表示)与列式 TaskTable 的内存占用，
+以及两种表示下 遍历全部父子依赖 和 汇总每个任务输入数据量 的耗时。内存用 tracemalloc 统计(包含 NumPy 数组)。
+
+用法(在 ACScheduler 目录下)：python benchmarks/bench_task_memory.py
+"""
+import gc
+import time
+import tracemalloc
+
+import numpy as np
+
+from common import load_workflow, montage_paths
+
+from task.task_table import TaskTable
+
+
+class ObjectTask:
+    # 旧的逐任务对象表示，仅用于对比
+    def __init__(self, task_id, name, runtime, inputs, outputs):
+        self.task_id = task_id
+        self.name = name
+        self.runtime = runtime
+        self.inputs = inputs
+        self.outputs = outputs
+        self.parents = []
+        self.children = []
+        self.cpu_demand = 1
+        self.ram_demand = 1
+        self.storage_demand = 1
+        self.bandwidth_demand = 0
+        self.assigned_node_id = None
+        self.input_files_transferred = {f['filename']: False for f in inputs}
+        self.output_files_transferred = {f['filename']: False for f in outputs}
+
+
+def build_objects(records, dependencies):
+    task_ids, names, runtimes, inputs, outputs = records
+    tasks = {}
+    for task_id, name, runtime, task_inputs, task_outputs in zip(task_ids, names, runtimes, inputs, outputs):
+        tasks[task_id] = ObjectTask(task_id, name, runtime,
+                                    [{'filename': f, 'size': s, 'source_host_id': None, 'target_host_id': None} for f, s in task_inputs],
+                                    [{'filename': f, 'size': s, 'source_host_id': None, 'target_host_id': None} for f, s in task_outputs])
+    for parent_id, child_id in dependencies:
+        tasks[parent_id].children.append(child_id)
+        tasks[child_id].parents.append(parent_id)
+    return tasks
+
+
+def build_table(records, dependencies):
+    return TaskTable.from_records(*records, dependencies)
+
+
+def measure(build, *args):
+    # 返回构建结果常驻的内存(字节)；中间的 Python 临时对象不计入
+    gc.collect()
+    tracemalloc.start()
+    result = build(*args)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def object_traversal(tasks):
+    edges = sum(len(task.children) + len(task.parents) for task in tasks.values())
+    input_bytes = [sum(f['size'] for f in task.inputs) for task in tasks.values()]
+    return edges, input_bytes
+
+
+def table_traversal(table):
+    edges = len(table.child_idx) + len(table.parent_idx)
+    input_bytes = np.bincount(table.input_task, weights=table.input_size, minlength=len(table))
+    return edges, input_bytes
+
+
+def timed(fn, arg, repeats=20):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn(arg)
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    print(f"{'tasks':>6} {'uses':>6} {'objects(KB)':>12} {'table(KB)':>10} {'ratio':>6} {'objects walk(us)':>17} {'table walk(us)':>15}")
+    for path in montage_paths():
+        parser = load_workflow(path)
+        source = parser.get_task_table()
+        tasks = source.tasks.values()
+        records = (list(source.task_ids), list(source.names), source.runtime.tolist(),
+                   [task.input_records() for task in tasks], [task.output_records() for task in tasks])
+        dependencies = parser.get_dependencies()
+
+        objects, object_bytes = measure(build_objects, records, dependencies)
+        table, table_bytes = measure(build_table, records, dependencies)
+        # table_bytes 包含数组、文件名/任务ID列表以及每个任务的 Task 视图
+        uses = len(table.input_file) + len(table.output_file)
+        print(f"{len(table):>6} {uses:>6} {object_bytes / 1024:>12.0f} {table_bytes / 1024:>10.0f} {object_bytes / table_bytes:>6.1f}"
+              f" {timed(object_traversal, objects) * 1e6:>17.0f} {timed(table_traversal, table) * 1e6:>15.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+参数化平台规模基准：对不同主机数构建 ClusteredTopology、主机和节点，记录耗时和内存，
+与主机级稠密矩阵(主机数^2 的带宽+时延)所需的内存对比，并在最大的平台上跑一个随机可行策略的episode。
+同时测量 `import run` 的耗时(默认平台在第一次访问时才构建)。
+
+用法(在 ACScheduler 目录下)：python benchmarks/bench_topology.py [--workflow dax文件]
+"""
+import argparse
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from common import ROOT, load_workflow, make_env, montage_path, random_episode
+
+from env.topology_builder import TopologySpec, build_platform
+
+
+def import_time():
+    # 新进程中只导入 run(不访问任何平台属性)的耗时
+    code = "import time; start = time.perf_counter(); import run; print(time.perf_counter() - start)"
+    return float(subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True).stdout)
+
+
+def build(spec):
+    tracemalloc.start()
+    start = time.perf_counter()
+    platform = build_platform(spec)
+    topology = platform.topology
+    topology_s = time.perf_counter() - start
+    nodes = platform.cloud_masters + platform.edge_masters
+    total_s = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return platform, nodes, topology_s, total_s, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workflow', default=montage_path(100))
+    args = parser.parse_args()
+
+    print(f"import run: {import_time() * 1e3:.1f}ms")
+    print(f"{'hosts':>7} {'clusters':>9} {'topology(ms)':>13} {'platform(ms)':>13} {'peak(MB)':>9} "
+          f"{'links(KB)':>10} {'dense(MB)':>10}")
+    for clusters, per_cluster in ((4, 5), (100, 10), (1000, 10)):
+        spec = TopologySpec(edge_clusters=clusters, hosts_per_edge_cluster=per_cluster)
+        platform, nodes, topology_s, total_s, peak = build(spec)
+        dense = 2 * spec.num_hosts ** 2 * 8
+        print(f"{spec.num_hosts:>7} {clusters + 2:>9} {topology_s * 1e3:>13.1f} {total_s * 1e3:>13.1f} "
+              f"{peak / 2 ** 20:>9.1f} {platform.topology.nbytes() / 2 ** 10:>10.1f} {dense / 2 ** 20:>10.1f}")
+
+    workflow = load_workflow(args.workflow)
+    start = time.perf_counter()
+    env = make_env(workflow, platform)
+    construct_s = time.perf_counter() - start
+    steps, step_s = random_episode(env)
+    print(f"{len(env.tasks)} tasks on {env.action_dim} nodes: construct {construct_s * 1e3:.1f}ms, "
+          f"{steps} steps at {step_s * 1e3:.2f}ms/step, makespan {env.get_makespan():.1f}")
+
+
+if __name__ == '__main__':
+    main()
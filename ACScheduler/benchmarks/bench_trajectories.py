@@ -0,0 +1,127 @@
+"""
+轨迹存储基准：先用随机可行策略在自带的 Montage 工作流上录制几个episode，检查读回的列与录制时一致、
+每遍 minibatches 恰好覆盖每行一次，以及 next_observations 在episode内衔接正确；
+再按真实的观测/动作维度写入 --rows 行合成数据，报告写入吞吐、流式读取打乱小批量的吞吐和读取期间的匿名常驻内存增量(不含可回收的文件映射页)。
+
+用法(在 ACScheduler 目录下)：python benchmarks/bench_trajectories.py [--rows 2000000] [--dir /tmp/trajectories]
+"""
+import argparse
+import os
+import shutil
+import time
+
+import numpy as np
+
+from common import load_workflow, make_env, montage_path
+
+from trajectories import TrajectoryStore, TrajectoryWriter
+
+WORKFLOW = montage_path(100)
+
+
+def resident_megabytes():
+    with open('/proc/self/status') as file:
+        for line in file:
+            if line.startswith('RssAnon'):
+                return int(line.split()[1]) / 1024
+    return float('nan')
+
+
+def record_random_episodes(env, writer, episodes, seed=0):
+    rng = np.random.default_rng(seed)
+    recorded = []
+    for _ in range(episodes):
+        env.reset()
+        done = False
+        rows = []
+        while not done:
+            observation = env.get_observation().copy()
+            mask = env.action_mask().copy()
+            feasible = np.flatnonzero(mask)
+            action = int(feasible[rng.integers(len(feasible))]) if len(feasible) else 0
+            _, reward, done = env.step([env.make_action(action)])
+            value = rng.standard_normal()
+            writer.append(observation, mask, action, reward, done, value)
+            rows.append((observation, mask, action, reward, done, value))
+        writer.end_episode(makespan=env.get_makespan())
+        recorded.extend(rows)
+    return recorded
+
+
+def check_round_trip(env, directory):
+    with TrajectoryWriter(directory, env.observation_dim, env.action_dim, flush_rows=64) as writer:
+        recorded = record_random_episodes(env, writer, 3)
+        # 未结束的episode不应出现在存储中
+        writer.append(recorded[0][0], recorded[0][1], 0, 0.0, False)
+    store = TrajectoryStore(directory)
+    assert len(store) == len(recorded) and len(store.episodes) == 3
+    columns = store.columns
+    for name, k in (('observations', 0), ('masks', 1), ('actions', 2), ('rewards', 3), ('dones', 4), ('values', 5)):
+        expected = np.array([row[k] for row in recorded]).astype(columns[name].dtype)
+        assert np.array_equal(columns[name], expected), name
+    seen = 0
+    for batch in store.minibatches(50, columns=('actions',), shuffle_buffer=150, seed=1):
+        seen += len(batch['actions'])
+    assert seen == len(recorded)
+    rows = np.arange(len(recorded))
+    following = store.gather(rows, ('next_observations',))['next_observations']
+    last = np.flatnonzero(columns['dones'])
+    assert np.array_equal(following[last], columns['observations'][last])
+    inside = np.setdiff1d(rows, last)
+    assert np.array_equal(following[inside], columns['observations'][inside + 1])
+    # 重新打开后在原有数据之后继续追加
+    with TrajectoryWriter(directory, env.observation_dim, env.action_dim) as writer:
+        record_random_episodes(env, writer, 1, seed=2)
+    assert len(TrajectoryStore(directory).episodes) == 4
+    print(f"round trip: {len(recorded)} transitions in 3 episodes, observation_dim={env.observation_dim}, "
+          f"action_dim={env.action_dim}: ok")
+
+
+def throughput(directory, rows, observation_dim, action_dim, episode_length=1000):
+    rng = np.random.default_rng(0)
+    block = episode_length
+    observations = rng.standard_normal((block, observation_dim)).astype(np.float32)
+    masks = rng.random((block, action_dim)) < 0.5
+    actions = rng.integers(0, action_dim, block)
+    rewards = rng.standard_normal(block)
+    dones = np.zeros(block, dtype=bool)
+    dones[-1] = True
+    start = time.perf_counter()
+    with TrajectoryWriter(directory, observation_dim, action_dim) as writer:
+        for _ in range(rows // block):
+            writer.append_batch(observations, masks, actions, rewards, dones, rewards)
+            writer.end_episode()
+    elapsed = time.perf_counter() - start
+    size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)) / 1e9
+    print(f"write: {rows} rows, {size:.2f} GB, {rows / elapsed / 1e6:.2f} M rows/s, {size / elapsed:.2f} GB/s")
+
+    store = TrajectoryStore(directory)
+    for batch_size in (256, 4096):
+        baseline = resident_megabytes()
+        peak = baseline
+        start = time.perf_counter()
+        count = 0
+        for batch in store.minibatches(batch_size, columns=('observations', 'masks', 'actions', 'rewards'), seed=0):
+            count += len(batch['actions'])
+            peak = max(peak, resident_megabytes()) if count % (64 * batch_size) == 0 else peak
+        elapsed = time.perf_counter() - start
+        assert count == rows
+        print(f"stream batch={batch_size:>5}: {count / elapsed / 1e6:.2f} M rows/s, "
+              f"anonymous +{peak - baseline:.0f} MB (store {size * 1e3:.0f} MB)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--dir', default='/tmp/trajectories')
+    args = parser.parse_args()
+
+    env = make_env(load_workflow(WORKFLOW))
+    shutil.rmtree(args.dir, ignore_errors=True)
+    check_round_trip(env, os.path.join(args.dir, 'round_trip'))
+    throughput(os.path.join(args.dir, 'throughput'), args.rows, env.observation_dim, env.action_dim)
+    shutil.rmtree(args.dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
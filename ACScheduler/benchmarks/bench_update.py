@@ -0,0 +1,55 @@
+"""
+DistributedActorCritic 更新吞吐的微基准：比较逐条转移的 eager update() 与编译好的批量轨迹更新
+update_trajectory() 每秒能处理的转移数。状态维度和动作维度取自默认平台上的 CloudEdgeEnv。
+
+用法(在 ACScheduler 目录下)：python benchmarks/bench_update.py
+"""
+import time
+
+import numpy as np
+
+import common  # 把 ACScheduler 目录加入 sys.path
+
+from ACScheduler import DistributedActorCritic
+from env.env_run import CloudEdgeEnv
+import run
+
+GAMMA = 0.99
+
+
+def main():
+    env = CloudEdgeEnv(run.cloud_masters, run.edge_masters, {}, [], 0, topology=run.topology)
+    state_dim, action_dim = env.observation_dim, env.action_dim
+    rng = np.random.default_rng(0)
+    agent = DistributedActorCritic(state_dim, action_dim)
+
+    # 逐条转移的 eager 更新
+    num_transitions = 200
+    states = rng.random((num_transitions + 1, state_dim), dtype=np.float32)
+    actions = rng.integers(0, action_dim, num_transitions)
+    rewards = rng.random(num_transitions, dtype=np.float32)
+    agent.update(states[0], actions[0], rewards[0], states[1], GAMMA)
+    start = time.perf_counter()
+    for i in range(num_transitions):
+        agent.update(states[i], actions[i], rewards[i], states[i + 1], GAMMA)
+    per_step = num_transitions / (time.perf_counter() - start)
+    print(f"{'eager per-step update':<32} {per_step:>10.0f} transitions/s")
+
+    # 编译好的 [T, K] 轨迹更新
+    for length, num_envs in ((32, 1), (32, 8), (128, 16)):
+        states = rng.random((length, num_envs, state_dim), dtype=np.float32)
+        actions = rng.integers(0, action_dim, (length, num_envs)).astype(np.int32)
+        rewards = rng.random((length, num_envs), dtype=np.float32)
+        dones = np.zeros((length, num_envs), dtype=np.float32)
+        last_states = rng.random((num_envs, state_dim), dtype=np.float32)
+        agent.update_trajectory(states, actions, rewards, dones, last_states, GAMMA)  # 预热，触发一次编译
+        repeats = 20
+        start = time.perf_counter()
+        for _ in range(repeats):
+            agent.update_trajectory(states, actions, rewards, dones, last_states, GAMMA)
+        batched = repeats * length * num_envs / (time.perf_counter() - start)
+        print(f"{f'compiled trajectory T={length} K={num_envs}':<32} {batched:>10.0f} transitions/s ({batched / per_step:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+"""
+VectorCloudEdgeEnv 吞吐基准：K 个环境同步推进，actor 每步对 K 个观测做一次批量前向，
+统计不同 K 下每秒完成的episode数和每秒的环境步数。
+
+用法(在 ACScheduler 目录下)：python benchmarks/bench_vector_env.py [dax文件] [批量步数]
+"""
+import os
+import sys
+import time
+
+from common import WORKFLOW_DIR
+
+from ACScheduler import DistributedActorCritic
+from env.vector_env import VectorCloudEdgeEnv, make_env_fn
+import run
+
+
+def main():
+    dax_file = sys.argv[1] if len(sys.argv) > 1 else os.path.join(WORKFLOW_DIR, 'MONTAGE.n.50.0.dax')
+    num_steps = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    env_fn = make_env_fn(dax_file, run.cloud_masters, run.edge_masters, topology=run.topology)
+
+    print(f"{'K':>4} {'episodes':>9} {'episodes/s':>11} {'env steps/s':>12}")
+    for num_envs in (1, 2, 4, 8, 16, 32):
+        vec_env = VectorCloudEdgeEnv([env_fn] * num_envs)
+        agent = DistributedActorCritic(vec_env.observation_dim, vec_env.action_dim)
+        observations = vec_env.reset()
+        agent.select_actions(observations, vec_env.action_masks)  # 预热，排除首次调用的建图开销
+        episodes = 0
+        start = time.perf_counter()
+        for _ in range(num_steps):
+            observations, _, _, infos = vec_env.step(agent.select_actions(observations, vec_env.action_masks))
+            episodes += len(infos)
+        elapsed = time.perf_counter() - start
+        print(f"{num_envs:>4} {episodes:>9} {episodes / elapsed:>11.2f} {num_steps * num_envs / elapsed:>12.0f}")
+
+
+if __name__ == '__main__':
+    main()
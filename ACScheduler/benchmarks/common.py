@@ -0,0 +1,79 @@
+"""
+基准脚本共用的部分：把 ACScheduler 目录加入 sys.path，内置 Montage 工作流的路径与解析，
+在默认平台(或 build_platform 构建的平台)上构建环境，以及固定种子的随机可行策略。
+各脚本在导入项目模块之前先 `from common import ...`(直接运行脚本时其所在目录已在 sys.path 中)。
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+WORKFLOW_DIR = os.path.join(ROOT, 'workflows')
+
+
+def workflow_size(path):
+    return int(os.path.basename(path).split('.')[2])
+
+
+def montage_path(tasks):
+    return os.path.join(WORKFLOW_DIR, f'MONTAGE.n.{tasks}.0.dax')
+
+
+def montage_paths():
+    # 内置的 Montage 工作流，按任务数升序
+    names = [name for name in os.listdir(WORKFLOW_DIR) if name.startswith('MONTAGE.n.') and name.endswith('.dax')]
+    return sorted((os.path.join(WORKFLOW_DIR, name) for name in names), key=workflow_size)
+
+
+def load_workflow(path):
+    from daxparse import WorkflowParser
+    workflow = WorkflowParser(path)
+    workflow.parse_dax_file()
+    return workflow
+
+
+def make_env(workflow, platform=None, **options):
+    """
+    在 platform(有 cloud_masters/edge_masters/topology 属性，缺省为 run 中的默认平台)上为解析好的工作流构建环境，
+    options 原样传给 CloudEdgeEnv(network、replicas 等)。节点对象属于最后一个构建的环境。
+    """
+    from env.env_run import CloudEdgeEnv
+    if platform is None:
+        import run as platform
+    return CloudEdgeEnv(platform.cloud_masters, platform.edge_masters, workflow.get_tasks(),
+                        workflow.get_dependencies(), 0, file_registry=workflow.get_file_registry(),
+                        topology=platform.topology, **options)
+
+
+def random_episode(env, seed=0, before_step=None, after_step=None):
+    """
+    固定种子的随机可行策略从头跑完一个episode，返回 (步数, 平均每步耗时)；makespan 之后用 env.get_makespan() 取。
+    计时包含采样动作和 env.step；before_step(env)/after_step(env) 在每步之前/之后调用，不计入耗时。
+    """
+    rng = np.random.default_rng(seed)
+    env.reset()
+    steps = 0
+    elapsed = 0.0
+    done = False
+    while not done:
+        if before_step is not None:
+            before_step(env)
+        start = time.perf_counter()
+        feasible = np.flatnonzero(env.action_mask())
+        action = int(feasible[rng.integers(len(feasible))]) if len(feasible) else 0
+        _, _, done = env.step([env.make_action(action)])
+        elapsed += time.perf_counter() - start
+        steps += 1
+        if after_step is not None:
+            after_step(env)
+    return steps, elapsed / steps
+
+
+def random_makespan(env, seed=0):
+    random_episode(env, seed)
+    return env.get_makespan()
@@ -0,0 +1,103 @@
+"""
+调度服务的负载生成器：并发提交多个工作流，每个工作流一个连接，
+反复请求放置直到没有可放置的任务，再逐个通知这些任务完成，直到整个工作流结束。
+报告放置请求的吞吐和延迟分位数，以及服务端的平均批大小。
+
+默认在子进程中启动 service.py(临时 Unix 套接字)，也可以用 --socket/--port 连接已经运行的服务。
+用法(在 ACScheduler 目录下)：
+    python benchmarks/load_generator.py [--workflows 64] [--dax workflows/MONTAGE.n.50.0.dax] [--weights policy.weights]
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from common import ROOT, montage_path
+
+from service import ServiceClient
+
+
+async def run_workflow(connect, dax, latencies, timing):
+    client = await connect()
+    try:
+        workflow = (await client.request(op='submit', dax=dax))['workflow']
+        done = False
+        while not done:
+            running = []
+            while True:
+                start = time.perf_counter()
+                placement = await client.request(op='place', workflow=workflow)
+                latencies.append(time.perf_counter() - start)
+                if placement['task'] is None:
+                    break
+                running.append(placement['task'])
+            if not running:
+                raise RuntimeError(f"Workflow {workflow} has nothing running and nothing placeable.")
+            for task_id in running:
+                result = await client.request(op='complete', workflow=workflow, task=task_id)
+                done = result['done']
+        timing.append(result['makespan'])
+    finally:
+        await client.close()
+
+
+async def generate(args):
+    connect = lambda: ServiceClient.connect(args.socket, port=args.port)
+    # 预热：解析缓存和服务端的首次前向计算
+    await run_workflow(connect, args.dax, [], [])
+    latencies, makespans = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(run_workflow(connect, args.dax, latencies, makespans) for _ in range(args.workflows)))
+    elapsed = time.perf_counter() - start
+    client = await connect()
+    stats = await client.request(op='stats')
+    await client.close()
+
+    latencies = np.array(latencies) * 1e6
+    print(f"{args.workflows} concurrent workflows, {len(latencies)} place requests in {elapsed:.2f}s")
+    print(f"throughput: {len(latencies) / elapsed:.0f} place requests/s, {stats['placements'] / elapsed:.0f} placements/s "
+          f"(including warm-up), mean batch {stats['mean_batch']:.1f}")
+    print("place latency(us): " + ", ".join(f"p{q}={np.percentile(latencies, q):.0f}" for q in (50, 90, 99, 99.9))
+          + f", max={latencies.max():.0f}")
+    print(f"mean workflow wall time {np.mean(makespans):.3f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workflows', type=int, default=64, help='并发的工作流(连接)数')
+    parser.add_argument('--dax', default=montage_path(50))
+    parser.add_argument('--socket', default=None, help='连接已运行服务的 Unix 套接字')
+    parser.add_argument('--port', type=int, default=None, help='连接已运行服务的本机端口')
+    parser.add_argument('--weights', default=None, help='启动服务时使用的导出权重')
+    parser.add_argument('--batch-window-us', type=float, default=0)
+    parser.add_argument('--max-batch', type=int, default=64)
+    args = parser.parse_args()
+
+    server = None
+    if args.socket is None and args.port is None:
+        args.socket = os.path.join(tempfile.mkdtemp(prefix='acscheduler-'), 'service.sock')
+        command = [sys.executable, os.path.join(ROOT, 'service.py'), '--socket', args.socket,
+                   '--batch-window-us', str(args.batch_window_us), '--max-batch', str(args.max_batch)]
+        if args.weights:
+            command += ['--weights', args.weights]
+        server = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL)
+        deadline = time.monotonic() + 60
+        while not os.path.exists(args.socket):
+            if server.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError("Scheduling service failed to start.")
+            time.sleep(0.05)
+    try:
+        asyncio.run(generate(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,262 @@
+"""
+可复现的基准套件：对 workflows/ 中每个规模的 Montage 工作流记录
+- WorkflowParser 解析耗时(不使用缓存 / 命中缓存)和解析期间的 Python 峰值内存(tracemalloc，不含 libxml2 内部分配)
+- CloudEdgeEnv 构建耗时
+- CloudEdgeEnv.step 吞吐(固定种子的随机可行策略)
+- actor 单状态推理延迟 p50/p99
+- train_distributed_actor_critic 每秒完成的episode数
+- 训练最后一个episode以及 HEFT 基线的 makespan 和总代价
+结果写成 JSON，--compare 与之前的结果逐项对比，超过阈值的退化会列出并以非零状态退出。
+所有随机性(NumPy、TensorFlow、Python random)都使用固定种子。
+
+用法(在 ACScheduler 目录下)：
+    python benchmarks/suite.py [--sizes 50,100] [--output 结果.json] [--skip-training]
+    python benchmarks/suite.py --compare 旧结果.json [--threshold 0.1]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from common import make_env, montage_paths, workflow_size
+
+from daxparse import WorkflowParser
+from heuristics import HEFT
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+SEED = 0
+
+# 指标名 -> 是否越大越好；用于 --compare 判断退化方向
+METRICS = {
+    'parse_s': False,
+    'parse_cached_s': False,
+    'parse_peak_mb': False,
+    'construct_s': False,
+    'steps_per_s': True,
+    'inference_p50_us': False,
+    'inference_p99_us': False,
+    'train_episodes_per_s': True,
+    'train_makespan': False,
+    'train_cost': False,
+    'heft_makespan': False,
+    'heft_cost': False,
+}
+
+
+def seed_everything(seed):
+    random.seed(seed)
+    np.random.seed(seed)
+    if 'tensorflow' in sys.modules:
+        sys.modules['tensorflow'].random.set_seed(seed)
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCH_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def median_time(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times))
+
+
+def bench_parse(path, repeats):
+    def parse(use_cache, cache_dir=None):
+        parser = WorkflowParser(path, cache_dir=cache_dir)
+        parser.parse_dax_file(use_cache=use_cache)
+        return parser
+
+    result = {'parse_s': median_time(lambda: parse(False), repeats)}
+    tracemalloc.start()
+    parser = parse(False)
+    result['parse_peak_mb'] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    cache_dir = tempfile.mkdtemp(prefix='daxcache-')
+    try:
+        parse(True, cache_dir)  # 写入缓存
+        result['parse_cached_s'] = median_time(lambda: parse(True, cache_dir), repeats)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    return parser, result
+
+
+def bench_steps(env):
+    # 固定种子的随机可行策略跑完整个episode，计时包含采样动作的少量开销
+    rng = np.random.default_rng(SEED)
+    env.reset()
+    steps = 0
+    done = False
+    start = time.perf_counter()
+    while not done:
+        feasible = np.flatnonzero(env.action_mask())
+        action = int(feasible[rng.integers(len(feasible))]) if len(feasible) else 0
+        _, _, done = env.step([env.make_action(action)])
+        steps += 1
+    return {'steps': steps, 'steps_per_s': steps / (time.perf_counter() - start)}
+
+
+def bench_heft(env):
+    makespan, _ = HEFT(env).run()
+    return {'heft_makespan': makespan, 'heft_cost': env.get_total_cost()}
+
+
+def bench_inference(env, agent, calls):
+    import tensorflow as tf
+
+    @tf.function(input_signature=[tf.TensorSpec([1, env.observation_dim], tf.float32)])
+    def forward(state):
+        return agent.actor(state)
+
+    env.reset()
+    state = tf.convert_to_tensor(env.get_observation()[None])
+    for _ in range(10):
+        forward(state)
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        forward(state).numpy()
+        latencies.append(time.perf_counter() - start)
+    return {'inference_p50_us': float(np.percentile(latencies, 50) * 1e6),
+            'inference_p99_us': float(np.percentile(latencies, 99) * 1e6)}
+
+
+def bench_training(env, agent, episodes):
+    from ACScheduler import train_distributed_actor_critic
+    # 预热一个episode(建图)，不计入
+    with contextlib.redirect_stdout(io.StringIO()):
+        train_distributed_actor_critic(env, agent, num_episodes=1)
+        start = time.perf_counter()
+        train_distributed_actor_critic(env, agent, num_episodes=episodes)
+        elapsed = time.perf_counter() - start
+    return {'train_episodes_per_s': episodes / elapsed, 'train_makespan': env.get_makespan(),
+            'train_cost': env.get_total_cost()}
+
+
+def run_suite(sizes, repeats, inference_calls, train_episodes, skip_training):
+    paths = montage_paths()
+    if sizes:
+        paths = [path for path in paths if workflow_size(path) in sizes]
+    if not skip_training:
+        os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '3')
+        import tensorflow as tf
+        from ACScheduler import DistributedActorCritic
+        tf.config.experimental.enable_op_determinism()
+
+    results = []
+    for path in paths:
+        seed_everything(SEED)
+        parser, record = bench_parse(path, repeats)
+        record = {'workflow': os.path.basename(path), 'tasks': len(parser.get_tasks()), **record}
+        record['construct_s'] = median_time(lambda: make_env(parser), repeats)
+        env = make_env(parser)
+        record.update(bench_steps(env))
+        record.update(bench_heft(env))
+        if not skip_training:
+            seed_everything(SEED)
+            agent = DistributedActorCritic(env.observation_dim, env.action_dim)
+            record.update(bench_inference(env, agent, inference_calls))
+            record.update(bench_training(env, agent, train_episodes))
+        results.append(record)
+        print(format_record(record), flush=True)
+    return results
+
+
+def format_record(record):
+    parts = [f"{record['tasks']:>5} tasks"]
+    for name in METRICS:
+        if name in record:
+            parts.append(f"{name}={record[name]:.4g}")
+    return '  '.join(parts)
+
+
+def metadata(args):
+    info = {
+        'revision': git_revision(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'seed': SEED,
+        'repeats': args.repeats,
+        'inference_calls': args.inference_calls,
+        'train_episodes': args.train_episodes,
+    }
+    if 'tensorflow' in sys.modules:
+        info['tensorflow'] = sys.modules['tensorflow'].__version__
+    return info
+
+
+def compare(baseline, current, threshold):
+    # 按工作流逐项对比，返回退化列表 [(工作流, 指标, 旧值, 新值, 相对变化)]
+    previous = {record['workflow']: record for record in baseline['results']}
+    regressions = []
+    print(f"{'workflow':<22} {'metric':<22} {'baseline':>12} {'current':>12} {'change':>8}")
+    for record in current['results']:
+        old = previous.get(record['workflow'])
+        if old is None:
+            continue
+        for name, higher_is_better in METRICS.items():
+            if name not in record or name not in old or not old[name]:
+                continue
+            change = (record[name] - old[name]) / abs(old[name])
+            worse = -change if higher_is_better else change
+            flag = ' !' if worse > threshold else ''
+            print(f"{record['workflow']:<22} {name:<22} {old[name]:>12.4g} {record[name]:>12.4g} {change:>+8.1%}{flag}")
+            if worse > threshold:
+                regressions.append((record['workflow'], name, old[name], record[name], change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=lambda text: {int(size) for size in text.split(',')}, default=None,
+                        help='只运行这些规模的工作流，例如 50,100,1000')
+    parser.add_argument('--output', default=None, help='结果 JSON 路径，默认 benchmarks/results/suite-<revision>.json')
+    parser.add_argument('--repeats', type=int, default=3, help='解析和构建耗时取中位数的重复次数')
+    parser.add_argument('--inference-calls', type=int, default=500)
+    parser.add_argument('--train-episodes', type=int, default=2)
+    parser.add_argument('--skip-training', action='store_true', help='跳过需要 TensorFlow 的推理和训练指标')
+    parser.add_argument('--compare', default=None, help='与之前的结果 JSON 对比')
+    parser.add_argument('--threshold', type=float, default=0.1, help='相对退化超过该比例时报告')
+    args = parser.parse_args()
+
+    results = run_suite(args.sizes, args.repeats, args.inference_calls, args.train_episodes, args.skip_training)
+    report = {'metadata': metadata(args), 'results': results}
+    output = args.output or os.path.join(RESULTS_DIR, f"suite-{report['metadata']['revision'] or 'unknown'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        regressions = compare(baseline, report, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}.")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,76 +1,201 @@
 from lxml import etree
+import hashlib
 import os
-from task.task import *
+import sys
+import numpy as np
+from task.task_table import TaskTable
+from task.file_registry import FileRegistry
+
+# 缓存格式版本号，修改缓存中的数组布局时需要同步递增
+CACHE_VERSION = 2
+
+
+def file_digest(path, chunk_size=1 << 20):
+    # 分块计算文件哈希，避免把整个DAX文件读进内存
+    digest = hashlib.sha1()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _localname(tag):
+    # Pegasus DAX 可能带有命名空间，例如 {http://pegasus.isi.edu/schema/DAX}job
+    return tag.rsplit('}', 1)[-1] if isinstance(tag, str) else tag
+
 
-        
 class WorkflowParser:
-    def __init__(self, dax_file):
+    def __init__(self, dax_file, cache_dir=None):
         if not os.path.isfile(dax_file):
             raise FileNotFoundError(f"File {dax_file} does not exist.")
         self.dax_file = dax_file
+        # 默认把编译后的工作流缓存放在DAX文件同目录下的 .daxcache 中
+        self.cache_dir = cache_dir if cache_dir is not None else os.path.join(os.path.dirname(os.path.abspath(dax_file)), '.daxcache')
         self.tasks = {}
         self.dependencies = []
+        self.table = None
+        self.file_registry = None
+        self._reset_records()
+
+    def _reset_records(self):
+        # 解析过程中逐任务收集的记录，解析结束后一次性编译成 TaskTable
+        self._task_ids = []
+        self._names = []
+        self._runtimes = []
+        self._inputs = []
+        self._outputs = []
+
+    def parse_dax_file(self, streaming=True, use_cache=True):
+        """
+        解析DAX文件。streaming=True 时使用 iterparse 增量解析并在处理完每个元素后释放它；
+        use_cache=True 时优先从按文件哈希索引的二进制缓存加载，未命中时解析后写入缓存。
+        """
+        self.file_registry = None
+        self.dependencies = []
+        self._reset_records()
+        cache_path = None
+        if use_cache:
+            cache_path = self.get_cache_path()
+            if os.path.isfile(cache_path):
+                try:
+                    self._load_arrays(cache_path)
+                    return
+                except (OSError, KeyError, ValueError):
+                    # 缓存损坏或格式过期时回退到重新解析
+                    self.dependencies = []
 
-    def parse_dax_file(self):
         try:
-            with open(self.dax_file, 'rb') as file:
-                file_content = file.read()
-
-            tree = etree.fromstring(file_content)
-
-            # Print the root tag to ensure the file is parsed correctly
-            print(f"Root tag: {tree.tag}")
-
-            for job in tree.findall('job'):
-                task_id = job.get('id')
-                name = job.get('name')
-                runtime = float(job.get('runtime'))
-                
-                inputs = [{'filename': file.get('file'), 'size': int(file.get('size')), 'source_host_id': None, 'target_host_id': None} for file in job.findall('uses[@link="input"]')]
-                outputs = [{'filename': file.get('file'), 'size': int(file.get('size')), 'source_host_id': None, 'target_host_id': None} for file in job.findall('uses[@link="output"]')]
-
-                self.tasks[task_id] = Task(task_id, name, runtime, inputs, outputs)
-
-                # Debug: Print task details
-                #print(f"Parsed task: {task_id}, {name}, {runtime}, inputs: {[f.file_name for f in inputs]}, outputs: {[f.file_name for f in outputs]}")
-
-            for child in tree.findall('child'):
-                child_id = child.get('ref')
-                for parent in child.findall('parent'):
-                    parent_id = parent.get('ref')
-                    self.dependencies.append((parent_id, child_id))
-                    self.tasks[parent_id].children.append(child_id)
-                    self.tasks[child_id].parents.append(parent_id)
-
-                #Debug: Print dependency details
-                print(f"Parsed dependency: parent={parent_id}, child={child_id}")
-
+            if streaming:
+                self._parse_streaming()
+            else:
+                self._parse_tree()
         except etree.XMLSyntaxError as e:
             raise ValueError(f"Error parsing the DAX file: {e}")
+
+        if cache_path is not None:
+            self._save_arrays(cache_path)
+
+    def _parse_tree(self):
+        with open(self.dax_file, 'rb') as file:
+            tree = etree.fromstring(file.read())
+
+        for element in tree:
+            tag = _localname(element.tag)
+            if tag == 'job':
+                self._add_job(element)
+            elif tag == 'child':
+                self._add_child(element)
+        self._build_table()
+
+    def _parse_streaming(self):
+        context = etree.iterparse(self.dax_file, events=('end',), remove_comments=True)
+        for _, element in context:
+            tag = _localname(element.tag)
+            if tag == 'job':
+                self._add_job(element)
+            elif tag == 'child':
+                self._add_child(element)
+            else:
+                continue
+            # 释放已处理的元素以及之前的兄弟节点，保持内存占用与工作流规模无关
+            element.clear()
+            parent = element.getparent()
+            if parent is not None:
+                while element.getprevious() is not None:
+                    del parent[0]
+        del context
+        self._build_table()
+
+    def _add_job(self, job):
+        inputs = []
+        outputs = []
+        for uses in job:
+            if _localname(uses.tag) != 'uses':
+                continue
+            link = uses.get('link')
+            file_name = uses.get('file') or uses.get('name')
+            entry = (file_name, int(uses.get('size', 0)))
+            if link == 'input':
+                inputs.append(entry)
+            elif link == 'output':
+                outputs.append(entry)
+        self._task_ids.append(job.get('id'))
+        self._names.append(job.get('name'))
+        self._runtimes.append(float(job.get('runtime')))
+        self._inputs.append(inputs)
+        self._outputs.append(outputs)
+
+    def _add_child(self, child):
+        child_id = child.get('ref')
+        for parent in child:
+            if _localname(parent.tag) == 'parent':
+                self.dependencies.append((parent.get('ref'), child_id))
+
+    def _build_table(self):
+        self._set_table(TaskTable.from_records(self._task_ids, self._names, self._runtimes, self._inputs, self._outputs, self.dependencies))
+        self._reset_records()
+
+    def _set_table(self, table):
+        self.table = table
+        self.tasks = table.tasks
+
+    def get_cache_path(self):
+        return os.path.join(self.cache_dir, f"{file_digest(self.dax_file)}.v{CACHE_VERSION}.npz")
+
+    def to_arrays(self):
+        """
+        把任务表编译成紧凑的数组形式(见 TaskTable.to_arrays)：
+        任务按解析顺序编号，文件按首次出现顺序编号，文件使用关系和依赖边按CSR方式存储。
+        """
+        return self.table.to_arrays()
+
+    def _save_arrays(self, cache_path):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # 先写临时文件再原子替换，避免并发运行时读到半写的缓存
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as file:
+            np.savez(file, **self.to_arrays())
+        os.replace(tmp_path, cache_path)
+
+    def _load_arrays(self, cache_path):
+        with np.load(cache_path, allow_pickle=False) as data:
+            arrays = {key: data[key] for key in data.files}
+        self.from_arrays(arrays)
+
+    def from_arrays(self, arrays):
+        self._set_table(TaskTable.from_arrays(arrays))
+        task_ids = self.table.task_ids
+        self.dependencies = [(task_ids[p], task_ids[c]) for p, c in self.table.edges.tolist()]
+
     def get_tasks(self):
         return self.tasks
     def get_dependencies(self):
         return self.dependencies
-
-
-dax_file = '/home/drama/code/ACScheduler/workflows/MONTAGE.n.100.0.dax'
-parser = WorkflowParser(dax_file)
-parser.parse_dax_file()
-
-tasks = parser.get_tasks()
-dependencies = parser.get_dependencies()
-
-# Print parsed tasks and dependencies for verification
-for task_id, task in tasks.items():
-    print(f'Task ID: {task.task_id}, Name: {task.name}, Runtime: {task.runtime}')
-    for inp in task.inputs:
-        print(f'  Input: FileName:{inp.file_name}, Size: {inp.size}')
-    for out in task.outputs:
-        print(f'  Output: FileName:{out.file_name}, Size: {out.size}')
-
-print('Dependencies:')
-for parent, child in dependencies:
-    print(f'  {parent} -> {child}')
-
-
-
+    def get_task_table(self):
+        return self.table
+    def get_file_registry(self):
+        # 文件索引只在第一次需要时建立，之后与解析结果一起复用
+        if self.file_registry is None:
+            self.file_registry = FileRegistry.from_table(self.table)
+        return self.file_registry
+
+
+if __name__ == '__main__':
+    dax_file = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), 'workflows', 'MONTAGE.n.100.0.dax')
+    parser = WorkflowParser(dax_file)
+    parser.parse_dax_file()
+
+    tasks = parser.get_tasks()
+    dependencies = parser.get_dependencies()
+
+    # Print parsed tasks and dependencies for verification
+    for task_id, task in tasks.items():
+        print(f'Task ID: {task.task_id}, Name: {task.name}, Runtime: {task.runtime}')
+        for inp in task.inputs:
+            print(f'  Input: FileName:{inp["filename"]}, Size: {inp["size"]}')
+        for out in task.outputs:
+            print(f'  Output: FileName:{out["filename"]}, Size: {out["size"]}')
+
+    print('Dependencies:')
+    for parent, child in dependencies:
+        print(f'  {parent} -> {child}')
@@ -0,0 +1,175 @@
+"""
+多工作流到达模式：从 workflows/ 目录中抽取的工作流按到达过程(泊松或固定间隔)陆续到达，
+共享同一组 Master/Worker 的资源。所有工作流拼成一张任务表(TaskTable.concat)，
+每个工作流的根任务在到达事件之前多一个未满足的前置条件，因此仍然沿用 CloudEdgeEnv 的增量就绪跟踪，
+每步开销与同时在途的工作流数量无关。结束后 workflow_report() 给出每个工作流的 makespan 和 slowdown。
+
+    env = MultiWorkflowEnv.from_directory(run.cloud_masters, run.edge_masters, 'workflows', count=20,
+                                          process='poisson', rate=0.05, topology=run.topology)
+"""
+import glob
+import os
+
+import numpy as np
+
+from env.env_run import CloudEdgeEnv, EVENT_COUNTERS
+from env.events import WORKFLOW_ARRIVAL
+from profiling import profiler
+from task.file_registry import FileRegistry
+from task.task_table import TaskTable
+
+
+def poisson_arrivals(count, rate, rng):
+    # 第一个工作流在0时刻到达，之后的到达间隔服从均值为 1/rate 秒的指数分布
+    return np.concatenate([[0.0], np.cumsum(rng.exponential(1.0 / rate, max(count - 1, 0)))])
+
+
+def fixed_arrivals(count, interval):
+    return np.arange(count, dtype=np.float64) * interval
+
+
+def arrival_times(process, count, rng=None, rate=None, interval=None):
+    if process == 'poisson':
+        return poisson_arrivals(count, rate, rng if rng is not None else np.random.default_rng())
+    if process == 'fixed':
+        return fixed_arrivals(count, interval)
+    raise ValueError(f"Unknown arrival process {process!r}; expected 'poisson' or 'fixed'.")
+
+
+def sample_workflows(directory, count, rng, pattern='*.dax'):
+    # 从目录中有放回地随机抽取 count 个工作流文件
+    paths = sorted(glob.glob(os.path.join(directory, pattern)))
+    if not paths:
+        raise ValueError(f"No workflows matching {pattern!r} in {directory}.")
+    return [paths[k] for k in rng.integers(len(paths), size=count)]
+
+
+def load_tables(paths):
+    # 同一文件只解析一次(并命中解析缓存)，多次出现时共享同一张表
+    from daxparse import WorkflowParser
+    tables = {}
+    for path in paths:
+        if path not in tables:
+            parser = WorkflowParser(path)
+            parser.parse_dax_file()
+            tables[path] = parser.get_task_table()
+    return [tables[path] for path in paths]
+
+
+class MultiWorkflowEnv(CloudEdgeEnv):
+    """
+    workflows[k] 是第 k 个工作流的 TaskTable，在 start_time + arrivals[k] 时刻到达。
+    任务ID加上 "w{k}/" 前缀；就绪队列除了全局的 ready_tasks(按就绪先后)外还按工作流分开(workflow_ready)。
+    """
+    def __init__(self, cloud_masters, edge_masters, workflows, arrivals, start_time=0, names=None, topology=None,
+                 history_lengths=None, **env_kwargs):
+        if not workflows or any(len(table) == 0 for table in workflows):
+            raise ValueError("MultiWorkflowEnv needs at least one non-empty workflow.")
+        if len(arrivals) != len(workflows):
+            raise ValueError("arrivals must have one entry per workflow.")
+        self.workflow_names = list(names) if names is not None else [f'workflow_{k}' for k in range(len(workflows))]
+        self.arrival_times = start_time + np.asarray(arrivals, dtype=np.float64)
+        sizes = [len(table) for table in workflows]
+        # 第 k 个工作流的任务是合并表中 workflow_ptr[k]:workflow_ptr[k+1] 这一段
+        self.workflow_ptr = np.concatenate([[0], np.cumsum(sizes)])
+        self.workflow_of = np.repeat(np.arange(len(workflows)), sizes)
+        self.workflow_ready = [{} for _ in workflows]
+        table = TaskTable.concat(workflows, [f'w{k}/' for k in range(len(workflows))])
+        roots = np.flatnonzero(np.diff(table.parent_ptr) == 0)
+        self.workflow_roots = np.split(roots, np.searchsorted(roots, self.workflow_ptr[1:-1]))
+        self.workflow_roots = [group.tolist() for group in self.workflow_roots]
+        self.pending_arrivals = self.arrival_times > start_time
+        dependencies = [(table.task_ids[parent], table.task_ids[child]) for parent, child in table.edges.tolist()]
+        super().__init__(cloud_masters, edge_masters, table.tasks, dependencies, start_time,
+                         file_registry=FileRegistry.from_table(table), topology=topology, history_lengths=history_lengths,
+                         **env_kwargs)
+        self.critical_path = self.compute_critical_paths()
+
+        for k in np.flatnonzero(self.pending_arrivals).tolist():
+            self.events.push(float(self.arrival_times[k]), WORKFLOW_ARRIVAL, k)
+        # 起点没有任何工作流到达时直接跳到第一个到达事件，episode 开始时总有就绪任务
+        while self.events and not self.ready_tasks:
+            self.advance_to_next_event()
+        self._initial_snapshot = self.snapshot()
+
+    @classmethod
+    def from_directory(cls, cloud_masters, edge_masters, directory, count, process='poisson', rate=None, interval=None,
+                       seed=0, pattern='*.dax', **kwargs):
+        # 从目录中按固定种子抽取工作流和到达时刻
+        rng = np.random.default_rng(seed)
+        paths = sample_workflows(directory, count, rng, pattern)
+        arrivals = arrival_times(process, count, rng, rate=rate, interval=interval)
+        names = [os.path.basename(path) for path in paths]
+        return cls(cloud_masters, edge_masters, load_tables(paths), arrivals, names=names, **kwargs)
+
+    def initial_unfinished_parents(self):
+        # 尚未到达的工作流的根任务多等待一个条件：到达事件
+        counts = super().initial_unfinished_parents().copy()
+        for k in np.flatnonzero(self.pending_arrivals).tolist():
+            counts[self.workflow_roots[k]] += 1
+        return counts
+
+    def task_release_times(self):
+        # 任务最早在所属工作流到达时开始，makespan 下界据此约束尚未到达的工作流
+        return self.arrival_times[self.workflow_of]
+
+    def mark_ready(self, i):
+        super().mark_ready(i)
+        self.workflow_ready[self.workflow_of[i]][self.task_ids[i]] = self.task_list[i]
+
+    def unmark_ready(self, i):
+        super().unmark_ready(i)
+        del self.workflow_ready[self.workflow_of[i]][self.task_ids[i]]
+
+    def restore(self, snapshot):
+        super().restore(snapshot)
+        for ready in self.workflow_ready:
+            ready.clear()
+        for task_id, task in self.ready_tasks.items():
+            self.workflow_ready[self.workflow_of[self.task_index[task_id]]][task_id] = task
+
+    def handle_event(self, time, kind, task_id):
+        if kind != WORKFLOW_ARRIVAL:
+            return super().handle_event(time, kind, task_id)
+        self.event_count += 1
+        profiler.count(EVENT_COUNTERS[kind])
+        state = self.task_state
+        for i in self.workflow_roots[task_id]:
+            state.unfinished_parents[i] -= 1
+            self.update_ready(i)
+        return 0
+
+    def workflows_in_flight(self):
+        # 已经到达但尚未全部完成的工作流数
+        arrived = self.arrival_times <= self.simulated_time.now()
+        done = np.logical_and.reduceat(self.task_state.completed, self.workflow_ptr[:-1])
+        return int(np.count_nonzero(arrived & ~done))
+
+    def compute_critical_paths(self):
+        # 每个工作流只按任务运行时间计算的关键路径长度(不含传输)，即独占集群时 makespan 的下界
+        return np.maximum.reduceat(self.task_table.bottom_levels(), self.workflow_ptr[:-1])
+
+    def workflow_report(self):
+        """
+        每个工作流的到达时刻、完成时刻、makespan(完成 - 到达)、关键路径长度和 slowdown(makespan / 关键路径)；
+        尚未完成的工作流完成时刻等为 NaN。
+        """
+        state = self.task_state
+        starts = self.workflow_ptr[:-1]
+        done = np.logical_and.reduceat(state.completed, starts)
+        finish = np.where(done, np.fmax.reduceat(state.end, starts), np.nan)
+        makespan = finish - self.arrival_times
+        with np.errstate(divide='ignore', invalid='ignore'):
+            slowdown = makespan / self.critical_path
+        return [{'workflow': name, 'tasks': int(self.workflow_ptr[k + 1] - self.workflow_ptr[k]),
+                 'arrival': float(self.arrival_times[k]), 'finish': float(finish[k]), 'makespan': float(makespan[k]),
+                 'critical_path': float(self.critical_path[k]), 'slowdown': float(slowdown[k])}
+                for k, name in enumerate(self.workflow_names)]
+
+    def slowdown_summary(self):
+        slowdown = np.array([record['slowdown'] for record in self.workflow_report()])
+        slowdown = slowdown[np.isfinite(slowdown)]
+        if not len(slowdown):
+            return {'completed': 0}
+        return {'completed': len(slowdown), 'mean': float(slowdown.mean()), 'p95': float(np.percentile(slowdown, 95)),
+                'max': float(slowdown.max())}
@@ -0,0 +1,84 @@
+import numpy as np
+
+# 资源列：CPU(核)、内存(GB)、存储(GB)
+CPU = 0
+RAM = 1
+STORAGE = 2
+NUM_RESOURCES = 3
+
+
+class ClusterState:
+    """
+    集群资源状态：按节点顺序把所有主机的剩余资源和总资源存放在连续的 NumPy 数组中。
+    Host 只保存自己在数组中的行号，读写 cpu/ram/storage 时直接访问这些数组。
+
+    observation 是预先分配好的 (节点数, 6) 数组：前三列为剩余资源，后三列为利用率，
+    observe() 原地刷新利用率后直接返回它本身，不做任何拷贝。
+    """
+    def __init__(self, hosts):
+        # 同一主机上可以有多个节点，数组按主机去重，rows 记录每个传入位置对应的行号
+        index = {}
+        unique_hosts = []
+        rows = []
+        for host in hosts:
+            if id(host) not in index:
+                index[id(host)] = len(unique_hosts)
+                unique_hosts.append(host)
+            rows.append(index[id(host)])
+        self.hosts = unique_hosts
+        self.rows = np.array(rows, dtype=np.intp)
+        self._identity = bool(np.array_equal(self.rows, np.arange(len(unique_hosts))))
+
+        n = len(unique_hosts)
+        self.observation = np.zeros((n, 2 * NUM_RESOURCES), dtype=np.float64)
+        self.free = self.observation[:, :NUM_RESOURCES]
+        self.utilization = self.observation[:, NUM_RESOURCES:]
+        self.total = np.zeros((n, NUM_RESOURCES), dtype=np.float64)
+        self._node_observation = None if self._identity else np.zeros((len(rows), 2 * NUM_RESOURCES), dtype=np.float64)
+
+        for i, host in enumerate(unique_hosts):
+            self.free[i] = (host.cpu, host.ram, host.storage)
+            self.total[i] = (host.total_cpu, host.total_ram, host.total_storage)
+            host.bind(self, i)
+        self._inv_total = self._inverse(self.total)
+
+    @classmethod
+    def single(cls, cpu, ram, storage):
+        # 尚未加入集群的主机使用只有一行的独立状态
+        state = cls.__new__(cls)
+        state.hosts = []
+        state.rows = np.zeros(1, dtype=np.intp)
+        state._identity = True
+        state.observation = np.zeros((1, 2 * NUM_RESOURCES), dtype=np.float64)
+        state.free = state.observation[:, :NUM_RESOURCES]
+        state.utilization = state.observation[:, NUM_RESOURCES:]
+        state.free[0] = (cpu, ram, storage)
+        state.total = state.free.copy()
+        state._inv_total = cls._inverse(state.total)
+        state._node_observation = None
+        return state
+
+    @staticmethod
+    def _inverse(total):
+        # 预先算好总量的倒数，刷新利用率时只需一次减法和一次乘法；总量为0的资源利用率记为0
+        inverse = np.zeros_like(total)
+        np.divide(1.0, total, out=inverse, where=total > 0)
+        return inverse
+
+    def refresh_utilization(self):
+        np.subtract(self.total, self.free, out=self.utilization)
+        np.multiply(self.utilization, self._inv_total, out=self.utilization)
+        return self.utilization
+
+    def observe(self):
+        # 返回 (节点数, 6) 的资源观测，节点与主机一一对应时不发生拷贝
+        self.refresh_utilization()
+        if self._identity:
+            return self.observation
+        return np.take(self.observation, self.rows, axis=0, out=self._node_observation)
+
+    def node_utilization(self):
+        return self.observe()[:, NUM_RESOURCES:]
+
+    def __len__(self):
+        return len(self.rows)
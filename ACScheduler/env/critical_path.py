@@ -0,0 +1,63 @@
+"""
+makespan 下界与剩余关键路径的增量跟踪，供奖励塑形使用。
+
+bottom level b_i(任务 i 开始后到工作流结束至少还需的执行时间，不含传输)只在构建时按拓扑序算一次。
+任务只有在所有父任务完成后才能放置，所以尚未放置的任务集合对子任务封闭。任务 i 最早在 r_i 时刻开始
+(多工作流模式下为所属工作流的到达时刻，其余情况为仿真起点)，当前时刻 now 的 makespan 下界为
+
+    max( now + 未放置任务中最大的 b_i,  未放置任务中最大的 r_i + b_i,  已放置任务中最大的 (完成时刻下界_p + b_p - 运行时间_p) )
+
+前两项各沿按 b 和 r + b 降序排好的任务表移动一个游标(被放置的任务只会增加，游标只前进)，
+第三项在任务放置、开始执行、完成时各用一次 max 更新(完成时刻下界只会变大)，因此每次更新和查询都是均摊 O(1)。
+"""
+import numpy as np
+
+
+class CriticalPathTracker:
+    def __init__(self, table, start_time=0.0, release=None):
+        # release[i] 是任务 i 最早可以开始的时刻，缺省时所有任务在 start_time 即可开始
+        self.runtime = table.runtime.astype(np.float64)
+        self.bottom = table.bottom_levels()
+        self.tail = self.bottom - self.runtime  # 任务完成后工作流至少还需的时间
+        self.order = np.argsort(-self.bottom, kind='stable')
+        self.released = (np.full(len(self.bottom), float(start_time)) if release is None
+                         else np.asarray(release, dtype=np.float64)) + self.bottom
+        self.released_order = np.argsort(-self.released, kind='stable')
+        self.start_time = start_time
+        self.cursor = 0  # order 中第一个可能尚未放置的任务的位置
+        self.released_cursor = 0  # released_order 中第一个可能尚未放置的任务的位置
+        self.placed_bound = start_time
+
+    def update(self, i, finish):
+        # 已放置的任务 i 的完成时刻下界提高到 finish(放置时为 开始 + 运行时间，执行开始时和完成时再次更新)
+        bound = finish + self.tail[i]
+        if bound > self.placed_bound:
+            self.placed_bound = bound
+
+    def unplaced_level(self, pending):
+        # 尚未放置的任务中最大的 bottom level；pending 是 TaskState.pending
+        order = self.order
+        while self.cursor < len(order) and not pending[order[self.cursor]]:
+            self.cursor += 1
+        return float(self.bottom[order[self.cursor]]) if self.cursor < len(order) else 0.0
+
+    def unplaced_release(self, pending):
+        # 尚未放置的任务中最大的 最早开始时刻 + bottom level(绝对时刻)；尚未到达的工作流由这一项约束
+        order = self.released_order
+        while self.released_cursor < len(order) and not pending[order[self.released_cursor]]:
+            self.released_cursor += 1
+        return float(self.released[order[self.released_cursor]]) if self.released_cursor < len(order) else self.start_time
+
+    def lower_bound(self, now, pending):
+        # makespan 下界(绝对时刻)
+        return max(self.placed_bound, now + self.unplaced_level(pending), self.unplaced_release(pending))
+
+    def remaining(self, now, pending):
+        # 剩余关键路径长度：从 now 起至少还需的时间
+        return max(self.lower_bound(now, pending) - now, 0.0)
+
+    def snapshot(self):
+        return self.cursor, self.released_cursor, self.placed_bound
+
+    def restore(self, snapshot):
+        self.cursor, self.released_cursor, self.placed_bound = snapshot
@@ -1,4 +1,22 @@
-from collections import deque
+import numpy as np
+from task.file_registry import FileRegistry
+from task.task_table import TaskTable
+from env.events import EventQueue, TASK_START, TRANSFER_DONE, TASK_FINISH, FLOW_DONE, OUTPUT_START, EVENT_NAMES
+from env.platform import Docker
+from env.cluster_state import ClusterState, STORAGE
+from env.topology import Topology
+from env.observation import RingBuffer, ObservationEncoder
+from env.network import FlowNetwork
+from env.replicas import ReplicaRegistry, replica_times, GIGABYTE
+from env.critical_path import CriticalPathTracker
+from env.task_state import (TaskState, TaskSet, TaskRecordView, EnvSnapshot, optional_time,
+                            LOCATION_TERMINAL, LOCATION_UNKNOWN)
+from profiling import profiler
+
+def csr_rows(values, ptr):
+    # CSR 数组按行切开：第 i 行为 values[ptr[i]:ptr[i + 1]]，行数始终为 len(ptr) - 1(空表时为0，不同于 np.split)
+    return [values[ptr[i]:ptr[i + 1]] for i in range(len(ptr) - 1)]
+
 
 class SimulatedClock:
     def __init__(self,start_time):
@@ -10,214 +28,817 @@ class SimulatedClock:
     def advance(self, timedelta):
         self.current_time += timedelta
 
+    def advance_to(self, time):
+        # 事件驱动时直接跳到下一个事件的时刻
+        if time > self.current_time:
+            self.current_time = time
+
+
+# 各类事件在 profiler 中的计数器名
+EVENT_COUNTERS = {kind: f'env.events.{name}' for kind, name in EVENT_NAMES.items()}
+
+# 观测中除节点资源外的任务/进度特征：当前任务运行时间、输入数据量(MB)、子任务数、完成比例、就绪比例
+TASK_FEATURES = 5
+
+# 观测中各历史的默认长度；每条任务记录为 (节点位置, 运行时间, 实际耗时)，
+# 失败记录为 (节点位置, 运行时间, 原因: 0 不可调度 / 1 资源分配失败)，利用率记录为所有节点 cpu/ram/storage 利用率的均值
+HISTORY_LENGTHS = {'task': 100, 'failure': 100, 'utilization': 10}
+HISTORY_WIDTH = 3
+FAILURE_REJECTED = 0
+FAILURE_ALLOCATION = 1
+# step 中无效动作在资源检查/分配阶段会抛出的异常：未知的节点(KeyError)、非法的容器需求(TypeError/ValueError)
+ALLOCATION_ERRORS = (KeyError, TypeError, ValueError)
+# 网络模型内部的事件：处理后就绪任务和资源都不变，不需要把控制交还给策略
+NETWORK_EVENTS = (FLOW_DONE, OUTPUT_START)
+
+# 奖励模式：'cost' 为任务完成时的负成本；'makespan' 为本步 makespan 下界的减少量(各步之和 = 初始下界 - 最终 makespan)；
+# 'shaped' 为两者之和，下界项乘以 makespan_weight。三种模式都保留调度失败的惩罚
+REWARD_MODES = ('cost', 'makespan', 'shaped')
+
 
 class CloudEdgeEnv:
-    def __init__(self,cloud_masters,edge_masters,tasks,dependencies,start_time):
+    def __init__(self,cloud_masters,edge_masters,tasks,dependencies,start_time,file_registry=None,topology=None,history_lengths=None,network=False,
+                 replicas=False,replica_capacity=None,reward_mode='cost',makespan_weight=1.0):
+        if reward_mode not in REWARD_MODES:
+            raise ValueError(f"Unknown reward mode {reward_mode!r}; expected one of {REWARD_MODES}.")
         self.cloud_masters = cloud_masters
         self.edge_masters = edge_masters
         self.tasks = tasks
         self.dependencies = dependencies
-        self.completed_tasks = set()
-        self.pending_tasks = deque(tasks.values())
+        # 列式任务表；tasks 来自解析器时直接复用解析得到的表
+        self.task_table = TaskTable.of(tasks, dependencies)
+        # 文件名 -> 生产/消费任务的索引，解析器已建立时直接复用
+        self.file_registry = file_registry if file_registry is not None else FileRegistry.from_table(self.task_table)
+        # 节点列表：先是所有master，再是各master下的worker，动作中的节点下标与资源观测的行号都按此顺序
+        self.node_list = cloud_masters + edge_masters + [worker for master in cloud_masters + edge_masters for worker in master.workers]
+        # 节点ID -> 节点
+        self.nodes = {node.node_id: node for node in self.node_list}
+        self.node_index = {node.node_id: i for i, node in enumerate(self.node_list)}
+        # 主机间带宽/时延矩阵；未提供时由各主机的 bandwidth 字典构建
+        self.topology = topology if topology is not None else self.build_topology()
+        self.node_rows = self.topology.rows([node.host.host_id for node in self.node_list])
+        # network=True 时并发传输按最大最小公平分享链路(env.network.FlowNetwork)，否则每次传输独占静态带宽
+        self.network = FlowNetwork(self.topology) if network else None
+        # 放置估计使用的带宽：启用网络模型时考虑两端当前的并发流数
+        self.estimator = self.network if self.network is not None else self.topology
+        # 所有主机的剩余/总资源放在连续数组中，Host 的读写直接落在这些数组上
+        self.cluster_state = ClusterState([node.host for node in self.node_list])
+        self.build_task_index()
+        # replicas=True 时记录各主机上的文件副本，输入从最快的副本拉取；否则总从生产者所在节点或终端传输
+        self.replicas = self.build_replicas(replica_capacity) if replicas else None
+        # 随仿真变化的任务状态都在 task_state 的数组中，Task 对象只描述工作流本身，仿真中不再修改
+        self.task_state = TaskState(len(self.task_list), len(self.input_task))
+        self.completed_tasks = TaskSet(self.task_state.completed, self.task_ids, self.task_index)
+        self.pending_tasks = TaskSet(self.task_state.pending, self.task_ids, self.task_index)  # 尚未开始的任务
+        self.start_time = start_time
         self.simulated_time = SimulatedClock(start_time)
         self.time_slice = 10 # 初始时间片大小
+        self.events = EventQueue() # 任务开始/传输完成/任务完成事件
+        self.running_tasks = {} # 任务ID -> (容器, 节点)，完成时据此释放资源
+        self.event_count = 0 # 已处理的事件数
+        self.network_bytes = 0 # 累计跨节点传输的数据量
+        # 历史记录保存在预分配的数值环形缓冲区中，并作为观测的一部分；长度为0时不记录
+        lengths = {**HISTORY_LENGTHS, **(history_lengths or {})}
+        self.resource_utilization_history = RingBuffer(lengths['utilization'], HISTORY_WIDTH) # 最近若干个事件时刻的资源利用率
+        self.task_failure_history = RingBuffer(lengths['failure'], HISTORY_WIDTH) # 最近的调度失败记录
+        self.task_history = RingBuffer(lengths['task'], HISTORY_WIDTH) # 最近完成的任务记录
+        self._history_row = np.zeros(HISTORY_WIDTH, dtype=np.float32)
+        self.init_ready_tracking()
+        # 剩余关键路径和 makespan 下界：bottom level 只算一次，之后随放置/执行/完成增量更新
+        self.path_tracker = CriticalPathTracker(self.task_table, start_time, self.task_release_times())
+        self.reward_mode = reward_mode
+        self.makespan_weight = makespan_weight
+        self._bound = self.path_tracker.lower_bound(start_time, self.task_state.pending)
         self.state = self.get_initial_state()
-        self.resource_utilization_history = deque(maxlen=10) # 存储最近10个时间片的资源利用率
-        self.task_failure_history = deque(maxlen=100) # 存储最近100个任务的失败记录
-        self.task_history = deque(maxlen=100) # 存储最近100个任务的执行记录
+        self.action_dim = len(self.node_list)
+        self.encoder = ObservationEncoder(len(self.node_list) * 6 + TASK_FEATURES,
+                                          (self.task_history, self.task_failure_history, self.resource_utilization_history))
+        self.observation_dim = self.encoder.dim
+        self._action_mask = np.zeros(self.action_dim, dtype=bool)
+        self._node_free = np.zeros((self.action_dim, 3), dtype=np.float64)
+        self._node_fits = np.zeros((self.action_dim, 3), dtype=bool)
+        # episode 起点的快照，reset 直接恢复它而不是重新构建环境
+        self._initial_snapshot = self.snapshot()
+
+    def build_task_index(self):
+        # 任务ID <-> 下标，以及任务表中按任务顺序拼接的所有输入文件(CSR)：每个输入文件的所属任务、大小和生产任务下标
+        table = self.task_table
+        self.task_ids = table.task_ids
+        self.task_list = list(self.tasks.values())
+        self.task_index = table.index
+        self.input_ptr = table.input_ptr
+        self.input_task = table.input_task
+        self.input_size = table.input_size.astype(np.float64)
+        self.input_file = table.input_file
+        self.input_producer = table.producer[table.input_file]
+        self.input_bytes = np.bincount(self.input_task, weights=self.input_size, minlength=len(table))
+        self.child_count = np.diff(table.child_ptr)
+        # (任务数, 3)：容器的 cpu/ram/storage 需求，与 make_docker 创建的容器一致
+        self.task_demand = np.stack([table.cpu_demand, table.ram_demand, table.storage_demand], axis=1)
+        # 每个任务的输出被哪些输入文件(下标)读取，以及子任务下标；叶子任务的输出需要传回终端
+        consumer_ptr, consumer_use = table.input_consumers()
+        output_files = csr_rows(table.output_file, table.output_ptr)
+        self.output_consumers = [np.concatenate([consumer_use[consumer_ptr[f]:consumer_ptr[f + 1]] for f in files]).tolist() if len(files) else []
+                                 for files in output_files]
+        self.children_index = [children.tolist() for children in csr_rows(table.child_idx, table.child_ptr)]
+        leaf_outputs = csr_rows(table.output_size.astype(np.float64), table.output_ptr)
+        self.output_files = [files.tolist() for files in output_files]
+        self.terminal_outputs = [sizes.tolist() if self.child_count[i] == 0 else [] for i, sizes in enumerate(leaf_outputs)]
+        self.terminal_row = self.topology.index.get('terminal', -1)
+
+    def init_ready_tracking(self):
+        # 每个任务维护两个计数器：未完成的父任务数、尚未到达的输入文件数。
+        # 两者都为0时任务进入就绪队列，之后只在 end_task 中增量更新，避免每步扫描全部任务。
+        state = self.task_state
+        # 外部输入文件从一开始就在终端设备上可用，其余文件等生产任务完成后才到达
+        external = self.input_producer < 0
+        state.arrived[:] = external
+        state.source[:] = np.where(external, LOCATION_TERMINAL, LOCATION_UNKNOWN)
+        state.missing_inputs[:] = np.bincount(self.input_task[~external], minlength=len(self.task_list))
+        state.unfinished_parents[:] = self.initial_unfinished_parents()
+        state.ready[:] = False
+        self.ready_tasks = {}  # 就绪队列：任务ID -> 任务，按就绪先后排序
+        self.ready_counter = 0
+        for i in np.flatnonzero((state.missing_inputs == 0) & (state.unfinished_parents == 0)):
+            self.mark_ready(i)
+
+    def initial_unfinished_parents(self):
+        # 每个任务开始时需要等待的前置条件数，默认是父任务数
+        return np.diff(self.task_table.parent_ptr)
+
+    def task_release_times(self):
+        # 每个任务最早可以开始的时刻，None 表示都从仿真起点开始
+        return None
 
     def get_initial_state(self):
         state = {
-            'task_status':{
-                task.task_id:{
-                    'completed': False,'progress': 0.0,'estimated_completion': None,
-                    'cpu_demand':task.cpu_demand,'memory_demand':task.memory_demand,
-                    'storage_demand': task.storage_demand,'bandwidth_demand':task.bandwidth_demand
-                } for task in self.tasks.values()},
+            'task_status': TaskRecordView(self.tasks, self.task_index, self.task_status_record),
             'resource_state': self.get_resource_state(),
             'workflow_dependencies':self.dependencies,
-            'schedulable_tasks':[task for task in self.tasks.values() if self.can_schedule(task)],
+            'schedulable_tasks':list(self.ready_tasks.values()),
             'current_time': self.simulated_time.now(),
-            'task_times': {task.task_id: {'start': None, 'end': None} for task in self.tasks.values()},
+            'task_times': TaskRecordView(self.tasks, self.task_index, self.task_times_record),
             'task_history': self.task_history,  # 存储最近100个任务的执行记录
             'task_failure_history': self.task_failure_history,  # 存储最近100个任务的失败记录'
             'resource_utilization_history': self.resource_utilization_history,
             'system_load': self.calculate_system_load(),
             'network_bandwidth_usage': self.calculate_network_bandwidth_usage(),
             'task_queue_length': len(self.pending_tasks),
-            'task_data_location': {task.task_id: [(file.name, file.size, file.host_id) for file in task.inputs] for task in self.tasks.values()}
+            'task_data_location': {task.task_id: self.get_task_data_location(task) for task in self.task_list}
         }
         return state
-    
+
+    def task_status_record(self, task, i):
+        state = self.task_state
+        completed = bool(state.completed[i])
+        return {'completed': completed, 'progress': 1.0 if completed else 0.0,
+                'estimated_completion': optional_time(state.estimated[i]),
+                'cpu_demand': task.cpu_demand, 'memory_demand': task.ram_demand,
+                'storage_demand': task.storage_demand, 'bandwidth_demand': task.bandwidth_demand}
+
+    def task_times_record(self, task, i):
+        return {'start': optional_time(self.task_state.start[i]), 'end': optional_time(self.task_state.end[i])}
+
+    def get_task_data_location(self, task):
+        # [(文件名, 大小, 所在位置)]，位置为节点ID、"terminal" 或尚未确定时的 None
+        uses = task.input_slice
+        file_names = self.task_table.file_names
+        return [(file_names[f], size, self.location_name(location)) for f, size, location in
+                zip(self.task_table.input_file[uses].tolist(), self.task_table.input_size[uses].tolist(), self.task_state.source[uses].tolist())]
+
+    def location_name(self, location):
+        if location >= 0:
+            return self.node_list[location].node_id
+        return 'terminal' if location == LOCATION_TERMINAL else None
+
+    def get_assigned_node(self, task):
+        # 任务被分配到的节点，尚未分配时为 None
+        location = self.task_state.assigned[self.task_index[task.task_id]]
+        return self.node_list[location] if location >= 0 else None
+
+    def snapshot(self):
+        """
+        保存当前的完整仿真状态。数组部分是几次定长拷贝，事件队列、运行中的任务和历史记录只拷贝引用列表，
+        开销与任务数呈线性但不经过任何 Python 对象的深拷贝。配合 restore() 可用于前瞻搜索或 reset。
+        """
+        return EnvSnapshot(
+            free=self.cluster_state.free.copy(),
+            arrays=self.task_state.copy_arrays(),
+            clock=self.simulated_time.now(),
+            network_bytes=self.network_bytes,
+            event_count=self.event_count,
+            ready_counter=self.ready_counter,
+            events=self.events.snapshot(),
+            running=list(self.running_tasks.items()),
+            containers=[list(node.containers) for node in self.node_list],
+            histories=tuple(ring.snapshot() for ring in self.encoder.histories),
+            network=self.network.snapshot() if self.network is not None else None,
+            replicas=self.replicas.snapshot() if self.replicas is not None else None,
+            bound=(self.path_tracker.snapshot(), self._bound),
+        )
+
+    def restore(self, snapshot):
+        # 恢复到 snapshot() 时的状态；同一个快照可以反复恢复
+        np.copyto(self.cluster_state.free, snapshot.free)
+        self.task_state.load_arrays(snapshot.arrays)
+        self.completed_tasks.refresh()
+        self.pending_tasks.refresh()
+        self.simulated_time = SimulatedClock(snapshot.clock)
+        self.network_bytes = snapshot.network_bytes
+        self.event_count = snapshot.event_count
+        self.ready_counter = snapshot.ready_counter
+        self.events.restore(snapshot.events)
+        self.running_tasks = dict(snapshot.running)
+        for node, containers in zip(self.node_list, snapshot.containers):
+            node.containers[:] = containers
+        for ring, history in zip(self.encoder.histories, snapshot.histories):
+            ring.restore(history)
+        if self.network is not None:
+            self.network.restore(snapshot.network)
+        if self.replicas is not None:
+            self.replicas.restore(snapshot.replicas)
+        tracker, self._bound = snapshot.bound
+        self.path_tracker.restore(tracker)
+        # 就绪队列按进入顺序重建
+        state = self.task_state
+        ready = np.flatnonzero(state.ready)
+        ready = ready[np.argsort(state.ready_seq[ready], kind='stable')]
+        self.ready_tasks = {self.task_ids[i]: self.task_list[i] for i in ready}
+        self.state['current_time'] = snapshot.clock
+
     # 任务开始时刻：start_time
     # 输入文件传输完成：确保任务能够在执行时拥有所有所需的输入文件。这样可以确保任务开始执行时不缺少必要的数据。
     # 执行准备就绪：在所有必要的输入文件传输完成后，并且资源已分配完毕，可以开始任务的实际执行
     def start_task(self,task):
-        self.state['task_times'][task.task_id]['start'] = self.simulated_time.now()
-        self.state['task_status'][task.task_id]['progress'] = 0.0
+        self.task_state.start[self.task_index[task.task_id]] = self.simulated_time.now()
+        self.events.push(self.simulated_time.now(), TASK_START, task.task_id)
 
     # 任务完成时刻：end_time
     # 任务执行完成：任务的计算部分已经完成
     # 输出文件传输完成：确保任务产生的所有输出文件也已经成功传输到目标位置
     def end_task(self,task):
-        self.state['task_times'][task.task_id]['end'] = self.simulated_time.now()
-        self.state['task_status'][task.task_id]['progress'] = 1.0
-        self.state['task_status'][task.task_id]['completed'] = True
-        self.state['task_history'].append((task.task_id, task.assigned_node_id))
+        i = self.task_index[task.task_id]
+        state = self.task_state
+        state.end[i] = self.simulated_time.now()
+        self.path_tracker.update(i, state.end[i])
         self.completed_tasks.add(task.task_id)
+        node_location = state.assigned[i]
+        self.record_history(self.task_history, node_location, task.runtime, state.end[i] - state.start[i])
+
+        # 输出文件写在本节点上：通过预先建立的索引直接更新读取它们的子任务输入
+        if self.replicas is not None:
+            self.replicas.store_outputs(self.cluster_state.rows[node_location], self.output_files[i])
+        for u in self.output_consumers[i]:
+            state.source[u] = node_location
+            if not state.arrived[u]:
+                state.arrived[u] = True
+                consumer = self.input_task[u]
+                state.missing_inputs[consumer] -= 1
+                self.update_ready(consumer)
+
+        for child in self.children_index[i]:
+            state.unfinished_parents[child] -= 1
+            self.update_ready(child)
 
-        # 确定输出文件的目标主机
-        for output_file in task.outputs:
-            for child_task_id in task.children:
-                child_task = self.tasks[child_task_id]
-                for input_file in child_task.inputs:
-                    if input_file['filename'] == output_file['filename']:
-                        input_file['source_host_id'] = task.assigned_node_id
-                        input_file['target_host_id'] = child_task.assigned_node_id
-                        child_task.input_files_transferred[input_file['filename']] = True
+    def update_ready(self, i):
+        state = self.task_state
+        if state.unfinished_parents[i] == 0 and state.missing_inputs[i] == 0 and state.pending[i] and not state.ready[i]:
+            self.mark_ready(i)
 
+    def mark_ready(self, i):
+        self.task_state.ready[i] = True
+        self.task_state.ready_seq[i] = self.ready_counter
+        self.ready_counter += 1
+        self.ready_tasks[self.task_ids[i]] = self.task_list[i]
+
+    def record_history(self, ring, node_location, *values):
+        # 节点下标按 node_list 归一化到 [0, 1]，其余值原样写入预分配的行
+        row = self._history_row
+        row[0] = node_location / max(self.action_dim - 1, 1)
+        row[1:] = values
+        ring.append(row)
+
+    def unmark_ready(self, i):
+        # 任务被调度后移出就绪队列
+        self.task_state.ready[i] = False
+        del self.ready_tasks[self.task_ids[i]]
 
     def advance_time(self, timedelta):
         self.simulated_time.advance(timedelta)
         self.state['current_time'] = self.simulated_time.now()
 
+    def process_due_events(self):
+        """
+        处理所有已经到期(不晚于当前时刻)的事件，返回期间完成任务获得的奖励。
+        启用网络模型时，同一时刻开始和结束的流在该时刻的事件全部处理完后一起重新分配带宽；
+        network_only 记录这一批是否只有网络模型内部的事件(流完成、开始回传输出)，即就绪任务和资源都没有变化。
+        """
+        reward = 0
+        now = self.simulated_time.now()
+        self.network_only = True
+        while True:
+            while self.events and self.events.peek_time() <= now:
+                time, kind, payload = self.events.pop()
+                if kind not in NETWORK_EVENTS:
+                    self.network_only = False
+                reward += self.handle_event(time, kind, payload)
+            if self.network is None or not self.network.dirty:
+                return reward
+            self.schedule_flows()
+
+    def advance_to_next_event(self):
+        # 时钟跳到下一个事件时刻，并处理该时刻的全部事件；只有网络模型内部事件的时刻不交还给策略，继续推进，
+        # 与静态网络模型在相同的时刻(任务开始、输入传输完成、任务完成)把控制交还给策略
+        reward = 0
+        while True:
+            if self.network is not None:
+                self.drop_stale_flows()
+                if not self.events:
+                    return reward
+            self.simulated_time.advance_to(self.events.peek_time())
+            self.state['current_time'] = self.simulated_time.now()
+            reward += self.process_due_events()
+            if not self.network_only or not self.events:
+                break
+        if self.resource_utilization_history.capacity:
+            np.mean(self.calculate_resource_utilization(), axis=0, out=self._history_row)
+            self.resource_utilization_history.append(self._history_row)
+        return reward
+
+    def drop_stale_flows(self):
+        # 重新分配带宽后旧版本的 FLOW_DONE 事件留在堆中，跳转时钟前先丢弃队首的这些事件，避免空转到它们的时刻
+        while self.events:
+            _, kind, payload = self.events.peek()
+            if kind != FLOW_DONE or payload == self.network.epoch:
+                return
+            self.events.pop()
+
+    def handle_event(self, time, kind, task_id):
+        if kind == FLOW_DONE:
+            # 带宽重新分配后旧版本的完成事件作废；同一时刻完成的流一起结束
+            if task_id != self.network.epoch:
+                return 0
+            for flow in self.network.finished(time):
+                self.event_count += 1
+                profiler.count(EVENT_COUNTERS[kind])
+                self.finish_flow(time, flow)
+            return 0
+        self.event_count += 1
+        profiler.count(EVENT_COUNTERS[kind])
+        task = self.tasks[task_id]
+        docker, node = self.running_tasks[task_id]
+        if kind == TASK_START:
+            # 开始拉取输入文件
+            i = self.task_index[task_id]
+            target = self.node_rows[self.task_state.assigned[i]]
+            if self.network is not None:
+                self.start_input_flows(i, target, time)
+            else:
+                self.events.push(time + self.input_transfer_time(i, target), TRANSFER_DONE, task_id)
+        elif kind == TRANSFER_DONE:
+            # 输入文件到齐，开始执行；执行结束后还要把叶子任务的输出传回终端
+            i = self.task_index[task_id]
+            output_time = self.output_transfer_time(i, self.node_rows[self.task_state.assigned[i]])
+            finish_time = time + task.runtime + output_time
+            self.task_state.estimated[i] = finish_time
+            self.path_tracker.update(i, time + task.runtime)
+            if self.network is None:
+                self.events.push(finish_time, TASK_FINISH, task_id)
+            elif output_time > 0:
+                self.events.push(time + task.runtime, OUTPUT_START, task_id)
+            else:
+                self.events.push(time + task.runtime, TASK_FINISH, task_id)
+        elif kind == OUTPUT_START:
+            i = self.task_index[task_id]
+            self.start_output_flows(i, self.node_rows[self.task_state.assigned[i]], time)
+        elif kind == TASK_FINISH:
+            del self.running_tasks[task_id]
+            node.release_resources(docker)
+            self.end_task(task)
+            return -self.calculate_cost(task, node)
+        return 0
+
+    def start_input_flows(self, i, target, now):
+        # 每个不在本主机上的源位置一条流(同一来源的输入文件合并)，全部完成后触发 TRANSFER_DONE
+        first, last = self.input_ptr[i], self.input_ptr[i + 1]
+        sources = self.task_state.source[first:last]
+        if (sources == LOCATION_UNKNOWN).any():
+            raise ValueError(f"Input files of task {self.task_ids[i]} have not been produced yet.")
+        rows = self.location_rows(sources)
+        remote = rows != target
+        groups = np.unique(rows[remote], return_inverse=True)
+        sizes = np.bincount(groups[1], weights=self.input_size[first:last][remote], minlength=len(groups[0]))
+        self.start_flows(i, [(int(row), target, size) for row, size in zip(groups[0], sizes)], now)
+
+    def start_output_flows(self, i, source, now):
+        # 叶子任务的全部输出合并成一条传回终端的流，完成后触发 TASK_FINISH；owner 取 ~i 以区分输入流
+        terminal = self.terminal_index()
+        self.start_flows(~i, [(source, terminal, sum(self.terminal_outputs[i]))] if source != terminal else [], now)
+
+    def start_flows(self, owner, flows, now):
+        i = owner if owner >= 0 else ~owner
+        self.task_state.pending_flows[i] = len(flows)
+        if not flows:
+            self.events.push(now, TRANSFER_DONE if owner >= 0 else TASK_FINISH, self.task_ids[i])
+            return
+        # 带宽在该时刻的事件处理完后统一分配(process_due_events)
+        for source, target, size in flows:
+            self.network.add_flow(now, source, target, size, owner)
+
+    def finish_flow(self, now, flow):
+        owner = self.network.remove_flow(flow)
+        i = owner if owner >= 0 else ~owner
+        self.task_state.pending_flows[i] -= 1
+        if self.task_state.pending_flows[i] == 0:
+            self.events.push(now, TRANSFER_DONE if owner >= 0 else TASK_FINISH, self.task_ids[i])
+        return 0
+
+    def schedule_flows(self):
+        # 为当前时刻开始和结束的流重新分配带宽，只为最早完成的流排一个 FLOW_DONE 事件；
+        # 之后带宽重新分配时网络的版本号改变，该事件作废
+        if not self.network.dirty:
+            return
+        self.network.flush(self.simulated_time.now())
+        finish_time = self.network.next_finish()
+        if finish_time < np.inf:
+            self.events.push(finish_time, FLOW_DONE, self.network.epoch)
+
     def check_input_files_transferred(self,task):
         # 检查任务的所有输入文件是否已传输
-        return all(task.input_files_transferred.values())
+        i = self.task_index[task.task_id]
+        return bool(self.task_state.arrived[self.input_ptr[i]:self.input_ptr[i + 1]].all())
     
     def check_output_files_transferred(self,task):
-        # 检查任务的所有输出文件是否已传输
-        return all(task.output_files_transferred.values())
+        # 输出文件写在分配到的节点上即视为完成
+        return bool(self.task_state.assigned[self.task_index[task.task_id]] >= 0)
     def get_resource_state(self):
-        resource_state = []
-        for master in self.cloud_masters +self.edge_masters:
-            resource_state.append({
-                'cpu': master.host.cpu, 
-                'ram': master.host.ram,
-                'storage': master.host.storage,
-                'load':master.host.get_resource_utilization()
-                })
-            for worker in master.workers:
-                resource_state.append({
-                'cpu':worker.host.cpu, 
-                'ram':worker.host.ram, 
-                'storage':worker.host.storage,
-                'load':worker.host.get_resource_utilization()})
-        return resource_state
+        # (节点数, 6)：剩余 cpu/ram/storage 和对应的利用率。返回的是预分配数组本身，
+        # 会随仿真原地更新，需要保留某一时刻的值时请自行 copy()
+        return self.cluster_state.observe()
     
+    def current_task(self):
+        # 策略每次为就绪队列中最早就绪的任务选择节点
+        return next(iter(self.ready_tasks.values()), None)
+
+    def make_action(self, node_index):
+        # 把策略输出的节点下标转换成 step 使用的 (任务, 容器, 节点) 动作
+        task = self.current_task()
+        return task, self.make_docker(task), self.node_list[node_index]
+
+    def get_observation(self):
+        """
+        定长的 float32 观测向量：node_list 顺序的节点资源状态(每个节点6维)，当前任务和工作流进度特征，
+        以及任务、失败和利用率历史(从旧到新)。写入 ObservationEncoder 的预分配缓冲区，调用方需要保留时请自行 copy()。
+        """
+        observation = self.encoder.base
+        resource_size = self.action_dim * 6
+        observation[:resource_size] = self.get_resource_state().reshape(-1)
+        task = self.current_task()
+        features = observation[resource_size:]
+        if task is not None:
+            features[0] = task.runtime
+            features[1] = self.input_bytes[self.task_index[task.task_id]] / 1e6
+            features[2] = self.child_count[self.task_index[task.task_id]]
+        else:
+            features[:3] = 0.0
+        features[3] = len(self.completed_tasks) / max(len(self.tasks), 1)
+        features[4] = len(self.ready_tasks) / max(len(self.tasks), 1)
+        return self.encoder.encode()
+
+    def action_mask(self, task=None):
+        """
+        当前任务(默认为 current_task())放得下的节点：一次向量化比较容器需求与 node_list 中所有节点的剩余资源，
+        返回长度为 action_dim 的布尔数组，与 Node.can_allocate 的判断一致。没有待调度任务时全部为 False。
+        写入预分配的缓冲区，调用方需要保留时请自行 copy()。
+        """
+        task = task if task is not None else self.current_task()
+        mask = self._action_mask
+        if task is None:
+            mask[:] = False
+            return mask
+        np.take(self.cluster_state.free, self.cluster_state.rows, axis=0, out=self._node_free)
+        np.greater_equal(self._node_free, self.task_demand[self.task_index[task.task_id]], out=self._node_fits)
+        np.all(self._node_fits, axis=1, out=mask)
+        return mask
+
+    def action_masks(self, rows):
+        # (len(rows), action_dim)：任务表中第 rows 行的任务各自放得下的节点，逐行与 action_mask 的判断一致
+        free = self.cluster_state.free[self.cluster_state.rows]
+        return np.all(free[None, :, :] >= self.task_demand[rows][:, None, :], axis=2)
+
     def can_schedule(self,task):
-        # 检查该任务的所有parent是否已经完成
-        for parent_id in task.parents:
-            if not self.state['task_status'][parent_id]['completed']:
-                return False
-        # 检查任务的输入文件是否都已到达
-        if not self.check_input_files_transferred(task):
-            return False
-        return True
+        # 所有parent已完成且输入文件都已到达的任务才在就绪队列中
+        return task.task_id in self.ready_tasks
     
     def get_state(self):
         return{
             'task_status': self.state['task_status'],
             'resource_state': self.get_resource_state(),
             'workflow_dependencies': self.dependencies,
-            'schedulable_tasks': [task for task in self.tasks.values() if self.can_schedule(task)],
-            'current_time': self.time,
+            'schedulable_tasks': list(self.ready_tasks.values()),
+            'current_time': self.simulated_time.now(),
             'task_times': self.state['task_times'],
             'task_history': self.state['task_history']
         }
 
     def step(self, actions):
-        # 执行动作并返回新的状态、奖励、是否结束、额外信息
-        rewards = 0
-        for action in actions:
-            task, docker, node = action
-            try:
-                # 检查任务是否可以调度以及节点是否能够分配资源
-                if self.can_schedule(task) and node.can_allocate(docker):
-                    # 分配资源
-                    allocated = node.allocate_resources(docker)
-                    if allocated:
-                        # 动态确定每个输入文件的源主机和每个输出文件的目标主机
+        # 执行动作并返回新的状态、奖励、是否结束、额外信息；各阶段的耗时可通过 profiling.profiler 开启统计
+        with profiler.span('env.step'):
+            rewards = 0
+            placed = 0
+            for action in actions:
+                task, docker, node = action
+                try:
+                    # 只有资源检查和分配可能因动作本身无效(未知的任务或节点、非法的容器需求)而失败，按分配失败处理；
+                    # 之后的状态更新出错说明仿真有 bug，直接抛出
+                    target = self.node_index[node.node_id]
+                    with profiler.span('env.can_schedule'):
+                        schedulable = self.can_schedule(task) and node.can_allocate(docker)
+                    if schedulable:
+                        with profiler.span('env.allocate'):
+                            allocated = node.allocate_resources(docker)
+                except ALLOCATION_ERRORS as e:
+                    print(f"Error processing action: {e}")
+                    rewards += -100
+                    continue
+                if not schedulable:
+                    profiler.count('env.rejected_actions')
+                    self.record_history(self.task_failure_history, target, task.runtime, FAILURE_REJECTED)
+                    reward = 0 # 根据需要调整
+                elif not allocated:
+                    self.record_history(self.task_failure_history, target, task.runtime, FAILURE_ALLOCATION)
+                    reward = -100 # 分配资源失败，给予大惩罚
+                else:
+                    i = self.task_index[task.task_id]
+                    self.task_state.assigned[i] = target
+                    # 统计需要跨节点传输的输入数据量
+                    with profiler.span('env.assign_file_hosts'):
                         self.assign_file_hosts(task, node)
-                        
-                        # 启动任务
+
+                    # 启动任务，传输和执行由事件队列推进，完成时再结算奖励
+                    with profiler.span('env.start_task'):
+                        self.running_tasks[task.task_id] = (docker, node)
                         self.start_task(task)
-                        self.pending_tasks.remove(task)
-
-                        # 模拟任务执行
-                        actual_time = self.calculated_actual_runtime(task,node)
-
-                        if self.check_output_files_transferred(task):
-                            # 结束任务
-                            self.end_task(task)
-                            reward = -self.calculate_cost(task, node)
-                        else:
-                            reward = 0
-                    else:
-                        reward = -100 # 分配资源失败，给予大惩罚
-                else:
-                    reward = 0 # 根据需要调整
-            except Exception as e:
-                # 记录异常并处理（例如回滚操作），这里简单返回作为演示
-                print(f"Error processing action: {e}")
-                reward = -100
-
-
-            # 调整时间片大小
-            #task_time = self.calculate_tasktime(task, node)
-            #if task_time > self.time_slice:
-            #    self.time_slice = task_time
-            #else:
-            #    self.time_slice = max(1, self.time_slice // 2)
-    
-        next_state = self.get_state()
-        done = len(self.pending_tasks) == 0
+                        self.path_tracker.update(i, self.simulated_time.now() + task.runtime)
+                        self.pending_tasks.remove(task.task_id)
+                        self.unmark_ready(i)
+                    placed += 1
+                    reward = 0
+                rewards += reward
+
+            # 处理本时刻的事件；没有可调度任务或本步没有成功放置任何任务时，
+            # 直接跳到下一个事件（通常是某个任务完成并释放资源）
+            with profiler.span('env.process_events'):
+                costs = self.process_due_events()
+                if self.events and (not self.ready_tasks or placed == 0):
+                    costs += self.advance_to_next_event()
+                    while self.events and not self.ready_tasks:
+                        costs += self.advance_to_next_event()
+            rewards += self.shape_reward(costs)
+
+            with profiler.span('env.get_state'):
+                next_state = self.get_state()
+            done = len(self.completed_tasks) == len(self.tasks)
         return next_state, rewards, done
     
+    def shape_reward(self, costs):
+        # 按奖励模式组合本步完成任务的成本奖励与 makespan 下界的变化
+        if self.reward_mode == 'cost':
+            return costs
+        bound = self.path_tracker.lower_bound(self.simulated_time.now(), self.task_state.pending)
+        progress = self._bound - bound
+        self._bound = bound
+        if self.reward_mode == 'makespan':
+            return progress
+        return costs + self.makespan_weight * progress
+
+    def makespan_lower_bound(self):
+        # 按当前的放置和执行进度，从仿真开始算起 makespan 至少为多少(只计运行时间，不含传输)
+        return self.path_tracker.lower_bound(self.simulated_time.now(), self.task_state.pending) - self.start_time
+
+    def remaining_critical_path(self):
+        # 从当前时刻起工作流至少还需的时间
+        return self.path_tracker.remaining(self.simulated_time.now(), self.task_state.pending)
+
     def assign_file_hosts(self, task, node):
-        for input_file in task.inputs:
-            if not input_file.get('source_host_id'):
-                if not task.parents:
-                    input_file['source_host_id'] = "terminal"
-                else:
-                    parent_task = self.get_task_producing_file(input_file['filename'])
-                    input_file['source_host_id'] = parent_task.assigned_node_id if parent_task else "unknown"
-            input_file['target_host_id'] = node.node_id
-            # 模拟文件传输完成
-            task.input_files_transferred[input_file['filename']] = True
-
-        for output_file in task.outputs:
-            output_file['source_host_id'] = node.node_id
-            output_file['target_host_id'] = "terminal" if not task.children else None  # 设置为None，等到依赖任务确定
-            # 模拟文件传输完成
-            if not task.children:
-                task.output_files_transferred[output_file['filename']] = True
+        # 任务开始时所有输入都已到达，源位置是生产任务所在的节点或终端(启用副本时是最快的副本)；不在本主机上的需要经网络传输
+        i = self.task_index[task.task_id]
+        first, last = self.input_ptr[i], self.input_ptr[i + 1]
+        target = self.node_index[node.node_id]
+        if self.replicas is not None:
+            self.select_replicas(i, target)
+        remote = self.task_state.source[first:last] != target
+        self.network_bytes += int(self.input_size[first:last][remote].sum())
+        if self.replicas is not None:
+            self.replicas.hits += int(np.count_nonzero(~remote))
+            self.replicas.fetch_inputs(self.cluster_state.rows[target], self.input_file[first:last])
+
+    def build_replicas(self, capacity):
+        # 文件大小取各处记录的最大值；capacity 为每台主机副本缓存的字节数，缺省为主机的总存储。
+        # 缓存是与容器存储分开的固定容量，副本不从 ClusterState.free 中扣除
+        table = self.task_table
+        file_size = np.zeros(len(table.file_names))
+        np.maximum.at(file_size, table.input_file, self.input_size)
+        np.maximum.at(file_size, table.output_file, table.output_size.astype(np.float64))
+        reads = np.bincount(table.input_file, minlength=len(table.file_names))
+        if capacity is None:
+            capacity = self.cluster_state.total[:, STORAGE] * GIGABYTE
+        # 每台主机上的第一个节点，副本所在主机换算成位置编码时使用
+        self.host_node = np.zeros(len(self.cluster_state.hosts), dtype=np.int32)
+        self.host_node[self.cluster_state.rows[::-1]] = np.arange(len(self.node_list))[::-1]
+        return ReplicaRegistry(file_size, table.producer < 0, reads, len(self.cluster_state.hosts), capacity)
+
+    def replica_sources(self, i):
+        """
+        第 i 个任务每个输入的候选源：返回 (源位置编码数组, (输入数, 源数) 的可用掩码)。
+        已到达的输入取所有副本(外部输入再加上终端)，尚未产生的输入取生产任务已分配的节点。
+        """
+        first, last = self.input_ptr[i], self.input_ptr[i + 1]
+        state = self.task_state
+        files = self.input_file[first:last]
+        hosts, held = self.replicas.holder_matrix(files)
+        locations = np.append(self.host_node[hosts], LOCATION_TERMINAL)
+        available = np.zeros((len(files), len(locations)), dtype=bool)
+        arrived = state.arrived[first:last]
+        available[:, :-1] = held & arrived[:, None]
+        available[:, -1] = self.replicas.external[files]
+        producers = state.assigned[self.input_producer[first:last]]
+        waiting = ~arrived & (self.input_producer[first:last] >= 0) & (producers != LOCATION_UNKNOWN)
+        if waiting.any():
+            extra = np.unique(producers[waiting])
+            locations = np.concatenate([locations, extra])
+            available = np.concatenate([available, waiting[:, None] & (producers[:, None] == extra[None, :])], axis=1)
+        return locations, available
+
+    def replica_input_times(self, i, candidate_rows):
+        # (候选数,)：每个输入从最快的可用源传到各候选主机的时间之和；没有任何可用源的输入不计
+        locations, available = self.replica_sources(i)
+        first, last = self.input_ptr[i], self.input_ptr[i + 1]
+        usable = available.any(axis=1)
+        if not usable.any():
+            return np.zeros(len(candidate_rows))
+        return self.estimator.fastest_transfer_times(self.location_rows(locations), available[usable],
+                                                     self.input_size[first:last][usable], candidate_rows)
+
+    def select_replicas(self, i, target):
+        # 任务放到 target 节点时，每个输入改为从传到该节点最快(带宽最高)的副本拉取
+        locations, available = self.replica_sources(i)
+        first, last = self.input_ptr[i], self.input_ptr[i + 1]
+        times = replica_times(self.estimator, self.location_rows(locations), self.input_size[first:last],
+                              self.node_rows[target])
+        best = np.argmin(np.where(available, times, np.inf), axis=1)
+        # 副本就在目标主机上时源记为目标节点本身，不计传输
+        hosts = self.cluster_state.rows
+        local = (locations >= 0) & (hosts[np.maximum(locations, 0)] == hosts[target])
+        locations = np.where(local, target, locations)
+        self.task_state.source[first:last] = locations[best]
 
     def get_task_producing_file(self,file_name):
-        for task in self.tasks.values():
-            for output_file in task.outputs:
-                if output_file['filename'] == file_name:
-                    return task
-        return None
+        producer_id = self.file_registry.get_producer(file_name)
+        return self.tasks[producer_id] if producer_id is not None else None
+
+    def get_pending_consumers(self, file_name):
+        # 读取该文件且尚未完成的任务
+        return [self.tasks[task_id] for task_id, _ in self.file_registry.get_consumers(file_name) if task_id not in self.completed_tasks]
+    def build_topology(self):
+        topology = Topology.from_hosts([node.host for node in self.node_list])
+        if 'terminal' not in topology:
+            # 文件位置用 "terminal" 表示终端设备，映射到拓扑中的第一台终端主机
+            terminal_id = next((host_id for host_id in topology.host_ids if str(host_id).startswith('terminal')), None)
+            if terminal_id is not None:
+                topology.add_alias('terminal', terminal_id)
+        return topology
+
+    def calculate_transfer_times(self, task, node):
+        # 计算输入、输出文件的传输时间(秒)，同一主机上的文件不需要传输；没有网络路径时抛出 ValueError
+        i = self.task_index[task.task_id]
+        target = self.node_rows[self.node_index[node.node_id]]
+        return self.input_transfer_time(i, target), self.output_transfer_time(i, target)
+
+    def input_transfer_time(self, i, target):
+        # 第 i 个任务的全部输入从各自的源位置传到 target 行主机的时间；每个任务只有少量输入，逐个计算比向量化更快
+        first, last = self.input_ptr[i], self.input_ptr[i + 1]
+        total = 0.0
+        for location, size in zip(self.task_state.source[first:last].tolist(), self.input_size[first:last].tolist()):
+            if location == LOCATION_UNKNOWN:
+                raise ValueError(f"Input files of task {self.task_ids[i]} have not been produced yet.")
+            total += self.topology.row_transfer_time(self.node_rows[location] if location >= 0 else self.terminal_index(), target, size)
+        return total
+
+    def output_transfer_time(self, i, target):
+        # 叶子任务的输出传回终端的时间
+        output_sizes = self.terminal_outputs[i]
+        if not output_sizes:
+            return 0.0
+        terminal = self.terminal_index()
+        return sum(self.topology.row_transfer_time(target, terminal, size) for size in output_sizes)
+
+    def terminal_index(self):
+        if self.terminal_row < 0:
+            raise KeyError('terminal')
+        return self.terminal_row
+
+    def location_rows(self, locations):
+        # 位置编码(节点下标 / 终端)在拓扑矩阵中的行号
+        if self.terminal_row < 0 and (locations == LOCATION_TERMINAL).any():
+            raise KeyError('terminal')
+        return np.where(locations >= 0, self.node_rows[np.maximum(locations, 0)], self.terminal_row)
+
+    def estimate_placements(self, task, nodes=None):
+        """
+        向量化估计任务放在 node_list 中每个节点上的 输入传输 + 执行 + 输出传输 时间，
+        返回长度为节点数的数组，不可达的节点为 inf。输入文件的位置取已确定的源节点或其生产任务所在的节点。
+        nodes(节点下标数组)给出时只估计这些节点，各节点的估计互不影响，结果与全部估计时的对应项相同。
+        """
+        candidates = self.node_rows if nodes is None else self.node_rows[nodes]
+        i = self.task_index[task.task_id]
+        first, last = self.input_ptr[i], self.input_ptr[i + 1]
+        state = self.task_state
+        locations = state.source[first:last].copy()
+        unknown = locations == LOCATION_UNKNOWN
+        locations[unknown] = state.assigned[self.input_producer[first:last][unknown]]
+        known = locations != LOCATION_UNKNOWN
+        input_rows = self.location_rows(locations[known])
+        output_sizes = self.terminal_outputs[i]
+        output_rows = [self.terminal_row] * len(output_sizes)
+        if self.replicas is not None:
+            return (self.estimator.estimate_times([], [], task.runtime, output_rows, output_sizes, candidates)
+                    + self.replica_input_times(i, candidates))
+        return self.estimator.estimate_times(input_rows, self.input_size[first:last][known], task.runtime,
+                                             output_rows, output_sizes, candidates)
+
+    def estimate_tasks(self, rows, nodes=None):
+        """
+        estimate_placements 的批量形式：返回 (len(rows), 节点数)，第 r 行与对第 rows[r] 个任务调用 estimate_placements 的结果相同。
+        不启用副本时所有任务的输入传输在一次向量化计算中得出；启用副本时逐个任务计算。
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        candidates = self.node_rows if nodes is None else self.node_rows[nodes]
+        if self.replicas is not None:
+            estimates = np.empty((len(rows), len(candidates)))
+            for r, i in enumerate(rows.tolist()):
+                estimates[r] = self.estimate_placements(self.task_list[i], nodes)
+            return estimates
+        state = self.task_state
+        position = np.full(len(self.task_list), -1, dtype=np.intp)
+        position[rows] = np.arange(len(rows))
+        inputs = np.flatnonzero(position[self.input_task] >= 0)
+        locations = state.source[inputs]
+        unknown = locations == LOCATION_UNKNOWN
+        locations[unknown] = state.assigned[self.input_producer[inputs][unknown]]
+        known = locations != LOCATION_UNKNOWN
+        estimates = self.estimator.grouped_transfer_times(
+            self.location_rows(locations[known]), self.input_size[inputs][known],
+            position[self.input_task[inputs][known]], len(rows), candidates)
+        estimates += self.task_table.runtime[rows][:, None]
+        for r, i in enumerate(rows.tolist()):
+            output_sizes = self.terminal_outputs[i]
+            if output_sizes:
+                estimates[r] += self.estimator.estimate_times([], [], 0.0, [self.terminal_row] * len(output_sizes),
+                                                              output_sizes, candidates)
+        return estimates
+
     def calculate_actual_runtime(self, task, node):
         # 计算实际运行时间
-        input_time = sum([input_file['size'] / node.host.get_bandwidth(input_file['source_host_id']) for input_file in task.inputs])
-        output_time = sum([output_file['size'] / node.host.get_bandwidth(output_file['target_host_id']) for output_file in task.outputs if output_file.get('target_host_id')])
+        input_time, output_time = self.calculate_transfer_times(task, node)
         execution_time = task.runtime
         return input_time + output_time + execution_time
 
+    def calculate_cost(self, task, node):
+        # 按任务在该节点上的实际占用时间计费；已完成的任务直接用记录的起止时间
+        i = self.task_index[task.task_id]
+        if self.task_state.completed[i]:
+            return float(self.task_state.end[i] - self.task_state.start[i])
+        return self.calculate_actual_runtime(task, node)
+
+    def get_makespan(self):
+        # 从仿真开始到最后一个任务完成的时间
+        if not len(self.completed_tasks):
+            return 0.0
+        return float(np.nanmax(self.task_state.end)) - self.start_time
+
+    def get_total_cost(self):
+        # 所有已完成任务的占用时间之和，即各任务完成奖励之和的相反数
+        done = self.task_state.completed
+        return float(np.sum(self.task_state.end[done] - self.task_state.start[done]))
+
+    def make_docker(self, task):
+        # 按任务的资源需求创建容器
+        return Docker(container_id=f'container_{task.task_id}', cpu=task.cpu_demand, ram=task.ram_demand, storage=task.storage_demand)
+
+    def calculate_system_load(self):
+        # 所有节点CPU利用率的平均值
+        utilization = self.calculate_resource_utilization()
+        return float(utilization[:, 0].mean()) if len(utilization) else 0.0
+
+    def calculate_network_bandwidth_usage(self):
+        return self.network_bytes
+
     def calculate_resource_utilization(self):
-        utilization = []
-        for master in self.cloud_masters + self.edge_masters:
-            utilization.append(master.host.get_resource_utilization())
-            for worker in master.workers:
-                utilization.append(worker.host.get_resource_utilization())
-        return utilization
+        # (节点数, 3)：每个节点的 cpu/ram/storage 利用率
+        return self.cluster_state.node_utilization()
 
     def reset(self):
-        self.completed_tasks.clear()
-        self.pending_tasks = deque(self.tasks.values())
-        self.time = 0
-        self.state = self.get_initial_state()
+        # 恢复构造时保存的初始快照：释放资源、清空事件队列、时钟拨回起点都只是数组拷贝
+        self.restore(self._initial_snapshot)
         return self.get_state()
-
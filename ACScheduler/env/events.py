@@ -0,0 +1,56 @@
+import heapq
+
+# 事件类型。同一时刻的事件按 完成 -> 传输完成 -> 开始 -> 工作流到达 的顺序处理，先释放资源再启动新任务
+TASK_FINISH = 0
+TRANSFER_DONE = 1
+TASK_START = 2
+WORKFLOW_ARRIVAL = 3  # 多工作流模式(env.arrivals)：事件的 task_id 位置是工作流下标
+# 流级网络模型(env.network)：FLOW_DONE 的 task_id 位置是网络的版本号，表示最早的一批流完成，OUTPUT_START 表示执行结束、开始回传输出
+FLOW_DONE = 4
+OUTPUT_START = 5
+
+EVENT_NAMES = {TASK_FINISH: 'task_finish', TRANSFER_DONE: 'transfer_done', TASK_START: 'task_start',
+               WORKFLOW_ARRIVAL: 'workflow_arrival', FLOW_DONE: 'flow_done', OUTPUT_START: 'output_start'}
+
+
+class EventQueue:
+    """
+    离散事件优先队列：按 (时间, 事件类型, 入队顺序) 排序，
+    仿真时钟直接跳到下一个事件发生的时刻，而不是按固定时间片推进。
+    """
+    def __init__(self):
+        self._heap = []
+        self._counter = 0
+
+    def push(self, time, kind, task_id):
+        heapq.heappush(self._heap, (time, kind, self._counter, task_id))
+        self._counter += 1
+
+    def pop(self):
+        time, kind, _, task_id = heapq.heappop(self._heap)
+        return time, kind, task_id
+
+    def peek(self):
+        time, kind, _, task_id = self._heap[0]
+        return time, kind, task_id
+
+    def peek_time(self):
+        return self._heap[0][0] if self._heap else None
+
+    def clear(self):
+        self._heap.clear()
+
+    def snapshot(self):
+        # 堆中的元素是不可变元组，浅拷贝列表即可
+        return list(self._heap), self._counter
+
+    def restore(self, snapshot):
+        heap, counter = snapshot
+        self._heap = list(heap)
+        self._counter = counter
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __bool__(self):
+        return bool(self._heap)
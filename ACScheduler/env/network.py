@@ -0,0 +1,317 @@
+"""
+流级网络竞争模型：每次跨主机传输是一条流，经过源主机的出口、目的主机的入口以及(集群之间或主机对之间的)路径链路，
+同一链路上的并发流按最大最小公平(max-min fairness)分享容量，每条流的速率也不超过两端之间的静态带宽。
+
+速率只在流开始或结束时局部地重新计算。一个可行分配是最大最小公平的，当且仅当每条流都有瓶颈：
+要么达到自身上限，要么经过一条已饱和、且自己的速率在其上最大的链路。因此每次变化先只对经过变化链路的流做注水，
+其余流的速率固定不变并占用相应容量；再用 链路 -> 流 的索引取出与这些流共享链路的流，检查它们是否仍有瓶颈，
+把不满足的流及与其共享链路的流加入重算集合，直到全部满足。结果与对整个连通分量重新注水相同。
+主机多、流分散时通常只涉及变化附近的少量流；流集中在少数链路上(例如几十台主机的默认平台)时变化会波及大部分流，
+此时改为对全部活动流注水，开销与活动流数成正比。流的开始(add_flow)和结束(remove_flow)只记下变化的链路，
+flush 时才重新分配一次：环境在处理完同一时刻的全部事件后调用 flush，同一时刻开始和结束的所有流合并成一次注水。
+速率只取决于活动流的集合，所以结果与每次变化都立即重新分配相同。
+每条流的预计完成时刻记在 finish 中，速率变化时更新；环境只为最早完成的流推入一个带网络版本号(epoch)的 FLOW_DONE 事件，
+事件到期时取出所有到时的流(finished)，每次 flush 版本号加一，旧版本的事件直接丢弃，
+因此事件队列的开销与并发流数无关。
+
+容量以 Mbps 给出(与 Topology 相同)，内部按 bit/s 计算；时延在流的数据传完之后一次性加上。
+"""
+import numpy as np
+
+from env.topology import Topology, BITS_PER_BYTE, MEGABIT
+
+NO_FLOWS = np.zeros(0, dtype=np.int64)
+LINKS_PER_FLOW = 3  # 出口、入口、路径；没有路径链路时用0号占位链路(容量无穷大)
+# 判断链路饱和、流在链路上速率最大以及达到上限时的相对容差
+RATE_TOLERANCE = 1e-9
+# 待检查的流超过活动流的这一比例时改为对全部活动流重新注水
+LOCAL_FRACTION = 0.5
+CAP_BOTTLENECK = -1  # bottleneck 中表示瓶颈是流自身的上限(或未知，需要重新检查)
+
+
+class FlowNetwork:
+    def __init__(self, topology, initial_flows=256):
+        self.topology = topology
+        self.num_hosts = len(topology.host_ids)
+        # 0号链路占位；1..H 是各主机出口，H+1..2H 是各主机入口，之后是按需创建的路径链路
+        self.nic = topology.nic_bandwidths() * MEGABIT
+        self.capacity = np.concatenate([[np.inf], self.nic, self.nic])
+        self.link_count = np.zeros(len(self.capacity), dtype=np.int64)
+        self.link_flows = [set() for _ in range(len(self.capacity))]  # 每条链路上的活动流(0号占位链路不记录)
+        self.path_links = {}
+        self.dirty = set()  # 上次 flush 之后流数发生变化的链路
+        self.epoch = 0  # flush 的次数，用来识别过期的 FLOW_DONE 事件
+        self.size = 0  # 已使用过的最大流下标 + 1
+        self.free = []
+        n = initial_flows
+        self.remaining = np.zeros(n)  # 剩余 bit
+        self.rate = np.zeros(n)  # bit/s
+        self.updated = np.zeros(n)  # remaining 对应的时刻
+        self.latency = np.zeros(n)
+        self.cap = np.zeros(n)  # 两端之间的静态带宽，单条流的速率上限
+        self.route = np.zeros((n, LINKS_PER_FLOW), dtype=np.int64)  # 每条流经过的三条链路
+        self.finish = np.zeros(n)  # 按当前速率的预计完成时刻(含时延)
+        self.active = np.zeros(n, dtype=bool)
+        self.owner = np.zeros(n, dtype=np.int64)
+        self.bottleneck = np.full(n, CAP_BOTTLENECK, dtype=np.int64)  # 上次确定速率时的瓶颈链路
+
+    FLOW_FIELDS = ('remaining', 'rate', 'updated', 'latency', 'cap', 'route', 'finish', 'active', 'owner', 'bottleneck')
+
+    def _grow(self):
+        for name in self.FLOW_FIELDS:
+            array = getattr(self, name)
+            grown = np.zeros((2 * len(array),) + array.shape[1:], dtype=array.dtype)
+            grown[:len(array)] = array
+            setattr(self, name, grown)
+
+    def path_link(self, i, j):
+        key = self.topology.path_key(i, j)
+        if key is None:
+            return 0
+        link = self.path_links.get(key)
+        if link is None:
+            link = len(self.capacity)
+            self.path_links[key] = link
+            self.capacity = np.append(self.capacity, self.topology.link(i, j)[0] * MEGABIT)
+            self.link_count = np.append(self.link_count, 0)
+            self.link_flows.append(set())
+        return link
+
+    def start_flow(self, now, i, j, size, owner):
+        """
+        在 now 时刻开始一条从行 i 到行 j、大小为 size 字节的流，返回 (流下标, 速率发生变化的流)。
+        """
+        f = self.add_flow(now, i, j, size, owner)
+        return f, self.flush(now)
+
+    def start_flows(self, now, flows, owner):
+        """
+        同一时刻开始多条流 [(i, j, size)]，只重新分配一次带宽，返回 (流下标列表, 速率发生变化的流)。
+        结果与逐条调用 start_flow 相同。
+        """
+        started = [self.add_flow(now, i, j, size, owner) for i, j, size in flows]
+        return started, self.flush(now)
+
+    def finish_flow(self, now, f):
+        # 流 f 传输完成，返回 (所属者, 速率发生变化的流)
+        owner = self.remove_flow(f)
+        return owner, self.flush(now)
+
+    def add_flow(self, now, i, j, size, owner):
+        # 登记一条流但不重新分配带宽(速率在 flush 之前为0)，返回流下标
+        bandwidth, latency = self.topology.link(i, j)
+        if bandwidth <= 0:
+            raise ValueError(f"No network path between {self.topology.host_ids[i]} and {self.topology.host_ids[j]}.")
+        if self.free:
+            f = self.free.pop()
+        else:
+            if self.size == len(self.active):
+                self._grow()
+            f = self.size
+            self.size += 1
+        links = (1 + i, 1 + self.num_hosts + j, self.path_link(i, j))
+        self.route[f] = links
+        self.remaining[f] = size * BITS_PER_BYTE
+        self.rate[f] = 0.0
+        self.updated[f] = now
+        self.finish[f] = np.inf
+        self.latency[f] = latency
+        self.cap[f] = bandwidth * MEGABIT
+        self.active[f] = True
+        self.owner[f] = owner
+        self.bottleneck[f] = CAP_BOTTLENECK
+        self.link_count[list(links)] += 1
+        for link in links:
+            if link:
+                self.link_flows[link].add(f)
+        self.dirty.update(links)
+        return f
+
+    def remove_flow(self, f):
+        # 流 f 传输完成，释放的容量在 flush 时重新分配；返回流的所属者
+        self.active[f] = False
+        self.rate[f] = 0.0
+        links = self.route[f].tolist()
+        self.link_count[links] -= 1
+        for link in links:
+            if link:
+                self.link_flows[link].discard(f)
+        self.free.append(f)
+        self.dirty.update(links)
+        return int(self.owner[f])
+
+    def flush(self, now):
+        # 对上次 flush 之后开始和结束的流一起重新分配带宽，返回速率发生变化的流
+        if not self.dirty:
+            return NO_FLOWS
+        seeds, self.dirty = self.dirty, set()
+        self.epoch += 1
+        return self.rebalance(now, seeds)
+
+    def next_finish(self):
+        # 最早完成的活动流的预计完成时刻，没有活动流时为 inf
+        return float(np.min(self.finish[:self.size], where=self.active[:self.size], initial=np.inf))
+
+    def finished(self, now):
+        # 到 now 时刻已经完成的活动流
+        return np.flatnonzero(self.active[:self.size] & (self.finish[:self.size] <= now)).tolist()
+
+    def flows_on(self, links):
+        # 经过这些链路的活动流(集合)
+        link_flows = self.link_flows
+        return set().union(*(link_flows[link] for link in links if link))
+
+    def rebalance(self, now, seed_links):
+        flows = self.flows_on(seed_links)
+        if not flows:
+            return NO_FLOWS
+        active = self.size - len(self.free)
+        while True:
+            members = np.fromiter(flows, dtype=np.int64, count=len(flows))
+            links = np.unique(self.route[members])
+            nearby = self.flows_on(links.tolist())
+            if len(nearby) > LOCAL_FRACTION * active:
+                # 变化波及大部分流时(链路少、每条链路上的流多)，局部检查不再划算，直接对全部活动流注水
+                members = np.flatnonzero(self.active[:self.size])
+                rates = self.max_min_rates(members)
+                self.check_bottlenecks(members, rates, members[:0], np.arange(len(self.capacity)))
+                break
+            outside = np.fromiter(nearby - flows, dtype=np.int64, count=len(nearby) - len(flows))
+            # 重算集合之外的流速率不变，占用的容量从这些链路中扣除
+            fixed = np.bincount(self.route[outside].ravel(), weights=np.repeat(self.rate[outside], LINKS_PER_FLOW),
+                                minlength=len(self.capacity))
+            rates = self.max_min_rates(members, fixed)
+            invalid = self.check_bottlenecks(members, rates, outside, links)
+            # 重算集合已对共享链路封闭时它就是若干个完整的连通分量，注水结果精确，不再检查
+            if not len(invalid) or not len(outside):
+                break
+            grown = flows | self.flows_on(self.route[invalid].ravel().tolist())
+            if len(grown) == len(flows):
+                break
+            flows = grown
+        # 先按旧速率把剩余量推进到 now，再换成新速率
+        elapsed = now - self.updated[members]
+        self.remaining[members] = np.maximum(self.remaining[members] - self.rate[members] * elapsed, 0.0)
+        self.updated[members] = now
+        # 浮点误差级别的变化不算，避免为速率实际未变的流重新排期
+        changed = ~np.isclose(rates, self.rate[members], rtol=1e-9, atol=0.0)
+        flows, rates = members[changed], rates[changed]
+        self.rate[flows] = rates
+        self.finish[flows] = now + self.remaining[flows] / rates + self.latency[flows]
+        return flows
+
+    def check_bottlenecks(self, members, rates, outside, links):
+        """
+        members 取新速率 rates、outside 保持原速率时，检查这些流是否都还有瓶颈，并记下找到的瓶颈链路。
+        只有 links(重算集合经过的链路)上的负载发生了变化；outside 中的流原来的瓶颈不在这些链路上时仍然有效。
+        返回没有瓶颈的流。
+        """
+        flows = np.concatenate([members, outside])
+        flow_rates = np.concatenate([rates, self.rate[outside]])
+        routes = self.route[flows]
+        weights = np.repeat(flow_rates, LINKS_PER_FLOW)
+        load = np.bincount(routes.ravel(), weights=weights, minlength=len(self.capacity))
+        fastest = np.zeros(len(self.capacity))
+        np.maximum.at(fastest, routes.ravel(), weights)
+        changed = np.zeros(len(self.capacity), dtype=bool)
+        changed[links] = True
+        changed[0] = False
+        saturated = changed & (load >= self.capacity * (1 - RATE_TOLERANCE))
+        limiting = saturated[routes] & (flow_rates[:, None] >= fastest[routes] * (1 - RATE_TOLERANCE))
+        found = limiting.any(axis=1)
+        capped = flow_rates >= self.cap[flows] * (1 - RATE_TOLERANCE)
+        previous = self.bottleneck[flows]
+        unchanged = np.zeros(len(flows), dtype=bool)
+        unchanged[len(members):] = (previous[len(members):] != CAP_BOTTLENECK) & ~changed[previous[len(members):]]
+        self.bottleneck[flows] = np.where(found, routes[np.arange(len(flows)), np.argmax(limiting, axis=1)],
+                                          np.where(unchanged, previous, CAP_BOTTLENECK))
+        return flows[~(found | capped | unchanged)]
+
+    def max_min_rates(self, flows, fixed=None):
+        """
+        渐进填充的并行形式：每轮每条未定流的水位是其链路公平份额(剩余容量 / 未定流数)与自身上限的最小值，
+        水位不高于所有共享链路的流的水位的那些流立即定为该水位，然后扣除它们占用的容量进入下一轮。
+        定下的速率不超过所经链路的份额，因此其余链路的份额只增不减，结果与逐级填充相同，
+        但互不相关的瓶颈在同一轮里确定，轮数远少于瓶颈级数。
+        另外，一条链路上所有未定流的水位都等于该链路的份额时，这条链路就是它们共同的瓶颈，份额不会再变，
+        这些流也在本轮一起定下，链式的瓶颈因此不必逐级等待。
+        同一主机对之间的流经过相同的链路、速率相同，按主机对合并成带重数的一类一起计算。
+        fixed[链路] 是其他(速率保持不变的)流已占用的容量。
+        """
+        flow_links = self.route[flows]
+        pairs, members, weight = np.unique(flow_links[:, 0] * len(self.capacity) + flow_links[:, 1],
+                                           return_index=True, return_inverse=True, return_counts=True)[1:]
+        local, inverse = np.unique(flow_links[pairs], return_inverse=True)
+        inverse = inverse.reshape(len(pairs), LINKS_PER_FLOW)
+        remaining = self.capacity[local].copy()
+        if fixed is not None:
+            remaining = np.maximum(remaining - fixed[local], 0.0)
+        dummy = local == 0
+        pair_cap = self.cap[flows[pairs]]
+        rates = np.zeros(len(pairs))
+        pending = np.arange(len(pairs))
+        while len(pending):
+            links = inverse[pending]
+            counts = np.bincount(links.ravel(), weights=np.repeat(weight[pending], LINKS_PER_FLOW), minlength=len(local))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                link_share = np.where(counts > 0, remaining / counts, np.inf)
+            share = link_share[links]
+            level = np.minimum(np.minimum(share[:, 0], share[:, 1]), np.minimum(share[:, 2], pair_cap[pending]))
+            link_min = np.full(len(local), np.inf)
+            np.minimum.at(link_min, links.ravel(), np.repeat(level, LINKS_PER_FLOW))
+            link_min[dummy] = np.inf
+            bound = link_min[links]
+            full = (link_min >= link_share * (1 - 1e-12)) & ~dummy
+            settle = ((level <= np.minimum(np.minimum(bound[:, 0], bound[:, 1]), bound[:, 2]) * (1 + 1e-12))
+                      | full[links].any(axis=1))
+            rates[pending[settle]] = level[settle]
+            remaining -= np.bincount(links[settle].ravel(),
+                                     weights=np.repeat(level[settle] * weight[pending[settle]], LINKS_PER_FLOW),
+                                     minlength=len(local))
+            pending = pending[~settle]
+        return rates[members]
+
+    def links_between(self, source_rows, target_rows):
+        """
+        与 Topology.links 相同的接口，给出一条新流在当前负载下大致能得到的 (带宽 Mbps, 时延)：
+        静态带宽与两端网卡按 (现有流数 + 1) 平分后的份额取最小，用于放置估计；路径链路上的竞争不计入。
+        """
+        bandwidth, latency = self.topology.links(source_rows, target_rows)
+        source_rows = np.asarray(source_rows)
+        target_rows = np.asarray(target_rows)
+        outgoing = self.nic[source_rows] / (self.link_count[1 + source_rows] + 1)
+        incoming = self.nic[target_rows] / (self.link_count[1 + self.num_hosts + target_rows] + 1)
+        shared = np.minimum(outgoing, incoming) / MEGABIT
+        return np.where(source_rows == target_rows, bandwidth, np.minimum(bandwidth, shared)), latency
+
+    # 放置估计直接复用 Topology 的实现，链路带宽换成当前负载下的份额
+    links = links_between
+    transfer_times = Topology.transfer_times
+    grouped_transfer_times = Topology.grouped_transfer_times
+    fastest_transfer_times = Topology.fastest_transfer_times
+    estimate_times = Topology.estimate_times
+
+    def active_flows(self):
+        return int(np.count_nonzero(self.active[:self.size]))
+
+    def snapshot(self):
+        return ({name: getattr(self, name)[:self.size].copy() for name in self.FLOW_FIELDS},
+                self.size, list(self.free), self.link_count.copy(), self.epoch)
+
+    def restore(self, snapshot):
+        arrays, size, free, link_count, self.epoch = snapshot
+        for name in self.FLOW_FIELDS:
+            array = getattr(self, name)
+            array[size:self.size] = 0
+            array[:size] = arrays[name]
+        self.size = size
+        self.free = list(free)
+        self.dirty = set()
+        self.link_flows = [set() for _ in range(len(self.capacity))]
+        for f in np.flatnonzero(self.active[:size]).tolist():
+            for link in self.route[f].tolist():
+                if link:
+                    self.link_flows[link].add(f)
+        # 快照之后新建的路径链路保留，计数清零
+        self.link_count[:] = 0
+        self.link_count[:len(link_count)] = link_count
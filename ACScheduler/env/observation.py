@@ -0,0 +1,80 @@
+"""
+定长的数值历史和观测编码：RingBuffer 是预分配的 float32 环形缓冲区，ObservationEncoder 把节点资源/任务特征
+和各个历史拼成一个连续的 float32 观测向量。每步只写入新的一行并拷贝发生变化的历史窗口，不分配新数组。
+"""
+import numpy as np
+
+
+class RingBuffer:
+    """
+    最近 capacity 条记录，每条是 width 维的 float32 向量。
+    每条记录同时写在 storage[head] 和 storage[head + capacity] 两处，
+    因此 window() 总能以一个连续切片(不拷贝)按时间顺序给出最近 capacity 条记录，不足时前面补0。
+    """
+    def __init__(self, capacity, width):
+        self.capacity = capacity
+        self.width = width
+        self.storage = np.zeros((2 * capacity, width), dtype=np.float32)
+        self.head = 0  # 下一条记录写入的位置
+        self.count = 0
+        self.dirty = True  # 自上次 ObservationEncoder.encode() 以来是否有变化
+
+    def append(self, values):
+        if not self.capacity:
+            return
+        self.storage[self.head] = values
+        self.storage[self.head + self.capacity] = values
+        self.head = (self.head + 1) % self.capacity
+        self.count += 1
+        self.dirty = True
+
+    def window(self):
+        # (capacity, width)：从旧到新排列的视图，会随后续 append 变化
+        return self.storage[self.head:self.head + self.capacity]
+
+    def clear(self):
+        self.storage[:] = 0.0
+        self.head = 0
+        self.count = 0
+        self.dirty = True
+
+    def snapshot(self):
+        return self.storage.copy(), self.head, self.count
+
+    def restore(self, snapshot):
+        storage, self.head, self.count = snapshot
+        np.copyto(self.storage, storage)
+        self.dirty = True
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def __iter__(self):
+        # 按时间顺序遍历已写入的记录
+        window = self.window()
+        return iter(window[self.capacity - len(self):])
+
+
+class ObservationEncoder:
+    """
+    连续观测缓冲区：前 base_dim 维由环境直接写入(self.base)，后面依次是各个 RingBuffer 的窗口(按 histories 的顺序展开)。
+    encode() 只拷贝有变化的历史，返回的始终是同一个预分配数组。
+    """
+    def __init__(self, base_dim, histories):
+        self.histories = list(histories)
+        self.dim = base_dim + sum(ring.capacity * ring.width for ring in self.histories)
+        self.observation = np.zeros(self.dim, dtype=np.float32)
+        self.base = self.observation[:base_dim]
+        self._sections = []
+        offset = base_dim
+        for ring in self.histories:
+            size = ring.capacity * ring.width
+            self._sections.append((ring, self.observation[offset:offset + size].reshape(ring.capacity, ring.width)))
+            offset += size
+
+    def encode(self):
+        for ring, section in self._sections:
+            if ring.dirty:
+                np.copyto(section, ring.window())
+                ring.dirty = False
+        return self.observation
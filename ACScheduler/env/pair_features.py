@@ -0,0 +1,131 @@
+"""
+与节点数无关的策略输入：把 CloudEdgeEnv 的当前状态编码成几组矩阵，供逐一为 (就绪任务, 节点) 对打分的策略使用
+(ACScheduler.PairScoringActor、inference.PairPolicyEngine)。
+- 节点特征 (节点数, PAIR_NODE_FEATURES)：剩余 cpu/ram/storage(取对数)、利用率、是否云节点、是否 master
+- 任务特征 (就绪任务数, PAIR_TASK_FEATURES)：运行时间、输入数据量(MB)、子任务数、cpu/ram/storage 需求和 bottom level(均取对数)
+- 任务-节点特征 (就绪任务数, 节点数, PAIR_FEATURES)：完成时间估计(取对数)，以及它相对于该任务最快可行节点的倍数
+- 可行掩码 (就绪任务数, 节点数)：容器放得下且节点可达
+各特征的维数与节点数、任务数无关，同一组权重可以直接用于更大的集群；schedule_pairs 用一次前向计算同时放置多个就绪任务。
+"""
+import numpy as np
+
+from env.platform import Master
+
+PAIR_NODE_FEATURES = 8
+PAIR_TASK_FEATURES = 7
+PAIR_FEATURES = 2
+
+# 相对完成时间的上限，避免极慢的节点主导特征的取值范围
+MAX_RELATIVE_ESTIMATE = 10.0
+
+
+class PairObservation:
+    """
+    tasks 是就绪任务的下标(按就绪先后)，其余数组的行与之对应；节点按 env.node_list 的顺序。
+    """
+    __slots__ = ('tasks', 'task_features', 'node_features', 'pair_features', 'masks')
+
+    def __init__(self, tasks, task_features, node_features, pair_features, masks):
+        self.tasks = tasks
+        self.task_features = task_features
+        self.node_features = node_features
+        self.pair_features = pair_features
+        self.masks = masks
+
+    def __len__(self):
+        return len(self.tasks)
+
+
+class PairFeatures:
+    """
+    env 的 (就绪任务, 节点) 特征编码器。只与工作流和节点有关的特征在构建时算好，observe() 只计算随仿真变化的部分。
+    """
+    def __init__(self, env):
+        self.env = env
+        table = env.task_table
+        cloud = {id(master) for master in env.cloud_masters}
+        cloud.update(id(worker) for master in env.cloud_masters for worker in master.workers)
+        self.node_static = np.array([[id(node) in cloud, isinstance(node, Master)] for node in env.node_list],
+                                    dtype=np.float32).reshape(-1, 2)
+        self.task_static = np.log1p(np.column_stack([
+            table.runtime, env.input_bytes / 1e6, env.child_count, env.task_demand, env.path_tracker.bottom,
+        ])).astype(np.float32)
+
+    def ready_tasks(self, max_tasks=None):
+        # 就绪任务的下标，按就绪先后排序；max_tasks 只取最早就绪的若干个
+        state = self.env.task_state
+        ready = np.flatnonzero(state.ready)
+        ready = ready[np.argsort(state.ready_seq[ready], kind='stable')]
+        return ready if max_tasks is None else ready[:max_tasks]
+
+    def node_features(self):
+        observation = self.env.get_resource_state()
+        free, utilization = observation[:, :3], observation[:, 3:]
+        return np.column_stack([np.log1p(np.maximum(free, 0.0)), utilization, self.node_static]).astype(np.float32)
+
+    def observe(self, max_tasks=None):
+        env = self.env
+        tasks = self.ready_tasks(max_tasks)
+        estimates = np.empty((len(tasks), env.action_dim))
+        for row, i in enumerate(tasks):
+            estimates[row] = env.estimate_placements(env.task_list[i])
+        masks = env.action_masks(tasks) & np.isfinite(estimates)
+        reachable = np.isfinite(estimates)
+        finite = np.where(reachable, estimates, 0.0)
+        # 相对于该任务最快的可达节点；不可达的节点已被掩码，取上限
+        best = np.where(reachable, estimates, np.inf).min(axis=1, initial=np.inf, keepdims=True)
+        relative = np.full_like(finite, MAX_RELATIVE_ESTIMATE)
+        np.divide(finite, best, out=relative, where=reachable & (best > 0))
+        pair_features = np.stack([np.log1p(finite), np.minimum(relative, MAX_RELATIVE_ESTIMATE)], axis=-1).astype(np.float32)
+        return PairObservation(tasks, self.task_static[tasks], self.node_features(), pair_features, masks)
+
+    def actions(self, tasks, nodes):
+        # 任务下标和节点下标 -> CloudEdgeEnv.step 使用的 (任务, 容器, 节点) 动作
+        env = self.env
+        return [(env.task_list[i], env.make_docker(env.task_list[i]), env.node_list[n]) for i, n in zip(tasks, nodes)]
+
+
+def assign_pairs(logits, masks, demand, free, rows):
+    """
+    按 logits 贪心地为就绪任务选节点，一次放置尽可能多的任务：最好的可行 logit 越大的任务越先分配，
+    每个任务取当前仍放得下的节点中 logit 最大的一个，并从所在主机的剩余资源中扣除其需求。
+    demand 为 (任务数, 3)，free 为主机的剩余资源，rows 为节点到主机行号的映射(ClusterState.rows)。
+    返回 (任务的行号, 节点下标)，放不下的任务不出现在结果中。
+    """
+    free = np.array(free, dtype=np.float64)
+    fits = np.array(masks, dtype=bool)
+    scores = np.where(fits, logits, -np.inf)
+    order = np.argsort(-scores.max(axis=1), kind='stable') if len(scores) else np.zeros(0, dtype=np.intp)
+    tasks, nodes = [], []
+    for t in order:
+        n = int(np.argmax(np.where(fits[t], logits[t], -np.inf)))
+        if not fits[t, n]:
+            continue
+        tasks.append(t)
+        nodes.append(n)
+        host = rows[n]
+        free[host] -= demand[t]
+        fits[:, rows == host] &= np.all(free[host] >= demand, axis=1)[:, None]
+    return np.array(tasks, dtype=np.intp), np.array(nodes, dtype=np.intp)
+
+
+def schedule_pairs(env, policy, features=None, max_tasks=None):
+    """
+    用 (任务, 节点) 打分策略从头调度整个工作流：每一步对所有就绪任务做一次前向计算(policy.pair_logits)，
+    按 assign_pairs 一次放置多个任务；没有任务放得下时由环境推进到下一个事件。返回 (makespan, 步数)。
+    """
+    features = features if features is not None else PairFeatures(env)
+    env.reset()
+    done = False
+    steps = 0
+    while not done:
+        observation = features.observe(max_tasks)
+        actions = []
+        if len(observation):
+            logits = policy.pair_logits(observation)
+            rows, nodes = assign_pairs(logits, observation.masks, env.task_demand[observation.tasks],
+                                       env.cluster_state.free, env.cluster_state.rows)
+            actions = features.actions(observation.tasks[rows], nodes)
+        _, _, done = env.step(actions)
+        steps += 1
+    return env.get_makespan(), steps
@@ -1,13 +1,47 @@
+from env.cluster_state import ClusterState, CPU, RAM, STORAGE
+
+
 class Host:
+    # cpu/ram/storage 及其总量保存在 ClusterState 的数组中，Host 只是其中一行的视图
+    __slots__ = ('host_id', 'bandwidth', '_state', '_row')
+
     def __init__(self, host_id, cpu, ram, storage):
         self.host_id = host_id
-        self.cpu = cpu
-        self.ram = ram
-        self.storage = storage
-        self.total_cpu = cpu
-        self.total_ram = ram
-        self.total_storage = storage
         self.bandwidth = {} # 字典用于存储与其他主机的带宽连接信息
+        self.bind(ClusterState.single(cpu, ram, storage), 0)
+    def bind(self, state, row):
+        # 加入集群时切换到集群共享的数组
+        self._state = state
+        self._row = row
+
+    @property
+    def cpu(self):
+        return float(self._state.free[self._row, CPU])
+    @cpu.setter
+    def cpu(self, value):
+        self._state.free[self._row, CPU] = value
+    @property
+    def ram(self):
+        return float(self._state.free[self._row, RAM])
+    @ram.setter
+    def ram(self, value):
+        self._state.free[self._row, RAM] = value
+    @property
+    def storage(self):
+        return float(self._state.free[self._row, STORAGE])
+    @storage.setter
+    def storage(self, value):
+        self._state.free[self._row, STORAGE] = value
+    @property
+    def total_cpu(self):
+        return float(self._state.total[self._row, CPU])
+    @property
+    def total_ram(self):
+        return float(self._state.total[self._row, RAM])
+    @property
+    def total_storage(self):
+        return float(self._state.total[self._row, STORAGE])
+
     def add_bandwidth(self, target_host_id, bandwidth):
         self.bandwidth[target_host_id] = bandwidth
     def get_bandwidth(self, target_host_id):
@@ -83,7 +117,7 @@ class Node:
 
 class Master(Node):
     def __init__(self,node_id,host):
-        super.__init__(node_id,host)
+        super().__init__(node_id,host)
         self.type = 'master'
         self.workers = []  # Workers managed by this master
     def add_worker(self, worker):
@@ -0,0 +1,142 @@
+"""
+副本注册表：记录每台主机上保存了哪些文件。任务运行时读取的输入和产生的输出都留在所在主机上，
+之后的任务从传输最快(带宽最高)的副本拉取，而不是总从生产者或终端重新传输，
+例如 Montage 中每个 mProjectPP 都读取的 region.hdr 只需传到每台主机一次。
+
+副本保存在每台主机单独的缓存空间中，容量固定(缺省等于主机的总存储 Host.total_storage)，与容器占用的存储(ClusterState.free)分开计算：
+副本不占用容器可用的存储，容器也不挤占缓存。每台主机的副本总量超出缓存容量时按最近最少使用(LRU)淘汰；
+仍有未开始的读取者、且只剩这一份的文件不会被淘汰(外部输入在终端上始终可用，不受此限制)。
+任务的输出必须保存，放不下时允许超出并计入 overflow_bytes；拉取来的副本放不下时只是不缓存。
+"""
+from collections import OrderedDict
+
+import numpy as np
+
+from env.topology import BITS_PER_BYTE, MEGABIT
+
+GIGABYTE = 1e9
+
+
+def replica_times(estimator, source_rows, sizes, target_row):
+    # (文件数, 源数)：每个文件从每个源传到 target_row 主机的时间，不可达为 inf；对所有候选主机的估计见 fastest_transfer_times
+    bandwidth, latency = estimator.links(np.asarray(source_rows), target_row)
+    bits = np.asarray(sizes, dtype=np.float64)[:, None] * (BITS_PER_BYTE / MEGABIT)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(bandwidth[None] > 0, bits / bandwidth[None] + latency[None], np.inf)
+
+
+class ReplicaRegistry:
+    """
+    file_size[f] 是文件 f 的字节数，external[f] 表示外部输入(终端上始终有一份)，reads[f] 是读取 f 的输入总数；
+    capacity 是每台主机(ClusterState 的行号)副本缓存的字节数，标量表示所有主机相同。holders[f] 是保存 f 的副本的主机集合，
+    内存与副本数成正比，与主机数无关。
+    """
+    def __init__(self, file_size, external, reads, num_hosts, capacity):
+        self.file_size = np.asarray(file_size, dtype=np.float64)
+        self.external = np.asarray(external, dtype=bool)
+        self.reads = np.asarray(reads, dtype=np.int32)
+        self.capacity = np.broadcast_to(np.asarray(capacity, dtype=np.float64), (num_hosts,)).copy()
+        self.holders = [set() for _ in range(len(self.file_size))]
+        self.stored = np.zeros(num_hosts, dtype=np.int32)  # 每台主机上的副本数
+        self.copies = np.zeros(len(self.file_size), dtype=np.int32)  # 每个文件在各主机上的副本数
+        self.version = np.zeros(len(self.file_size), dtype=np.int64)  # 每个文件的副本集合变化的次数，供缓存估计的调用方判断是否过期
+        self.pending_reads = self.reads.copy()  # 尚未开始的读取数
+        self.used = np.zeros(num_hosts)
+        self.lru = [OrderedDict() for _ in range(num_hosts)]  # 文件 -> None，按最近使用从旧到新
+        self.hits = 0  # 输入已在目标主机上、不需要传输的次数
+        self.evictions = 0
+        self.overflow_bytes = 0.0
+
+    def holder_matrix(self, files):
+        """
+        files 的副本分布：返回 (有其中任一文件副本的主机，升序, (文件数, 主机数) 的掩码)。
+        """
+        holders = [self.holders[f] for f in files.tolist()]
+        hosts = sorted(set().union(*holders))
+        column = {n: c for c, n in enumerate(hosts)}
+        held = np.zeros((len(holders), len(hosts)), dtype=bool)
+        for row, owners in enumerate(holders):
+            for n in owners:
+                held[row, column[n]] = True
+        return np.array(hosts, dtype=np.int64), held
+
+    def evictable(self, f):
+        return self.external[f] or self.pending_reads[f] == 0 or self.copies[f] > 1
+
+    def make_room(self, n, size, protected):
+        # 按 LRU 顺序淘汰可淘汰的副本，直到放得下 size 字节；返回是否放得下
+        budget = self.capacity[n]
+        if self.used[n] + size <= budget:
+            return True
+        for f in [f for f in self.lru[n] if f not in protected and self.evictable(f)]:
+            self.remove(n, f)
+            self.evictions += 1
+            if self.used[n] + size <= budget:
+                return True
+        return False
+
+    def add(self, n, f, required=False, protected=()):
+        if n in self.holders[f]:
+            self.lru[n].move_to_end(f)
+            return
+        size = self.file_size[f]
+        if not self.make_room(n, size, protected):
+            if not required:
+                return
+            self.overflow_bytes += size
+        self.holders[f].add(n)
+        self.version[f] += 1
+        self.stored[n] += 1
+        self.copies[f] += 1
+        self.used[n] += size
+        self.lru[n][f] = None
+
+    def remove(self, n, f):
+        del self.lru[n][f]
+        self.holders[f].discard(n)
+        self.version[f] += 1
+        self.stored[n] -= 1
+        self.copies[f] -= 1
+        self.used[n] -= self.file_size[f]
+
+    def store_outputs(self, n, files):
+        # 任务在主机 n 上完成，输出写入本地
+        protected = set(files)
+        for f in files:
+            self.add(n, f, required=True, protected=protected)
+
+    def fetch_inputs(self, n, files):
+        # 任务在主机 n 上开始：读取计数减一，拉取来的输入缓存在本地
+        np.subtract.at(self.pending_reads, files, 1)
+        files = files.tolist()
+        protected = set(files)
+        for f in files:
+            self.add(n, f, protected=protected)
+
+    def snapshot(self):
+        # 只保存有副本的主机的 LRU 顺序，holders 由它重建；开销与副本数有关，与主机总数无关
+        hosts = np.flatnonzero(self.stored).tolist()
+        return (self.stored.copy(), self.copies.copy(), self.pending_reads.copy(), self.used.copy(),
+                {n: list(self.lru[n]) for n in hosts}, (self.hits, self.evictions, self.overflow_bytes))
+
+    def restore(self, snapshot):
+        stored, copies, pending_reads, used, lru, counters = snapshot
+        for n in np.flatnonzero(self.stored).tolist():
+            for f in self.lru[n]:
+                self.holders[f].discard(n)
+            self.lru[n] = OrderedDict()
+        for n, order in lru.items():
+            self.lru[n] = OrderedDict.fromkeys(order)
+            for f in order:
+                self.holders[f].add(n)
+        # 副本集合整体改变，所有文件的版本都前进
+        self.version += 1
+        self.stored[:] = stored
+        self.copies[:] = copies
+        self.pending_reads[:] = pending_reads
+        self.used[:] = used
+        self.hits, self.evictions, self.overflow_bytes = counters
+
+    def stats(self):
+        return {'replicas': int(self.copies.sum()), 'stored_bytes': float(self.used.sum()), 'hits': self.hits,
+                'evictions': self.evictions, 'overflow_bytes': float(self.overflow_bytes)}
@@ -0,0 +1,121 @@
+from collections.abc import Mapping
+import numpy as np
+
+# 输入文件位置的编码：>=0 为 node_list 中的节点下标
+LOCATION_UNKNOWN = -1
+LOCATION_TERMINAL = -2
+
+
+class TaskState:
+    """
+    环境中随仿真变化的任务状态和文件位置，全部存放在按任务下标/输入文件下标索引的定长数组中，
+    因此整个状态可以用几次数组拷贝保存和恢复。
+    """
+    # (字段名, 类型, 初始值)：按任务下标索引
+    TASK_FIELDS = (
+        ('completed', np.bool_, False),
+        ('pending', np.bool_, True),  # 尚未开始
+        ('ready', np.bool_, False),  # 在就绪队列中
+        ('ready_seq', np.int64, -1),  # 进入就绪队列的先后顺序
+        ('unfinished_parents', np.int32, 0),
+        ('missing_inputs', np.int32, 0),
+        ('assigned', np.int32, -1),  # 分配到的节点下标
+        ('start', np.float64, np.nan),
+        ('end', np.float64, np.nan),
+        ('estimated', np.float64, np.nan),  # 预计完成时间
+        ('pending_flows', np.int32, 0),  # 流级网络模型中尚未完成的输入/输出流数
+    )
+    # 按输入文件下标(所有任务的输入按任务顺序拼接)索引
+    INPUT_FIELDS = (
+        ('arrived', np.bool_, False),  # 文件已在源位置可用
+        ('source', np.int32, LOCATION_UNKNOWN),
+    )
+
+    def __init__(self, num_tasks, num_inputs):
+        for name, dtype, initial in self.TASK_FIELDS:
+            setattr(self, name, np.full(num_tasks, initial, dtype=dtype))
+        for name, dtype, initial in self.INPUT_FIELDS:
+            setattr(self, name, np.full(num_inputs, initial, dtype=dtype))
+        self.field_names = tuple(name for name, _, _ in self.TASK_FIELDS + self.INPUT_FIELDS)
+
+    def copy_arrays(self):
+        return {name: getattr(self, name).copy() for name in self.field_names}
+
+    def load_arrays(self, arrays):
+        for name in self.field_names:
+            np.copyto(getattr(self, name), arrays[name])
+
+
+class TaskSet:
+    """
+    以布尔数组表示的任务集合，对外表现得像任务ID的集合(in / len / 遍历 / add / remove)。
+    数组本身属于 TaskState，恢复快照后调用 refresh() 重新计数即可。
+    """
+    def __init__(self, flags, task_ids, task_index):
+        self.flags = flags
+        self.task_ids = task_ids
+        self.task_index = task_index
+        self.refresh()
+
+    def refresh(self):
+        self._count = int(np.count_nonzero(self.flags))
+
+    def __contains__(self, task_id):
+        i = self.task_index.get(task_id)
+        return i is not None and bool(self.flags[i])
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        return (self.task_ids[i] for i in np.flatnonzero(self.flags))
+
+    def add(self, task_id):
+        i = self.task_index[task_id]
+        if not self.flags[i]:
+            self.flags[i] = True
+            self._count += 1
+
+    def remove(self, task_id):
+        i = self.task_index[task_id]
+        if not self.flags[i]:
+            raise KeyError(task_id)
+        self.flags[i] = False
+        self._count -= 1
+
+
+class TaskRecordView(Mapping):
+    """
+    只读的 任务ID -> 记录字典 映射，按需从 TaskState 数组生成单个任务的记录，
+    用于保持 state['task_status'] / state['task_times'] 原有的访问方式。
+    """
+    def __init__(self, tasks, task_index, make_record):
+        self.tasks = tasks
+        self.task_index = task_index
+        self.make_record = make_record
+
+    def __getitem__(self, task_id):
+        return self.make_record(self.tasks[task_id], self.task_index[task_id])
+
+    def __iter__(self):
+        return iter(self.tasks)
+
+    def __len__(self):
+        return len(self.tasks)
+
+
+def optional_time(value):
+    return None if np.isnan(value) else float(value)
+
+
+class EnvSnapshot:
+    """
+    CloudEdgeEnv 在某一时刻的完整状态：集群剩余资源、任务状态数组、时钟、事件队列、
+    运行中的容器、历史记录、makespan 下界跟踪以及(启用时)流级网络模型和副本注册表的状态。由 CloudEdgeEnv.snapshot() 生成，CloudEdgeEnv.restore() 恢复。
+    """
+    __slots__ = ('free', 'arrays', 'clock', 'network_bytes', 'event_count', 'ready_counter',
+                 'events', 'running', 'containers', 'histories', 'network', 'replicas', 'bound')
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields[name])
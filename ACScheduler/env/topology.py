@@ -0,0 +1,269 @@
+import numpy as np
+
+# 文件大小以字节计，带宽以 Mbps 计，时间以秒计
+BITS_PER_BYTE = 8
+MEGABIT = 1e6
+
+
+def widest_paths(bandwidth, latency):
+    # 最宽路径的 Floyd-Warshall(原地修改)：每轮对所有行对做一次向量化比较，O(n^3) 但没有Python内层循环
+    for k in range(len(bandwidth)):
+        candidate = np.minimum(bandwidth[:, k, None], bandwidth[None, k, :])
+        better = candidate > bandwidth
+        if better.any():
+            latency[better] = (latency[:, k, None] + latency[None, k, :])[better]
+            bandwidth[better] = candidate[better]
+
+
+class Topology:
+    """
+    网络拓扑：主机 x 主机 的带宽矩阵(Mbps)和时延矩阵(秒)。
+    对角线带宽为 inf(同一主机上的文件不需要传输)，带宽为0表示两台主机之间不可达。
+    """
+    def __init__(self, host_ids):
+        self.host_ids = list(host_ids)
+        self.index = {host_id: i for i, host_id in enumerate(self.host_ids)}
+        n = len(self.host_ids)
+        self.bandwidth = np.zeros((n, n), dtype=np.float64)
+        self.latency = np.zeros((n, n), dtype=np.float64)
+        np.fill_diagonal(self.bandwidth, np.inf)
+
+    @classmethod
+    def from_hosts(cls, hosts, aliases=None, relay=True):
+        """
+        由各 Host 的 bandwidth 字典构建拓扑。字典中引用到但不在 hosts 里的主机ID(例如终端设备)会作为额外的行加入；
+        只定义了单向的链路按对称处理。relay=True 时用最宽路径(瓶颈带宽最大的中转路径)补全没有直连的主机对。
+        """
+        host_ids = [host.host_id for host in hosts]
+        known = set(host_ids)
+        for host in hosts:
+            for target_id in host.bandwidth:
+                if target_id not in known:
+                    known.add(target_id)
+                    host_ids.append(target_id)
+        topology = cls(host_ids)
+        for host in hosts:
+            for target_id, bandwidth in host.bandwidth.items():
+                topology.set_link(host.host_id, target_id, bandwidth, symmetric=False)
+        # 只有一个方向有定义的链路，反方向使用相同的带宽
+        missing = topology.bandwidth == 0
+        topology.bandwidth[missing] = topology.bandwidth.T[missing]
+        if relay:
+            topology.fill_relay_paths()
+        for alias, host_id in (aliases or {}).items():
+            topology.add_alias(alias, host_id)
+        return topology
+
+    def add_alias(self, alias, host_id):
+        # 例如把文件位置中使用的 "terminal" 映射到某台终端主机
+        self.index[alias] = self.index[host_id]
+
+    def set_link(self, source_id, target_id, bandwidth, latency=0.0, symmetric=True):
+        i, j = self.index[source_id], self.index[target_id]
+        self.bandwidth[i, j] = bandwidth
+        self.latency[i, j] = latency
+        if symmetric:
+            self.bandwidth[j, i] = bandwidth
+            self.latency[j, i] = latency
+
+    def fill_relay_paths(self):
+        widest_paths(self.bandwidth, self.latency)
+
+    def rows(self, host_ids):
+        return np.fromiter((self.index[host_id] for host_id in host_ids), dtype=np.intp, count=len(host_ids))
+
+    def get_bandwidth(self, source_id, target_id):
+        return self.link(self.index[source_id], self.index[target_id])[0]
+
+    def transfer_time(self, source_id, target_id, size):
+        return self.row_transfer_time(self.index[source_id], self.index[target_id], size)
+
+    def link(self, i, j):
+        # 行号 i -> j 的 (带宽, 时延)
+        return self.bandwidth[i, j], self.latency[i, j]
+
+    def links(self, source_rows, target_rows):
+        # 按广播规则取一组行号对的 (带宽, 时延) 数组
+        return self.bandwidth[source_rows, target_rows], self.latency[source_rows, target_rows]
+
+    def nic_bandwidths(self):
+        # 每台主机的网卡带宽(Mbps)，取该主机所有链路中最大的有限带宽；供 FlowNetwork 作为出口/入口链路的容量
+        bandwidth = np.where(np.isfinite(self.bandwidth), self.bandwidth, 0.0)
+        return np.maximum(bandwidth.max(axis=1), bandwidth.max(axis=0))
+
+    def path_key(self, i, j):
+        # 流经过的共享路径链路：主机级拓扑中每个有序主机对是一条链路
+        return ('pair', i, j)
+
+    def row_transfer_time(self, i, j, size):
+        # 按矩阵行号计算单个文件的传输时间，供已经把位置换算成行号的调用方使用
+        if i == j:
+            return 0.0
+        bandwidth, latency = self.link(i, j)
+        if bandwidth <= 0:
+            raise ValueError(f"No network path between {self.host_ids[i]} and {self.host_ids[j]}.")
+        return size * BITS_PER_BYTE / (bandwidth * MEGABIT) + latency
+
+    def transfer_times(self, source_rows, sizes, candidate_rows):
+        """
+        一次计算把一组文件(source_rows[k] 上大小为 sizes[k] 的文件)传到每个候选主机所需的总时间，
+        返回长度为候选数的数组；不可达的候选为 inf。
+        """
+        if len(source_rows) == 0:
+            return np.zeros(len(candidate_rows), dtype=np.float64)
+        bandwidth, latency = self.links(np.asarray(source_rows)[:, None], candidate_rows[None, :])
+        bits = np.asarray(sizes, dtype=np.float64)[:, None] * (BITS_PER_BYTE / MEGABIT)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            times = np.where(bandwidth > 0, bits / bandwidth + latency, np.inf)
+        return times.sum(axis=0)
+
+    def grouped_transfer_times(self, source_rows, sizes, groups, num_groups, candidate_rows):
+        """
+        transfer_times 的分组形式：第 k 个文件属于第 groups[k] 组，返回 (组数, 候选数)，
+        每行是该组文件传到各候选主机的总时间，与对该组单独调用 transfer_times 的结果相同。
+        """
+        total = np.zeros((num_groups, len(candidate_rows)), dtype=np.float64)
+        if len(source_rows) == 0:
+            return total
+        bandwidth, latency = self.links(np.asarray(source_rows)[:, None], candidate_rows[None, :])
+        bits = np.asarray(sizes, dtype=np.float64)[:, None] * (BITS_PER_BYTE / MEGABIT)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            times = np.where(bandwidth > 0, bits / bandwidth + latency, np.inf)
+        np.add.at(total, groups, times)
+        return total
+
+    def fastest_transfer_times(self, source_rows, available, sizes, candidate_rows):
+        """
+        与 transfer_times 类似，但每个文件可以从多个源中的任一个拉取(available[k, s] 表示文件 k 在 source_rows[s] 上有一份)，
+        按最快的可用源计算，返回长度为候选数的总时间；有文件没有可达的源时为 inf。
+        只对可用的 (文件, 源) 对调用一次 links，按文件分段取最小后求和，不展开 文件 x 源 x 候选 的三维数组。
+        """
+        sizes = np.asarray(sizes, dtype=np.float64)
+        if not len(sizes):
+            return np.zeros(len(candidate_rows))
+        available = np.asarray(available, dtype=bool)
+        if not available.any(axis=1).all():
+            return np.full(len(candidate_rows), np.inf)
+        files, sources = np.nonzero(available)
+        bandwidth, latency = self.links(np.asarray(source_rows)[sources][:, None], candidate_rows[None, :])
+        bits = (sizes * (BITS_PER_BYTE / MEGABIT))[files, None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            times = np.where(bandwidth > 0, bits / bandwidth + latency, np.inf)
+        # np.nonzero 的结果按文件排序，每个文件至少有一个源
+        starts = np.flatnonzero(np.r_[True, files[1:] != files[:-1]])
+        return np.minimum.reduceat(times, starts, axis=0).sum(axis=0)
+
+    def estimate_times(self, input_rows, input_sizes, runtime, output_rows, output_sizes, candidate_rows):
+        # 输入传输 + 执行 + 输出传输 的预计总时间，对所有候选主机一次算出
+        inputs = self.transfer_times(input_rows, input_sizes, candidate_rows)
+        if len(output_rows):
+            bandwidth, latency = self.links(candidate_rows[:, None], np.asarray(output_rows)[None, :])
+            bits = np.asarray(output_sizes, dtype=np.float64)[None, :] * (BITS_PER_BYTE / MEGABIT)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                outputs = np.where(bandwidth > 0, bits / bandwidth + latency, np.inf).sum(axis=1)
+        else:
+            outputs = 0.0
+        return inputs + runtime + outputs
+
+    def __contains__(self, host_id):
+        return host_id in self.index
+
+    def __len__(self):
+        return len(self.host_ids)
+
+
+class ClusteredTopology(Topology):
+    """
+    分层拓扑：每台主机属于一个集群，带宽和时延只按 集群 x 集群 存储，
+    对角线是集群内不同主机之间的链路。内存为 O(主机数 + 集群数^2)，适合上万台主机的边缘部署。
+    接口与 Topology 相同(link/links/transfer_times/estimate_times 等)，但没有主机级的 bandwidth/latency 矩阵。
+    """
+    def __init__(self, host_ids, host_cluster, cluster_bandwidth, cluster_latency=None, cluster_names=None, relay=True):
+        self.host_ids = list(host_ids)
+        self.index = {host_id: i for i, host_id in enumerate(self.host_ids)}
+        self.host_cluster = np.asarray(host_cluster, dtype=np.int32)
+        self.cluster_bandwidth = np.array(cluster_bandwidth, dtype=np.float64)
+        self.cluster_latency = (np.zeros_like(self.cluster_bandwidth) if cluster_latency is None
+                                else np.array(cluster_latency, dtype=np.float64))
+        self.cluster_names = list(cluster_names) if cluster_names is not None else list(range(len(self.cluster_bandwidth)))
+        if len(self.host_cluster) != len(self.host_ids):
+            raise ValueError("host_cluster must have one entry per host.")
+        if relay:
+            widest_paths(self.cluster_bandwidth, self.cluster_latency)
+
+    def set_link(self, source_id, target_id, bandwidth, latency=0.0, symmetric=True):
+        raise TypeError("ClusteredTopology stores links per cluster pair; use set_cluster_link().")
+
+    def set_cluster_link(self, a, b, bandwidth, latency=0.0, symmetric=True):
+        # 修改后不会重新计算中转路径
+        self.cluster_bandwidth[a, b] = bandwidth
+        self.cluster_latency[a, b] = latency
+        if symmetric:
+            self.cluster_bandwidth[b, a] = bandwidth
+            self.cluster_latency[b, a] = latency
+
+    def link(self, i, j):
+        if i == j:
+            return np.inf, 0.0
+        a, b = self.host_cluster[i], self.host_cluster[j]
+        return self.cluster_bandwidth[a, b], self.cluster_latency[a, b]
+
+    def links(self, source_rows, target_rows):
+        a, b = self.host_cluster[source_rows], self.host_cluster[target_rows]
+        same = np.asarray(source_rows) == np.asarray(target_rows)
+        return (np.where(same, np.inf, self.cluster_bandwidth[a, b]),
+                np.where(same, 0.0, self.cluster_latency[a, b]))
+
+    def fastest_transfer_times(self, source_rows, available, sizes, candidate_rows):
+        # 同一集群的源传到其他主机的带宽和时延相同：每个文件只对持有它的集群算出到各集群的最短时间，
+        # 按集群求和后展开到候选主机；源就在候选主机上时该文件不需要传输，这些候选单独计算
+        if not len(sizes):
+            return np.zeros(len(candidate_rows))
+        if not np.asarray(available).any(axis=1).all():
+            return np.full(len(candidate_rows), np.inf)
+        files, sources = np.nonzero(available)
+        source_rows = np.asarray(source_rows)[sources]
+        clusters = self.host_cluster[source_rows]
+        first = np.unique(files * len(self.cluster_bandwidth) + clusters, return_index=True)[1]
+        pair_files, pair_clusters = files[first], clusters[first]
+        bits = (np.asarray(sizes, dtype=np.float64) * (BITS_PER_BYTE / MEGABIT))[pair_files, None]
+        bandwidth = self.cluster_bandwidth[pair_clusters]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pair_times = np.where(bandwidth > 0, bits / bandwidth + self.cluster_latency[pair_clusters], np.inf)
+        # 按文件分段取最小(np.unique 的结果按文件排序)
+        starts = np.flatnonzero(np.r_[True, pair_files[1:] != pair_files[:-1]])
+        best = np.minimum.reduceat(pair_times, starts, axis=0)
+        candidate_clusters = self.host_cluster[candidate_rows]
+        total = best.sum(axis=0)[candidate_clusters]
+        holds = np.zeros(len(self.host_cluster), dtype=bool)
+        holds[source_rows] = True
+        local = np.flatnonzero(holds[candidate_rows])
+        if len(local):
+            times = best[:, candidate_clusters[local]]
+            pair, column = np.nonzero(source_rows[:, None] == candidate_rows[local][None, :])
+            times[files[pair], column] = 0.0
+            total[local] = times.sum(axis=0)
+        return total
+
+    def nic_bandwidths(self):
+        bandwidth = np.where(np.isfinite(self.cluster_bandwidth), self.cluster_bandwidth, 0.0)
+        per_cluster = np.maximum(bandwidth.max(axis=1), bandwidth.max(axis=0))
+        return per_cluster[self.host_cluster]
+
+    def path_key(self, i, j):
+        # 同一集群内只受两端网卡限制；不同集群之间的流共享该有序集群对的链路
+        a, b = int(self.host_cluster[i]), int(self.host_cluster[j])
+        return None if a == b else ('cluster', a, b)
+
+    def to_dense(self):
+        # 展开成主机级的 Topology，只适合小规模拓扑(测试、与 from_hosts 的结果对比)
+        topology = Topology(self.host_ids)
+        rows = np.arange(len(self.host_ids))
+        topology.bandwidth[:], topology.latency[:] = self.links(rows[:, None], rows[None, :])
+        for alias, row in self.index.items():
+            if alias not in topology.index:
+                topology.index[alias] = row
+        return topology
+
+    def nbytes(self):
+        return self.host_cluster.nbytes + self.cluster_bandwidth.nbytes + self.cluster_latency.nbytes
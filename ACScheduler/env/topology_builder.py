@@ -0,0 +1,185 @@
+"""
+按规格参数化生成云-边-端平台：云中心一个集群，若干个边缘集群，终端设备一个集群。
+带宽/时延按层级(云内、边缘集群内、边缘集群间、边缘-云、边缘-终端)给出，只在 集群 x 集群 上存储(ClusteredTopology)，
+主机、节点和拓扑都在第一次访问时才构建，导入模块没有任何开销。
+
+    spec = TopologySpec(edge_clusters=1000, hosts_per_edge_cluster=10)
+    platform = build_platform(spec)
+    env = CloudEdgeEnv(platform.cloud_masters, platform.edge_masters, tasks, dependencies, 0, topology=platform.topology)
+"""
+from functools import cached_property
+
+import numpy as np
+
+from env.platform import Host, Master, Worker
+from env.topology import ClusteredTopology, widest_paths
+
+# 各层带宽(Mbps)；0 表示没有直连，由最宽中转路径补全(例如云中心与终端设备经由边缘集群中转)
+DEFAULT_BANDWIDTH = {
+    'cloud': 2000,          # 云中心内部
+    'edge_intra': 500,      # 边缘集群内部
+    'edge_inter': 200,      # 边缘集群之间
+    'edge_cloud': 1000,     # 边缘集群与云中心之间
+    'edge_terminal': 100,   # 边缘集群与终端设备之间
+    'cloud_terminal': 0,    # 云中心与终端设备之间
+    'terminal': 0,          # 终端设备之间
+}
+
+CLOUD, EDGE, TERMINAL = 0, 1, 2
+
+
+class TopologySpec:
+    """
+    平台规格。容量为 (cpu, ram, storage)；latency 与 bandwidth 使用相同的键(秒)，缺省为0。
+    云中心第0台主机运行master节点，第 1..cloud_workers 台运行worker；每个边缘集群第0台主机运行master，其余运行worker。
+    """
+    def __init__(self, cloud_hosts=12, cloud_workers=9, edge_clusters=4, hosts_per_edge_cluster=5, terminals=4,
+                 bandwidth=None, latency=None,
+                 cloud_capacity=(32, 128, 1024), edge_capacity=(16, 64, 512), terminal_capacity=(4, 16, 128)):
+        if cloud_hosts < 1 or not 0 <= cloud_workers < cloud_hosts:
+            raise ValueError("Need at least one cloud host and fewer cloud workers than cloud hosts.")
+        if hosts_per_edge_cluster < 1:
+            raise ValueError("Each edge cluster needs at least one host.")
+        unknown = set(bandwidth or {}) | set(latency or {})
+        unknown -= set(DEFAULT_BANDWIDTH)
+        if unknown:
+            raise ValueError(f"Unknown link tiers: {sorted(unknown)}")
+        self.cloud_hosts = cloud_hosts
+        self.cloud_workers = cloud_workers
+        self.edge_clusters = edge_clusters
+        self.hosts_per_edge_cluster = hosts_per_edge_cluster
+        self.terminals = terminals
+        self.bandwidth = {**DEFAULT_BANDWIDTH, **(bandwidth or {})}
+        self.latency = {**{tier: 0.0 for tier in DEFAULT_BANDWIDTH}, **(latency or {})}
+        self.cloud_capacity = cloud_capacity
+        self.edge_capacity = edge_capacity
+        self.terminal_capacity = terminal_capacity
+
+    @property
+    def num_hosts(self):
+        return self.cloud_hosts + self.edge_clusters * self.hosts_per_edge_cluster + self.terminals
+
+    def cluster_kinds(self):
+        # 集群0是云中心，1..edge_clusters 是边缘集群，最后一个是终端设备
+        return np.array([CLOUD] + [EDGE] * self.edge_clusters + ([TERMINAL] if self.terminals else []), dtype=np.int8)
+
+    def tier_matrix(self, kinds, values):
+        # kinds 描述的各集群之间按层级填入的 集群 x 集群 矩阵
+        pairs = {
+            (CLOUD, CLOUD): 'cloud', (EDGE, EDGE): 'edge_inter', (TERMINAL, TERMINAL): 'terminal',
+            (CLOUD, EDGE): 'edge_cloud', (EDGE, TERMINAL): 'edge_terminal', (CLOUD, TERMINAL): 'cloud_terminal',
+        }
+        table = np.zeros((3, 3))
+        for (a, b), tier in pairs.items():
+            table[a, b] = table[b, a] = values[tier]
+        matrix = table[kinds[:, None], kinds[None, :]]
+        edge = np.flatnonzero(kinds == EDGE)
+        matrix[edge, edge] = values['edge_intra']
+        return matrix
+
+    def cluster_links(self):
+        """
+        集群 x 集群 的带宽和时延，已补全中转路径。同一层级的边缘集群互相等价，
+        只需在一个代表图(云、至多3个边缘集群、终端)上做最宽路径，再按层级展开，开销与集群数无关。
+        """
+        kinds = self.cluster_kinds()
+        edges = np.flatnonzero(kinds == EDGE)
+        representative = np.array([CLOUD] + [EDGE] * min(len(edges), 3) + ([TERMINAL] if self.terminals else []), dtype=np.int8)
+        bandwidth = self.tier_matrix(representative, self.bandwidth)
+        latency = self.tier_matrix(representative, self.latency)
+        latency[bandwidth == 0] = 0.0
+        widest_paths(bandwidth, latency)
+
+        # 每个集群对应的代表集群；不同边缘集群之间使用代表图中第1、2个边缘集群之间的值
+        mapping = np.zeros(len(kinds), dtype=np.intp)
+        mapping[edges] = 1
+        if self.terminals:
+            mapping[-1] = len(representative) - 1
+        full_bandwidth = bandwidth[mapping[:, None], mapping[None, :]]
+        full_latency = latency[mapping[:, None], mapping[None, :]]
+        if len(edges) > 1:
+            inter = np.ix_(edges, edges)
+            off_diagonal = ~np.eye(len(edges), dtype=bool)
+            full_bandwidth[inter] = np.where(off_diagonal, bandwidth[1, 2], bandwidth[1, 1])
+            full_latency[inter] = np.where(off_diagonal, latency[1, 2], latency[1, 1])
+        return full_bandwidth, full_latency
+
+    def host_ids(self):
+        # 与原 run.py 相同的顺序：云中心、各边缘集群、终端设备
+        cloud = [f'cloud_host_{i}' for i in range(self.cloud_hosts)]
+        edge = [[f'edge_host_{i}_{j}' for j in range(self.hosts_per_edge_cluster)] for i in range(self.edge_clusters)]
+        terminal = [f'terminal_host_{i}' for i in range(self.terminals)]
+        return cloud, edge, terminal
+
+
+class Platform:
+    """
+    由 TopologySpec 描述的平台，拓扑、主机和节点都在第一次访问时构建并缓存。
+    只需要拓扑(例如估计传输时间)时不会创建任何 Host 对象。
+    """
+    def __init__(self, spec):
+        self.spec = spec
+
+    @cached_property
+    def topology(self):
+        spec = self.spec
+        cloud, edge, terminal = spec.host_ids()
+        host_ids = cloud + [host_id for cluster in edge for host_id in cluster] + terminal
+        host_cluster = np.concatenate([
+            np.zeros(len(cloud), dtype=np.int32),
+            np.repeat(np.arange(1, spec.edge_clusters + 1, dtype=np.int32), spec.hosts_per_edge_cluster),
+            np.full(len(terminal), spec.edge_clusters + 1, dtype=np.int32),
+        ])
+        bandwidth, latency = spec.cluster_links()
+        names = ['cloud'] + [f'edge_{i}' for i in range(spec.edge_clusters)] + (['terminal'] if terminal else [])
+        topology = ClusteredTopology(host_ids, host_cluster, bandwidth, latency, cluster_names=names, relay=False)
+        # 文件位置中的 "terminal" 指向第一台终端设备
+        if terminal:
+            topology.add_alias('terminal', terminal[0])
+        return topology
+
+    @cached_property
+    def cloud_hosts(self):
+        return [Host(host_id, *self.spec.cloud_capacity) for host_id in self.spec.host_ids()[0]]
+
+    @cached_property
+    def edge_clusters(self):
+        return [[Host(host_id, *self.spec.edge_capacity) for host_id in cluster] for cluster in self.spec.host_ids()[1]]
+
+    @cached_property
+    def terminal(self):
+        return [Host(host_id, *self.spec.terminal_capacity) for host_id in self.spec.host_ids()[2]]
+
+    @property
+    def hosts(self):
+        return self.cloud_hosts + [host for cluster in self.edge_clusters for host in cluster] + self.terminal
+
+    @cached_property
+    def cloud_masters(self):
+        master = Master(node_id='master_0', host=self.cloud_hosts[0])
+        for worker in self.cloud_workers:
+            master.add_worker(worker)
+        return [master]
+
+    @cached_property
+    def cloud_workers(self):
+        return [Worker(node_id=f'worker_{i}', host=self.cloud_hosts[i + 1]) for i in range(self.spec.cloud_workers)]
+
+    @cached_property
+    def edge_masters(self):
+        masters = []
+        for i, cluster in enumerate(self.edge_clusters):
+            master = Master(node_id=f'edge_master_{i}', host=cluster[0])
+            for worker in self.edge_workers[i]:
+                master.add_worker(worker)
+            masters.append(master)
+        return masters
+
+    @cached_property
+    def edge_workers(self):
+        return [[Worker(node_id=f'edge_worker_{i}_{j}', host=cluster[j]) for j in range(1, len(cluster))]
+                for i, cluster in enumerate(self.edge_clusters)]
+
+
+def build_platform(spec=None):
+    return Platform(spec if spec is not None else TopologySpec())
@@ -0,0 +1,88 @@
+import copy
+import numpy as np
+from daxparse import WorkflowParser
+from env.env_run import CloudEdgeEnv
+
+
+class EnvFactory:
+    """
+    构造 CloudEdgeEnv 的可调用对象。每次调用都会深拷贝节点(主机资源互不影响)并从缓存加载一份独立的任务。
+    它可以被 pickle，因此也能传给子进程在其中构建环境。env_kwargs 原样传给 CloudEdgeEnv(例如 reward_mode)。
+    """
+    def __init__(self, dax_file, cloud_masters, edge_masters, topology=None, start_time=0, **env_kwargs):
+        self.dax_file = dax_file
+        self.cloud_masters = cloud_masters
+        self.edge_masters = edge_masters
+        self.topology = topology
+        self.start_time = start_time
+        self.env_kwargs = env_kwargs
+
+    def __call__(self):
+        parser = WorkflowParser(self.dax_file)
+        parser.parse_dax_file()
+        cloud_masters, edge_masters = copy.deepcopy((self.cloud_masters, self.edge_masters))
+        return CloudEdgeEnv(cloud_masters, edge_masters, parser.get_tasks(), parser.get_dependencies(), self.start_time,
+                            file_registry=parser.get_file_registry(), topology=self.topology, **self.env_kwargs)
+
+
+def make_env_fn(dax_file, cloud_masters, edge_masters, topology=None, start_time=0, **env_kwargs):
+    return EnvFactory(dax_file, cloud_masters, edge_masters, topology, start_time, **env_kwargs)
+
+
+class VectorCloudEdgeEnv:
+    """
+    同步推进 K 个相互独立的 CloudEdgeEnv(可以是不同的工作流)，返回堆叠后的观测，
+    使 actor/critic 每步只需一次批量前向计算。某个环境的episode结束后会自动 reset。
+    所有环境必须使用相同规模的平台，观测维度和动作维度一致。
+    """
+    def __init__(self, env_fns):
+        self.envs = [env_fn() for env_fn in env_fns]
+        self.num_envs = len(self.envs)
+        self.observation_dim = self.envs[0].observation_dim
+        self.action_dim = self.envs[0].action_dim
+        for env in self.envs:
+            if env.observation_dim != self.observation_dim or env.action_dim != self.action_dim:
+                raise ValueError("All environments must share the same observation and action dimensions.")
+        self.observations = np.zeros((self.num_envs, self.observation_dim), dtype=np.float32)
+        # 每个环境当前任务放得下的节点，随 observations 一起更新
+        self.action_masks = np.zeros((self.num_envs, self.action_dim), dtype=bool)
+        self.rewards = np.zeros(self.num_envs, dtype=np.float32)
+        self.dones = np.zeros(self.num_envs, dtype=bool)
+        self.episode_returns = np.zeros(self.num_envs, dtype=np.float64)
+        self.episode_lengths = np.zeros(self.num_envs, dtype=np.int64)
+
+    def reset(self):
+        for i, env in enumerate(self.envs):
+            env.reset()
+            self.observations[i] = env.get_observation()
+            self.action_masks[i] = env.action_mask()
+        self.episode_returns[:] = 0
+        self.episode_lengths[:] = 0
+        return self.observations
+
+    def step(self, node_indices):
+        """
+        node_indices[i] 是第 i 个环境为其当前任务选择的节点下标。
+        返回 (observations, rewards, dones, infos)，infos 中记录本步结束的episode的回报、步数和makespan。
+        结束的环境已经自动 reset，对应的 observations 行是新episode的初始观测。
+        action_masks 同步更新为每个环境下一步的可行节点。
+        """
+        infos = []
+        for i, env in enumerate(self.envs):
+            _, reward, done = env.step([env.make_action(int(node_indices[i]))])
+            self.rewards[i] = reward
+            self.dones[i] = done
+            self.episode_returns[i] += reward
+            self.episode_lengths[i] += 1
+            if done:
+                infos.append({'env': i, 'episode_return': float(self.episode_returns[i]), 'episode_length': int(self.episode_lengths[i]),
+                              'makespan': float(env.get_makespan())})
+                self.episode_returns[i] = 0
+                self.episode_lengths[i] = 0
+                env.reset()
+            self.observations[i] = env.get_observation()
+            self.action_masks[i] = env.action_mask()
+        return self.observations, self.rewards, self.dones, infos
+
+    def close(self):
+        self.envs = []
@@ -0,0 +1,340 @@
+"""
+列表调度启发式基线：HEFT、PEFT 和 Min-Min，直接在 CloudEdgeEnv 上运行，
+输出与 CloudEdgeEnv.step 相同的 (任务, 容器, 节点) 动作，可作为 actor-critic 的对照、模型不可用时的后备调度器，
+也可以通过 collect_demonstrations 生成示范数据为策略做预训练。
+
+环境中的节点按容量并发执行容器，放得下的节点上任务都能立即开始，
+因此任务在节点上的最早完成时间就是 当前时刻 + 输入传输 + 执行 + 叶子任务输出回传(CloudEdgeEnv.estimate_placements)。
+静态网络模型下任务就绪后其输入位置已经确定，这个估计在任务被调度前不再变化，每个任务只计算一次；
+启用网络竞争模型(network=True)时估计还取决于两端主机上的并发流数，每步开始时只作废受影响的部分：
+出口流数变化的主机上有输入来源的任务(以及终端入口变化时需要回传输出的叶子任务)整行作废，
+出口或入口流数变化的主机上的节点整列作废，用到时只重新计算作废的项。
+启用副本(replicas=True)时输入可以从任一副本拉取，副本集合发生变化(ReplicaRegistry.version)的文件的读取者整行作废；
+两者同时启用时，输入来源是持有该文件副本的所有主机(外部输入还有终端)。
+"""
+import numpy as np
+from env.pair_features import PairFeatures
+from env.topology import BITS_PER_BYTE, MEGABIT
+
+
+class ListScheduler:
+    """
+    列表调度的公共部分：缓存每个就绪任务在各节点上的完成时间估计(作废的项为 nan，用到时重新计算)，
+    子类通过 task_priority(越大越先调度)和 node_score(越小越好)定义具体算法。
+    """
+    name = 'list'
+
+    def __init__(self, env):
+        self.env = env
+        self.table = env.task_table
+        self._estimates = np.full((len(self.table), env.action_dim), np.nan)
+        # 算过估计的任务；只有其中仍在就绪队列里的会再被用到，每步只需检查它们的估计是否过期
+        self._cached = np.zeros(len(self.table), dtype=bool)
+        # 需要回传输出的叶子任务，终端入口的流数变化时它们的估计整行作废
+        self.leaves = np.array([len(sizes) > 0 for sizes in env.terminal_outputs], dtype=bool)
+        if env.replicas is not None:
+            # 拓扑行号 -> 副本注册表中的主机(ClusterState 的行号)，不是集群主机的为 -1
+            self.replica_hosts = np.full(len(env.topology.host_ids), -1, dtype=np.int64)
+            self.replica_hosts[env.node_rows[env.host_node]] = np.arange(len(env.host_node))
+        self.reset()
+        self.priority = self.task_priority()
+
+    def task_priority(self):
+        # 默认按就绪先后调度
+        return np.zeros(len(self.table))
+
+    def node_score(self, i, estimates):
+        return estimates
+
+    def reset(self):
+        self._estimates[:] = np.nan
+        self._cached[:] = False
+        network, replicas = self.env.network, self.env.replicas
+        self._link_count = network.link_count[1:1 + 2 * network.num_hosts].copy() if network is not None else None
+        self._file_version = replicas.version.copy() if replicas is not None else None
+
+    def begin_step(self):
+        # 每步选择动作之前调用，作废可能已过期的估计
+        env = self.env
+        live = self._cached & env.task_state.ready
+        if env.replicas is not None:
+            self.drop_changed_replicas(live)
+        if env.network is not None:
+            self.drop_loaded_hosts(live)
+
+    def readers(self, files, live):
+        # live 中读取这些文件中任一个的任务(布尔掩码)
+        env = self.env
+        wanted = np.zeros(len(env.replicas.file_size), dtype=bool)
+        wanted[files] = True
+        inputs = np.flatnonzero(live[env.input_task])
+        stale = np.zeros(len(self.table), dtype=bool)
+        stale[env.input_task[inputs[wanted[env.input_file[inputs]]]]] = True
+        return stale
+
+    def drop_changed_replicas(self, live):
+        # 上次检查之后副本集合发生变化的文件：读取它们的任务整行作废
+        version = self.env.replicas.version
+        changed = version != self._file_version
+        if not changed.any():
+            return
+        self._file_version = version.copy()
+        if live.any():
+            self._estimates[self.readers(np.flatnonzero(changed), live)] = np.nan
+
+    def drop_loaded_hosts(self, live):
+        # 上次检查之后出口或入口流数变化的主机：从这些主机拉取输入的任务整行作废，这些主机上的节点整列作废
+        network = self.env.network
+        hosts = network.num_hosts
+        counts = network.link_count[1:1 + 2 * hosts]
+        changed = counts != self._link_count
+        if not changed.any():
+            return
+        self._link_count = counts.copy()
+        if not live.any():
+            return
+        # 按拓扑行号索引的掩码：出口/入口流数变化的主机
+        egress, ingress = changed[:hosts], changed[hosts:]
+        env = self.env
+        terminal = env.terminal_row
+        if env.replicas is not None:
+            # 输入来源是各文件的全部副本，外部输入还可以从终端拉取
+            replicas = env.replicas
+            sources = self.replica_hosts[np.flatnonzero(egress)]
+            files = set().union(*(replicas.lru[n] for n in sources[sources >= 0].tolist()))
+            if terminal >= 0 and egress[terminal]:
+                files.update(np.flatnonzero(replicas.external).tolist())
+            stale = self.readers(np.fromiter(files, dtype=np.int64, count=len(files)), live)
+        else:
+            # 就绪任务的输入都已到达，来源即 task_state.source
+            inputs = np.flatnonzero(live[env.input_task])
+            sources = env.location_rows(env.task_state.source[inputs])
+            stale = np.zeros(len(self.table), dtype=bool)
+            stale[env.input_task[inputs[egress[sources]]]] = True
+        if terminal >= 0 and ingress[terminal]:
+            stale |= self.leaves & live
+        self._estimates[stale] = np.nan
+        self._estimates[np.ix_(np.flatnonzero(live), (egress | ingress)[env.node_rows])] = np.nan
+
+    def refresh(self, rows):
+        # 重新计算多个任务作废的估计：有作废项的任务在一次批量计算中只算作废项所在的列
+        stale = np.isnan(self._estimates[rows])
+        partial = stale.any(axis=1)
+        if not partial.any():
+            return
+        rows = rows[partial]
+        nodes = stale[partial].any(axis=0)
+        if nodes.all():
+            self._estimates[rows] = self.env.estimate_tasks(rows)
+        else:
+            nodes = np.flatnonzero(nodes)
+            self._estimates[np.ix_(rows, nodes)] = self.env.estimate_tasks(rows, nodes)
+        self._cached[rows] = True
+
+    def estimates(self, i):
+        # 第 i 个任务放在每个节点上的完成时间(相对当前时刻)，任务就绪后才有效；只重新计算作废的项
+        row = self._estimates[i]
+        stale = np.isnan(row)
+        if stale.all():
+            row[:] = self.env.estimate_placements(self.env.task_list[i])
+        elif stale.any():
+            nodes = np.flatnonzero(stale)
+            row[nodes] = self.env.estimate_placements(self.env.task_list[i], nodes)
+        self._cached[i] = True
+        return row
+
+    def select_node(self, task):
+        # 在放得下该任务的节点中选得分最低的；没有节点放得下时返回得分最低的节点，由环境推进到下一个事件
+        i = self.env.task_index[task.task_id]
+        score = self.node_score(i, self.estimates(i))
+        feasible = self.env.action_mask(task)
+        if feasible.any():
+            score = np.where(feasible, score, np.inf)
+        return int(np.argmin(score))
+
+    def select_task(self):
+        ready = np.flatnonzero(self.env.task_state.ready)
+        if not len(ready):
+            return None
+        return self.env.task_list[ready[np.argmax(self.priority[ready])]]
+
+    def next_action(self):
+        self.begin_step()
+        task = self.select_task()
+        if task is None:
+            return None
+        node = self.env.node_list[self.select_node(task)]
+        return task, self.env.make_docker(task), node
+
+    def run(self):
+        # 从头调度整个工作流，返回 (makespan, 步数)
+        env = self.env
+        env.reset()
+        self.reset()
+        done = False
+        steps = 0
+        while not done:
+            _, _, done = env.step([self.next_action()])
+            steps += 1
+        return env.get_makespan(), steps
+
+    def average_costs(self):
+        """
+        HEFT/PEFT 使用的平均代价：每个任务在各节点上的执行时间(含叶子任务输出回传) w[任务, 节点]，
+        以及与 child_idx 对齐的每条依赖边在不同节点之间的平均通信时间。
+        """
+        env = self.env
+        topology = env.topology
+        rows = env.node_rows
+        bandwidth, latency = topology.links(rows[:, None], rows[None, :])
+        # 同一主机上的节点之间不需要传输，不计入平均
+        reachable = (rows[:, None] != rows[None, :]) & (bandwidth > 0)
+        if reachable.any():
+            seconds_per_byte = np.mean(BITS_PER_BYTE / (bandwidth[reachable] * MEGABIT))
+            mean_latency = np.mean(latency[reachable])
+        else:
+            seconds_per_byte = mean_latency = 0.0
+        edge_bytes = self.table.child_bytes()
+        edge_costs = np.where(edge_bytes > 0, edge_bytes * seconds_per_byte + mean_latency, 0.0)
+
+        costs = np.repeat(self.table.runtime[:, None], len(rows), axis=1)
+        if env.terminal_row >= 0:
+            with np.errstate(divide='ignore'):
+                terminal_bandwidth, terminal_latency = topology.links(rows, env.terminal_row)
+                per_byte = np.where(terminal_bandwidth > 0, BITS_PER_BYTE / (terminal_bandwidth * MEGABIT), np.inf)
+            for i, sizes in enumerate(env.terminal_outputs):
+                for size in sizes:
+                    costs[i] += size * per_byte + terminal_latency
+        return costs, edge_costs
+
+
+class HEFT(ListScheduler):
+    """
+    HEFT：按向上秩 rank_u(i) = w̄_i + max_{j∈succ(i)} (c̄_ij + rank_u(j)) 从大到小调度，
+    每个任务放到最早完成的节点上。向上秩在一次逆拓扑序遍历中算出。
+    """
+    name = 'HEFT'
+
+    def task_priority(self):
+        costs, edge_costs = self.average_costs()
+        mean_costs = np.where(np.isfinite(costs), costs, np.nan)
+        mean_costs = np.nan_to_num(np.nanmean(mean_costs, axis=1)).tolist()
+        child_ptr = self.table.child_ptr.tolist()
+        child_idx = self.table.child_idx.tolist()
+        edge_costs = edge_costs.tolist()
+        rank = [0.0] * len(self.table)
+        for i in reversed(self.table.topological_order().tolist()):
+            best = 0.0
+            for e in range(child_ptr[i], child_ptr[i + 1]):
+                best = max(best, edge_costs[e] + rank[child_idx[e]])
+            rank[i] = mean_costs[i] + best
+        self.rank = np.array(rank)
+        return self.rank
+
+
+class PEFT(ListScheduler):
+    """
+    PEFT：乐观代价表 OCT(i, p) = max_{j∈succ(i)} min_{p'} (OCT(j, p') + w(j, p') + c̄_ij·[p' ≠ p])，
+    按 OCT 的行均值从大到小调度，节点选择最小化 完成时间 + OCT(i, p)，为后继任务留出更好的位置。
+    """
+    name = 'PEFT'
+
+    def task_priority(self):
+        costs, edge_costs = self.average_costs()
+        child_ptr = self.table.child_ptr
+        child_idx = self.table.child_idx
+        self.oct = np.zeros_like(costs)
+        for i in reversed(self.table.topological_order().tolist()):
+            start, end = child_ptr[i], child_ptr[i + 1]
+            if start == end:
+                continue
+            children = child_idx[start:end]
+            # 后继放在同一节点上不需要通信，放在其他节点上至少付出平均通信时间
+            through = self.oct[children] + costs[children]
+            elsewhere = through.min(axis=1, keepdims=True) + edge_costs[start:end, None]
+            self.oct[i] = np.minimum(through, elsewhere).max(axis=0)
+        return self.oct.mean(axis=1)
+
+    def node_score(self, i, estimates):
+        return estimates + self.oct[i]
+
+
+class MinMin(ListScheduler):
+    """
+    Min-Min：每步计算所有就绪任务在放得下的节点上的最早完成时间，
+    选出完成时间最小的 (任务, 节点) 组合。
+    """
+    name = 'Min-Min'
+
+    def __init__(self, env):
+        super().__init__(env)
+        self._chosen = None  # select_task 选出的 (任务下标, 节点下标)
+
+    def select_task(self):
+        ready = np.flatnonzero(self.env.task_state.ready)
+        if not len(ready):
+            return None
+        self.refresh(ready)
+        completion = self._estimates[ready]
+        fits = self.env.action_masks(ready)
+        if fits.any():
+            completion = np.where(fits, completion, np.inf)
+        task_row, node = np.unravel_index(np.argmin(completion), completion.shape)
+        self._chosen = (ready[task_row], int(node))
+        return self.env.task_list[ready[task_row]]
+
+    def select_node(self, task):
+        i = self.env.task_index[task.task_id]
+        if self._chosen is not None and self._chosen[0] == i:
+            return self._chosen[1]
+        return super().select_node(task)
+
+
+SCHEDULERS = {scheduler.name: scheduler for scheduler in (HEFT, PEFT, MinMin)}
+
+
+def collect_demonstrations(env, scheduler, episodes=1):
+    """
+    用启发式为环境的当前任务(env.current_task())选节点，记录 (观测, 节点下标, 动作掩码)，
+    可直接交给 DistributedActorCritic.pretrain_actor 做行为克隆。任务顺序仍由环境决定，与策略看到的观测一致。
+    """
+    observations, actions, masks = [], [], []
+    for _ in range(episodes):
+        env.reset()
+        scheduler.reset()
+        done = False
+        while not done:
+            task = env.current_task()
+            scheduler.begin_step()
+            node = scheduler.select_node(task)
+            observations.append(env.get_observation().copy())
+            masks.append(env.action_mask().copy())
+            actions.append(node)
+            _, _, done = env.step([env.make_action(node)])
+    return (np.array(observations, dtype=np.float32), np.array(actions, dtype=np.int32),
+            np.array(masks, dtype=bool))
+
+
+def collect_pair_demonstrations(env, scheduler, episodes=1, max_tasks=None):
+    """
+    记录启发式的 (任务, 节点) 联合选择：每步为所有就绪任务编码 env.pair_features.PairObservation，
+    连同启发式选中的任务在观测中的行号和节点下标，可直接交给 ACScheduler.PairScoringActor.pretrain。
+    只记录选中的任务放得下的步骤；放不下时照常执行，由环境推进到下一个事件。
+    """
+    features = PairFeatures(env)
+    demonstrations = []
+    for _ in range(episodes):
+        env.reset()
+        scheduler.reset()
+        done = False
+        while not done:
+            action = scheduler.next_action()
+            if action is not None:
+                observation = features.observe(max_tasks)
+                i = env.task_index[action[0].task_id]
+                node = env.node_index[action[2].node_id]
+                row = np.flatnonzero(observation.tasks == i)
+                if len(row) and observation.masks[row[0], node]:
+                    demonstrations.append((observation, int(row[0]), node))
+            _, _, done = env.step([action] if action is not None else [])
+    return demonstrations
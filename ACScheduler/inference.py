@@ -0,0 +1,183 @@
+"""
+不依赖 TensorFlow 的策略推理：DistributedActorCritic.export_weights() 把 ActorNetwork/CriticNetwork 的全连接层
+权重写进一个扁平文件，PolicyEngine 用 np.memmap 映射该文件，以纯 NumPy 的批量矩阵乘法复现 logits 和状态价值。
+只需要调度决策的进程导入本模块即可，不会加载 TensorFlow。
+
+    engine = PolicyEngine('policy.weights')
+    actions = engine.select_actions(observations, masks)
+
+文件格式(小端)：4字节魔数 b'ACSW'，uint32 头部长度，JSON 头部(各网络的层形状、激活函数和数据偏移)，
+补齐到64字节对齐后是所有层的 float32 权重和偏置，按头部记录的偏移依次存放。
+"""
+import json
+import struct
+
+import numpy as np
+
+# 被掩码的动作的 logit，softmax 后概率为0；不用 -inf 以免 0 * log(0) 在熵项中产生 NaN
+MASKED_LOGIT = -1e9
+
+MAGIC = b'ACSW'
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+ACTIVATIONS = ('relu', 'linear')
+
+
+def save_networks(path, **networks):
+    """
+    networks: 网络名 -> [(kernel (输入, 输出), bias (输出,), 激活函数名)]，按前向顺序排列。
+    """
+    header = {'version': FORMAT_VERSION, 'networks': {}}
+    blobs = []
+    offset = 0  # 以 float32 个数计，相对数据区起点
+    for name, layers in networks.items():
+        specs = []
+        for kernel, bias, activation in layers:
+            if activation not in ACTIVATIONS:
+                raise ValueError(f"Unsupported activation {activation!r} in network {name!r}.")
+            kernel = np.ascontiguousarray(kernel, dtype='<f4')
+            bias = np.ascontiguousarray(bias, dtype='<f4')
+            if kernel.ndim != 2 or bias.shape != (kernel.shape[1],):
+                raise ValueError(f"Layer shapes {kernel.shape} / {bias.shape} in network {name!r} do not form a dense layer.")
+            specs.append({'inputs': kernel.shape[0], 'outputs': kernel.shape[1], 'activation': activation,
+                          'kernel': offset, 'bias': offset + kernel.size})
+            offset += kernel.size + bias.size
+            blobs.extend((kernel, bias))
+        header['networks'][name] = specs
+
+    encoded = json.dumps(header).encode('utf-8')
+    prefix = len(MAGIC) + 4 + len(encoded)
+    padding = -prefix % ALIGNMENT
+    with open(path, 'wb') as file:
+        file.write(MAGIC)
+        file.write(struct.pack('<I', len(encoded)))
+        file.write(encoded)
+        file.write(b'\0' * padding)
+        for blob in blobs:
+            file.write(blob.tobytes())
+    return path
+
+
+def load_networks(path):
+    # 返回 网络名 -> DenseNetwork，权重是只读 memmap 上的视图，不会把整个文件读入内存
+    with open(path, 'rb') as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not an exported policy weights file.")
+        header_size, = struct.unpack('<I', file.read(4))
+        header = json.loads(file.read(header_size).decode('utf-8'))
+    if header.get('version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported policy weights version {header.get('version')!r}.")
+    prefix = len(MAGIC) + 4 + header_size
+    data = np.memmap(path, dtype='<f4', mode='r', offset=prefix + (-prefix % ALIGNMENT))
+    networks = {}
+    for name, specs in header['networks'].items():
+        layers = []
+        for spec in specs:
+            kernel = data[spec['kernel']:spec['kernel'] + spec['inputs'] * spec['outputs']].reshape(spec['inputs'], spec['outputs'])
+            bias = data[spec['bias']:spec['bias'] + spec['outputs']]
+            layers.append((kernel, bias, spec['activation']))
+        networks[name] = DenseNetwork(layers)
+    return networks
+
+
+class DenseNetwork:
+    """
+    一串全连接层的批量前向计算。每种批大小的中间结果缓冲区只分配一次，之后的调用不再分配内存；
+    返回的数组是内部缓冲区，下次同样批大小的调用会覆盖它，需要保留时请自行 copy()。
+    """
+    def __init__(self, layers):
+        self.layers = list(layers)
+        self.input_dim = self.layers[0][0].shape[0]
+        self.output_dim = self.layers[-1][0].shape[1]
+        self._buffers = {}
+
+    def buffers(self, batch_size):
+        buffers = self._buffers.get(batch_size)
+        if buffers is None:
+            buffers = [np.empty((batch_size, kernel.shape[1]), dtype=np.float32) for kernel, _, _ in self.layers]
+            self._buffers[batch_size] = buffers
+        return buffers
+
+    def __call__(self, inputs):
+        x = np.asarray(inputs, dtype=np.float32)
+        if x.ndim == 1:
+            x = x[None]
+        if x.shape[1] != self.input_dim:
+            raise ValueError(f"Expected inputs with {self.input_dim} features, got {x.shape[1]}.")
+        for (kernel, bias, activation), out in zip(self.layers, self.buffers(len(x))):
+            np.matmul(x, kernel, out=out)
+            out += bias
+            if activation == 'relu':
+                np.maximum(out, 0.0, out=out)
+            x = out
+        return x
+
+
+class PolicyEngine:
+    """
+    导出的 actor(以及可选的 critic)的推理引擎：logits/values 对一批观测做一次前向计算，
+    select_actions 按 action_mask 屏蔽放不下的节点后取 logit 最大的动作，或传入 rng 按 softmax 概率采样。
+    """
+    def __init__(self, path):
+        self.path = path
+        self.networks = load_networks(path)
+        self.actor = self.networks['actor']
+        self.critic = self.networks.get('critic')
+        self.state_dim = self.actor.input_dim
+        self.action_dim = self.actor.output_dim
+
+    def logits(self, states):
+        return self.actor(states)
+
+    def values(self, states):
+        if self.critic is None:
+            raise ValueError(f"{self.path} does not contain a critic network.")
+        return self.critic(states)[:, 0]
+
+    def masked_logits(self, states, masks=None):
+        # 与 ACScheduler.masked_logits 相同：某一行没有任何可行动作时保留该行全部动作
+        logits = self.logits(states)
+        if masks is not None:
+            masks = np.asarray(masks, dtype=bool).reshape(logits.shape)
+            keep = masks | ~masks.any(axis=1, keepdims=True)
+            logits = np.where(keep, logits, np.float32(MASKED_LOGIT))
+        return logits
+
+    def select_actions(self, states, masks=None, rng=None):
+        logits = self.masked_logits(states, masks)
+        if rng is None:
+            return np.argmax(logits, axis=1)
+        # Gumbel-max 采样，等价于按 softmax(logits) 采样
+        return np.argmax(logits - np.log(-np.log(rng.random(logits.shape))), axis=1)
+
+    def select_action(self, state, mask=None, rng=None):
+        return int(self.select_actions(state, None if mask is None else mask[None], rng)[0])
+
+
+class PairPolicyEngine:
+    """
+    ACScheduler.PairScoringActor.export_weights() 导出的 (任务, 节点) 打分策略的推理引擎：
+    logits = task_encoder(任务特征)·node_encoder(节点特征)/sqrt(d) + pair_scorer(任务-节点特征)，
+    与节点数无关，同一个权重文件可以用于任意规模的集群。
+    """
+    def __init__(self, path):
+        self.path = path
+        networks = load_networks(path)
+        self.task_encoder = networks['task_encoder']
+        self.node_encoder = networks['node_encoder']
+        self.pair_scorer = networks['pair_scorer']
+        self.scale = np.float32(1.0 / np.sqrt(self.task_encoder.output_dim))
+
+    def logits(self, task_features, node_features, pair_features):
+        # (就绪任务数, 节点数)
+        query = self.task_encoder(task_features)
+        key = self.node_encoder(node_features)
+        scores = query @ key.T
+        scores *= self.scale
+        tasks, nodes, width = pair_features.shape
+        scores += self.pair_scorer(pair_features.reshape(tasks * nodes, width)).reshape(tasks, nodes)
+        return scores
+
+    def pair_logits(self, observation):
+        # 供 env.pair_features.schedule_pairs 使用
+        return self.logits(observation.task_features, observation.node_features, observation.pair_features)
@@ -0,0 +1,142 @@
+"""
+可选的热点计时和计数：环境和训练循环中的主要阶段用 profiler.span(名称) 包裹，事件用 profiler.count(名称) 计数。
+默认关闭，关闭时 span() 直接返回一个共享的空上下文，每次调用只有一次属性判断的开销。
+
+开启后记录每个阶段的累计耗时/调用次数，end_episode() 把当前episode的统计存为一条摘要，
+export_chrome_trace() 导出 Chrome(chrome://tracing)/Perfetto(ui.perfetto.dev) 可以直接打开的 JSON 轨迹。
+
+    from profiling import profiler
+    profiler.enable()
+    ...  # 运行环境或训练
+    profiler.export_chrome_trace('trace.json')
+    profiler.export_summaries('episodes.json')
+"""
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+
+class _NullSpan:
+    # 关闭时使用的空上下文，所有 span() 调用共享同一个实例
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter_ns())
+        return False
+
+
+class Profiler:
+    """
+    命名计时器和计数器。max_events 限制保存的轨迹事件数，超过后只继续累计统计，不再记录单个事件。
+    """
+    def __init__(self, max_events=1_000_000):
+        self.enabled = False
+        self.max_events = max_events
+        self.clear()
+
+    def enable(self):
+        self.enabled = True
+        return self
+
+    def disable(self):
+        self.enabled = False
+        return self
+
+    def clear(self):
+        self.origin = time.perf_counter_ns()
+        self.events = []  # (名称, 开始ns, 结束ns, 线程ID)
+        self.counter_events = []  # (名称, 时间ns, 当前累计值)
+        self.dropped_events = 0
+        self.episodes = []
+        self._reset_episode()
+
+    def _reset_episode(self):
+        self.totals = defaultdict(int)  # 名称 -> 当前episode累计耗时(ns)
+        self.calls = defaultdict(int)
+        self.counters = defaultdict(int)
+        self.episode_start = time.perf_counter_ns()
+
+    def span(self, name):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name, start, end):
+        self.totals[name] += end - start
+        self.calls[name] += 1
+        if len(self.events) < self.max_events:
+            self.events.append((name, start, end, threading.get_ident()))
+        else:
+            self.dropped_events += 1
+
+    def count(self, name, value=1):
+        if not self.enabled:
+            return
+        self.counters[name] += value
+        if len(self.counter_events) < self.max_events:
+            self.counter_events.append((name, time.perf_counter_ns(), self.counters[name]))
+
+    def summary(self):
+        # 当前episode各阶段的耗时(秒)、调用次数和计数器，按耗时从大到小排列
+        wall = (time.perf_counter_ns() - self.episode_start) / 1e9
+        phases = {name: {'seconds': total / 1e9, 'calls': self.calls[name],
+                         'mean_us': total / 1e3 / self.calls[name], 'share': total / 1e9 / wall if wall > 0 else 0.0}
+                  for name, total in sorted(self.totals.items(), key=lambda item: -item[1])}
+        return {'wall_seconds': wall, 'phases': phases, 'counters': dict(self.counters)}
+
+    def end_episode(self, **info):
+        # 保存当前episode的摘要(可附带 makespan、回报等信息)并开始统计下一个episode
+        if not self.enabled:
+            return None
+        summary = {'episode': len(self.episodes), **info, **self.summary()}
+        self.episodes.append(summary)
+        self._reset_episode()
+        return summary
+
+    def chrome_trace(self):
+        pid = os.getpid()
+        trace = []
+        for name, start, end, tid in self.events:
+            trace.append({'name': name, 'cat': name.split('.', 1)[0], 'ph': 'X', 'pid': pid, 'tid': tid,
+                          'ts': (start - self.origin) / 1e3, 'dur': (end - start) / 1e3})
+        for name, timestamp, value in self.counter_events:
+            trace.append({'name': name, 'ph': 'C', 'pid': pid, 'ts': (timestamp - self.origin) / 1e3, 'args': {name: value}})
+        return {'traceEvents': trace, 'displayTimeUnit': 'ms',
+                'otherData': {'dropped_events': self.dropped_events}}
+
+    def export_chrome_trace(self, path):
+        with open(path, 'w') as file:
+            json.dump(self.chrome_trace(), file)
+        return path
+
+    def export_summaries(self, path):
+        with open(path, 'w') as file:
+            json.dump(self.episodes, file, indent=2)
+        return path
+
+
+# 环境和训练循环共用的全局实例
+profiler = Profiler()
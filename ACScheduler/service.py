@@ -0,0 +1,375 @@
+"""
+在线调度服务：asyncio 守护进程，监听 Unix 套接字或本机 TCP 端口，协议为每行一个 JSON 请求/响应。
+多个工作流共享同一个集群模型(与 CloudEdgeEnv 相同的节点顺序、资源数组和观测格式)，
+同时到达的放置请求合并成一批，只做一次 actor 前向计算(inference.PolicyEngine，不加载 TensorFlow)。
+
+请求：
+    {"op": "submit", "dax": "workflows/MONTAGE.n.50.0.dax"}             -> {"workflow": ID, "tasks": 任务数}
+    {"op": "submit", "tasks": [{"id", "runtime", "inputs": [[文件名, 大小]], "outputs": [...]}],
+     "dependencies": [[父任务ID, 子任务ID]]}                              -> 同上
+    没有任务的工作流不会登记，直接返回 {"workflow": ID, "tasks": 0, "done": true}
+    {"op": "place", "workflow": ID}      -> {"task": 任务ID, "node": 节点ID}；没有就绪任务或放不下时 task 为 null
+    {"op": "complete", "workflow": ID, "task": 任务ID}                  -> {"ready": 就绪任务数, "done": 是否全部完成}
+    {"op": "stats"}                                                      -> 放置数、批次数、平均批大小等
+出错时返回 {"error": 说明}。
+
+用法(在 ACScheduler 目录下)：
+    python service.py --socket /tmp/acscheduler.sock [--weights policy.weights]
+    python service.py --port 8765 [--weights policy.weights]
+未指定 --weights 时使用 LeastLoadedPolicy(放得下的节点中剩余CPU最多的一个)。
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import time
+
+import numpy as np
+
+from env.cluster_state import ClusterState
+from env.env_run import TASK_FEATURES, HISTORY_LENGTHS, HISTORY_WIDTH, FAILURE_REJECTED
+from env.observation import RingBuffer, ObservationEncoder
+from task.task_table import TaskTable
+
+RESOURCE_FEATURES = 6
+
+
+class LeastLoadedPolicy:
+    """
+    没有导出权重时的后备策略，接口与 PolicyEngine.masked_logits 相同：
+    logit 为观测中每个节点的剩余CPU，放不下的节点被屏蔽。
+    """
+    def __init__(self, action_dim):
+        self.action_dim = action_dim
+        self.state_dim = None
+
+    def masked_logits(self, states, masks=None):
+        logits = np.asarray(states)[:, 0:self.action_dim * RESOURCE_FEATURES:RESOURCE_FEATURES].astype(np.float32)
+        if masks is not None:
+            logits = np.where(masks | ~masks.any(axis=1, keepdims=True), logits, -np.inf)
+        return logits
+
+
+class WorkflowSession:
+    # 一个在线工作流：父任务全部完成的任务进入就绪队列(按就绪先后排序)，完成通知到达后再更新子任务
+    def __init__(self, workflow_id, table):
+        self.workflow_id = workflow_id
+        self.table = table
+        n = len(table)
+        self.unfinished_parents = np.diff(table.parent_ptr).astype(np.int64)
+        self.assigned = np.full(n, -1, dtype=np.int64)
+        self.started = np.zeros(n, dtype=np.float64)
+        self.completed = np.zeros(n, dtype=bool)
+        self.completed_count = 0
+        self.demand = np.stack([table.cpu_demand, table.ram_demand, table.storage_demand], axis=1)
+        self.input_mb = np.bincount(table.input_task, weights=table.input_size, minlength=n) / 1e6
+        self.child_count = np.diff(table.child_ptr)
+        self.ready = dict.fromkeys(np.flatnonzero(self.unfinished_parents == 0).tolist())
+        self.submitted = time.monotonic()
+
+    def ready_task(self, k):
+        # 就绪队列中的第 k 个任务(同一批中对同一工作流的第 k 个放置请求)，不存在时为 None
+        return next(itertools.islice(self.ready, k, None), None)
+
+    def complete(self, i):
+        self.completed[i] = True
+        self.completed_count += 1
+        for child in self.table.child_idx[self.table.child_ptr[i]:self.table.child_ptr[i + 1]].tolist():
+            self.unfinished_parents[child] -= 1
+            if self.unfinished_parents[child] == 0:
+                self.ready[child] = None
+
+    @property
+    def done(self):
+        return self.completed_count == len(self.table)
+
+
+class SchedulingService:
+    """
+    共享集群模型和放置请求的微批处理。place() 把请求放进队列后等待结果，
+    后台的 batcher 收集 batch_window 秒内(最多 max_batch 个)到达的请求，一次前向计算后按到达顺序依次落实；
+    同一批中较早的放置占用资源后，较晚请求原先选中的节点可能已放不下，此时改选仍放得下的 logit 最大的节点。
+    """
+    def __init__(self, cloud_masters, edge_masters, policy=None, batch_window=0.0, max_batch=64,
+                 history_lengths=None):
+        # 与 CloudEdgeEnv.node_list 相同的顺序：先是所有master，再是各master下的worker
+        masters = cloud_masters + edge_masters
+        self.node_list = masters + [worker for master in masters for worker in master.workers]
+        self.action_dim = len(self.node_list)
+        self.cluster_state = ClusterState([node.host for node in self.node_list])
+        lengths = {**HISTORY_LENGTHS, **(history_lengths or {})}
+        self.task_history = RingBuffer(lengths['task'], HISTORY_WIDTH)
+        self.task_failure_history = RingBuffer(lengths['failure'], HISTORY_WIDTH)
+        self.resource_utilization_history = RingBuffer(lengths['utilization'], HISTORY_WIDTH)
+        self.encoder = ObservationEncoder(self.action_dim * RESOURCE_FEATURES + TASK_FEATURES,
+                                          (self.task_history, self.task_failure_history, self.resource_utilization_history))
+        self.observation_dim = self.encoder.dim
+        self.policy = policy if policy is not None else LeastLoadedPolicy(self.action_dim)
+        if getattr(self.policy, 'state_dim', None) not in (None, self.observation_dim) or self.policy_action_dim() != self.action_dim:
+            raise ValueError(f"Policy expects {self.policy.state_dim} features / {self.policy_action_dim()} actions, "
+                             f"the cluster model has {self.observation_dim} / {self.action_dim}.")
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.workflows = {}
+        self._workflow_ids = itertools.count()
+        self._states = np.zeros((max_batch, self.observation_dim), dtype=np.float32)
+        self._masks = np.zeros((max_batch, self.action_dim), dtype=bool)
+        self._history_row = np.zeros(HISTORY_WIDTH, dtype=np.float32)
+        self._queue = None
+        self.stats = {'placements': 0, 'unplaced': 0, 'completions': 0, 'batches': 0, 'batched_requests': 0,
+                      'workflows_done': 0, 'failed_batches': 0}
+
+    def policy_action_dim(self):
+        return getattr(self.policy, 'action_dim', self.action_dim)
+
+    # ---- 工作流和完成通知 ----
+
+    def submit(self, table):
+        workflow_id = str(next(self._workflow_ids))
+        if not len(table):
+            # 没有任务就永远不会收到 complete，登记后无法移除
+            self.stats['workflows_done'] += 1
+            return {'workflow': workflow_id, 'tasks': 0, 'done': True}
+        self.workflows[workflow_id] = WorkflowSession(workflow_id, table)
+        return {'workflow': workflow_id, 'tasks': len(table)}
+
+    def complete(self, workflow_id, task_id):
+        session = self.session(workflow_id)
+        i = session.table.index.get(task_id)
+        if i is None or session.assigned[i] < 0 or session.completed[i]:
+            raise ValueError(f"Task {task_id!r} of workflow {workflow_id} is not running.")
+        node = session.assigned[i]
+        self.cluster_state.free[self.cluster_state.rows[node]] += session.demand[i]
+        session.complete(i)
+        self.record_history(self.task_history, node, session.table.runtime[i], time.monotonic() - session.started[i])
+        if self.resource_utilization_history.capacity:
+            np.mean(self.cluster_state.node_utilization(), axis=0, out=self._history_row)
+            self.resource_utilization_history.append(self._history_row)
+        self.stats['completions'] += 1
+        result = {'ready': len(session.ready), 'done': session.done}
+        if session.done:
+            result['makespan'] = time.monotonic() - session.submitted
+            del self.workflows[workflow_id]
+            self.stats['workflows_done'] += 1
+        return result
+
+    def session(self, workflow_id):
+        session = self.workflows.get(workflow_id)
+        if session is None:
+            raise ValueError(f"Unknown workflow {workflow_id!r}.")
+        return session
+
+    def record_history(self, ring, node, *values):
+        row = self._history_row
+        row[0] = node / max(self.action_dim - 1, 1)
+        row[1:] = values
+        ring.append(row)
+
+    # ---- 微批放置 ----
+
+    async def place(self, workflow_id):
+        self.session(workflow_id)
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((workflow_id, future))
+        return await future
+
+    async def batcher(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            # 一批出错只让这一批的请求收到错误，批处理循环继续服务后续请求
+            try:
+                results = self.place_batch([workflow_id for workflow_id, _ in batch])
+            except Exception as error:
+                self.stats['failed_batches'] += 1
+                for _, future in batch:
+                    if not future.done():
+                        failure = RuntimeError(f"Placement batch failed: {error!r}")
+                        failure.__cause__ = error
+                        future.set_exception(failure)
+                continue
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def place_batch(self, workflow_ids):
+        """
+        为一批放置请求各选一个就绪任务并编码观测，一次前向计算后按顺序落实，返回每个请求的结果字典。
+        """
+        state = self.cluster_state
+        resources = state.observe().reshape(-1)
+        histories = self.encoder.encode()[len(self.encoder.base):]
+        base = len(resources)
+        nodes_free = state.free[state.rows]
+        counts = {}
+        chosen = []
+        for b, workflow_id in enumerate(workflow_ids):
+            session = self.workflows.get(workflow_id)
+            k = counts.get(workflow_id, 0)
+            counts[workflow_id] = k + 1
+            i = session.ready_task(k) if session is not None else None
+            chosen.append((session, i))
+            row = self._states[b]
+            row[:base] = resources
+            row[base + TASK_FEATURES:] = histories
+            features = row[base:base + TASK_FEATURES]
+            if i is None:
+                features[:] = 0.0
+                self._masks[b] = False
+                continue
+            n = len(session.table)
+            features[:] = (session.table.runtime[i], session.input_mb[i], session.child_count[i],
+                           session.completed_count / n, len(session.ready) / n)
+            np.all(nodes_free >= session.demand[i], axis=1, out=self._masks[b])
+
+        size = len(workflow_ids)
+        logits = np.array(self.policy.masked_logits(self._states[:size], self._masks[:size]), dtype=np.float64)
+        self.stats['batches'] += 1
+        self.stats['batched_requests'] += size
+
+        results = []
+        now = time.monotonic()
+        for b, (session, i) in enumerate(chosen):
+            if i is None or i not in session.ready:
+                results.append({'task': None})
+                continue
+            # 同批较早的放置可能已占用了资源，只在当前仍放得下的节点中选
+            fits = np.all(state.free[state.rows] >= session.demand[i], axis=1)
+            if not fits.any():
+                self.record_history(self.task_failure_history, int(np.argmax(logits[b])), session.table.runtime[i], FAILURE_REJECTED)
+                self.stats['unplaced'] += 1
+                results.append({'task': None})
+                continue
+            node = int(np.argmax(np.where(fits, logits[b], -np.inf)))
+            state.free[state.rows[node]] -= session.demand[i]
+            del session.ready[i]
+            session.assigned[i] = node
+            session.started[i] = now
+            self.stats['placements'] += 1
+            results.append({'task': session.table.task_ids[i], 'node': self.node_list[node].node_id})
+        return results
+
+    # ---- 协议 ----
+
+    async def handle_request(self, request):
+        op = request.get('op')
+        if op == 'place':
+            return await self.place(request['workflow'])
+        if op == 'complete':
+            return self.complete(request['workflow'], request['task'])
+        if op == 'submit':
+            table = await asyncio.get_running_loop().run_in_executor(None, parse_submission, request)
+            return self.submit(table)
+        if op == 'stats':
+            batches = max(self.stats['batches'], 1)
+            return {**self.stats, 'active_workflows': len(self.workflows),
+                    'mean_batch': self.stats['batched_requests'] / batches}
+        raise ValueError(f"Unknown op {op!r}.")
+
+    async def handle_connection(self, reader, writer):
+        # 同一连接上的请求按顺序处理；并发来自多个连接
+        try:
+            while line := await reader.readline():
+                try:
+                    response = await self.handle_request(json.loads(line))
+                except (ValueError, KeyError, TypeError, AttributeError, OSError, RuntimeError) as error:
+                    response = {'error': str(error)}
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, socket_path=None, host='127.0.0.1', port=8765, ready=None):
+        self._queue = asyncio.Queue()
+        batcher = asyncio.create_task(self.batcher())
+        if socket_path:
+            server = await asyncio.start_unix_server(self.handle_connection, path=socket_path)
+        else:
+            server = await asyncio.start_server(self.handle_connection, host=host, port=port)
+        if ready is not None:
+            ready.set_result(server)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+
+
+def parse_submission(request):
+    # submit 请求中的 DAX 文件路径或已解析的 DAG -> TaskTable
+    if 'dax' in request:
+        from daxparse import WorkflowParser
+        parser = WorkflowParser(request['dax'])
+        parser.parse_dax_file()
+        return parser.get_task_table()
+    tasks = request['tasks']
+    return TaskTable.from_records([task['id'] for task in tasks], [task.get('name', task['id']) for task in tasks],
+                                  [float(task['runtime']) for task in tasks],
+                                  [[tuple(use) for use in task.get('inputs', [])] for task in tasks],
+                                  [[tuple(use) for use in task.get('outputs', [])] for task in tasks],
+                                  [tuple(edge) for edge in request.get('dependencies', [])])
+
+
+class ServiceClient:
+    # 每行一个 JSON 的异步客户端；一个客户端对应一个连接，请求按顺序发送
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, socket_path=None, host='127.0.0.1', port=8765):
+        if socket_path:
+            return cls(*await asyncio.open_unix_connection(socket_path))
+        return cls(*await asyncio.open_connection(host, port))
+
+    async def request(self, **request):
+        self.writer.write(json.dumps(request).encode() + b'\n')
+        await self.writer.drain()
+        response = json.loads(await self.reader.readline())
+        if 'error' in response:
+            raise RuntimeError(response['error'])
+        return response
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Online scheduling service with micro-batched policy inference')
+    parser.add_argument('--socket', default=None, help='Unix 套接字路径；不指定时监听 --host:--port')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--weights', default=None, help='DistributedActorCritic.export_weights() 导出的权重文件')
+    parser.add_argument('--batch-window-us', type=float, default=0,
+                        help='收集同一批请求的最长等待时间(微秒)；为0时只合并处理上一批期间已经排队的请求')
+    parser.add_argument('--max-batch', type=int, default=64)
+    args = parser.parse_args()
+
+    import run
+    policy = None
+    if args.weights:
+        from inference import PolicyEngine
+        policy = PolicyEngine(args.weights)
+    service = SchedulingService(run.cloud_masters, run.edge_masters, policy,
+                                batch_window=args.batch_window_us / 1e6, max_batch=args.max_batch)
+    print(f"Serving {service.action_dim} nodes on {args.socket or f'{args.host}:{args.port}'}")
+    asyncio.run(service.serve(args.socket, args.host, args.port))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+from collections import defaultdict
+
+
+class FileRegistry:
+    """
+    工作流文件索引：在解析或构建环境时一次性建立，
+    提供 文件名 -> 生产任务、文件名 -> 消费任务 以及每条依赖边传输的数据量。
+    """
+    def __init__(self, tasks):
+        self.producers = {}  # 文件名 -> 生产该文件的任务ID
+        self.consumers = defaultdict(list)  # 文件名 -> [(消费任务ID, 该文件在消费任务inputs中的下标)]
+        self.edge_bytes = defaultdict(int)  # (父任务ID, 子任务ID) -> 传输字节数
+
+        for task in tasks.values():
+            for output_file in task.outputs:
+                self.producers[output_file['filename']] = task.task_id
+
+        for task in tasks.values():
+            for i, input_file in enumerate(task.inputs):
+                file_name = input_file['filename']
+                self.consumers[file_name].append((task.task_id, i))
+                producer_id = self.producers.get(file_name)
+                if producer_id is not None:
+                    self.edge_bytes[(producer_id, task.task_id)] += input_file['size']
+
+    @classmethod
+    def from_table(cls, table):
+        # 直接由 TaskTable 的数组建立索引，不经过逐文件的字典
+        registry = cls.__new__(cls)
+        task_ids, file_names = table.task_ids, table.file_names
+        registry.producers = {file_names[f]: task_ids[t] for f, t in enumerate(table.producer.tolist()) if t >= 0}
+        registry.consumers = defaultdict(list)
+        registry.edge_bytes = defaultdict(int)
+        producer = table.producer.tolist()
+        input_ptr = table.input_ptr.tolist()
+        for t, file, size, u in zip(table.input_task.tolist(), table.input_file.tolist(), table.input_size.tolist(), range(len(table.input_file))):
+            registry.consumers[file_names[file]].append((task_ids[t], u - input_ptr[t]))
+            if producer[file] >= 0:
+                registry.edge_bytes[(task_ids[producer[file]], task_ids[t])] += size
+        return registry
+
+    def get_producer(self, file_name):
+        # 没有生产者的文件是工作流的外部输入，由终端设备提供
+        return self.producers.get(file_name)
+
+    def get_consumers(self, file_name):
+        return self.consumers.get(file_name, ())
+
+    def get_edge_bytes(self, parent_id, child_id):
+        return self.edge_bytes.get((parent_id, child_id), 0)
+
+    def __len__(self):
+        return len(self.consumers.keys() | self.producers.keys())
@@ -1,22 +1,110 @@
-from env.platform import *
+from task.task_table import TaskTable
+
 
 class Task:
-    def __init__(self, task_id, name, runtime, inputs, outputs,cpu_demand, ram_demand, storage_demand, bandwidth_demand):
-        self.task_id = task_id
-        self.name = name
-        self.runtime = runtime
-        self.inputs = inputs  # 输入文件，列表形式[(文件名, 数据量, 文件所在位置)]
-        self.outputs = outputs  # 输出文件，列表形式[(文件名, 数据量, 文件所在位置)]
-        self.parents = []
-        self.children = []
-        self.cpu_demand = cpu_demand
-        self.ram_demand = ram_demand
-        self.storage_demand = storage_demand
-        self.bandwidth_demand = bandwidth_demand
-        self.assigned_node_id = None  # 初始化时指定默认值为 None
-        self.input_files_transferred = {input_file['filename']: False for input_file in inputs}
-        self.output_files_transferred = {output_file['filename']: False for output_file in outputs}
-
-    def assign_to_node(self, node_id):
-        self.assigned_node_id = node_id
+    # 任务的所有属性都保存在 TaskTable 的数组中，Task 只是其中一行的视图
+    __slots__ = ('_table', '_row')
+
+    def __init__(self, task_id, name, runtime, inputs, outputs, cpu_demand=1, ram_demand=1, storage_demand=1, bandwidth_demand=0):
+        # 单独创建的任务使用只有一行的任务表，加入工作流(TaskTable.from_tasks)时再切换到共享的任务表。
+        # inputs/outputs 为 [{'filename': 文件名, 'size': 数据量}, ...]
+        demands = {'cpu_demand': [cpu_demand], 'ram_demand': [ram_demand],
+                   'storage_demand': [storage_demand], 'bandwidth_demand': [bandwidth_demand]}
+        table = TaskTable.from_records([task_id], [name], [runtime],
+                                       [[(f['filename'], f['size']) for f in inputs]],
+                                       [[(f['filename'], f['size']) for f in outputs]], [], demands)
+        self.bind(table, 0)
+
+    @classmethod
+    def view(cls, table, row):
+        task = cls.__new__(cls)
+        task.bind(table, row)
+        return task
+
+    def bind(self, table, row):
+        self._table = table
+        self._row = row
+
+    @property
+    def table(self):
+        return self._table
+    @property
+    def row(self):
+        return self._row
+
+    @property
+    def task_id(self):
+        return self._table.task_ids[self._row]
+    @property
+    def name(self):
+        return self._table.names[self._row]
+    @property
+    def runtime(self):
+        return float(self._table.runtime[self._row])
+
+    @property
+    def cpu_demand(self):
+        return float(self._table.cpu_demand[self._row])
+    @cpu_demand.setter
+    def cpu_demand(self, value):
+        self._table.cpu_demand[self._row] = value
+    @property
+    def ram_demand(self):
+        return float(self._table.ram_demand[self._row])
+    @ram_demand.setter
+    def ram_demand(self, value):
+        self._table.ram_demand[self._row] = value
+    @property
+    def storage_demand(self):
+        return float(self._table.storage_demand[self._row])
+    @storage_demand.setter
+    def storage_demand(self, value):
+        self._table.storage_demand[self._row] = value
+    @property
+    def bandwidth_demand(self):
+        return float(self._table.bandwidth_demand[self._row])
+    @bandwidth_demand.setter
+    def bandwidth_demand(self, value):
+        self._table.bandwidth_demand[self._row] = value
+
+    # 父子任务：parent_indices/child_indices 直接返回 CSR 数组的切片，parents/children 返回任务ID列表
+    @property
+    def parent_indices(self):
+        table = self._table
+        return table.parent_idx[table.parent_ptr[self._row]:table.parent_ptr[self._row + 1]]
+    @property
+    def child_indices(self):
+        table = self._table
+        return table.child_idx[table.child_ptr[self._row]:table.child_ptr[self._row + 1]]
+    @property
+    def parents(self):
+        return [self._table.task_ids[i] for i in self.parent_indices.tolist()]
+    @property
+    def children(self):
+        return [self._table.task_ids[i] for i in self.child_indices.tolist()]
+
+    # 输入/输出文件：*_slice 是该任务在使用关系数组中的范围，inputs/outputs 按需生成兼容的字典列表
+    @property
+    def input_slice(self):
+        return slice(self._table.input_ptr[self._row], self._table.input_ptr[self._row + 1])
+    @property
+    def output_slice(self):
+        return slice(self._table.output_ptr[self._row], self._table.output_ptr[self._row + 1])
+
+    def input_records(self):
+        table, uses = self._table, self.input_slice
+        return [(table.file_names[f], s) for f, s in zip(table.input_file[uses].tolist(), table.input_size[uses].tolist())]
+
+    def output_records(self):
+        table, uses = self._table, self.output_slice
+        return [(table.file_names[f], s) for f, s in zip(table.output_file[uses].tolist(), table.output_size[uses].tolist())]
+
+    @property
+    def inputs(self):
+        return [{'filename': file_name, 'size': size} for file_name, size in self.input_records()]
+    @property
+    def outputs(self):
+        return [{'filename': file_name, 'size': size} for file_name, size in self.output_records()]
 
+    def __repr__(self):
+        return f"Task({self.task_id!r}, {self.name!r}, runtime={self.runtime})"
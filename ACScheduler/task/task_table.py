@@ -0,0 +1,196 @@
+import numpy as np
+
+
+def _csr(groups, values, num_groups):
+    # 按 groups 稳定排序得到 CSR：ptr[g]:ptr[g+1] 是第 g 组的 values，组内保持原有顺序
+    order = np.argsort(groups, kind='stable')
+    ptr = np.zeros(num_groups + 1, dtype=np.int64)
+    np.cumsum(np.bincount(groups, minlength=num_groups), out=ptr[1:])
+    return ptr, values[order].astype(np.int32)
+
+
+class TaskTable:
+    """
+    列式存储的工作流任务表：任务按下标编号，运行时间和资源需求是定长数组，
+    输入/输出文件的使用关系和父子依赖都是 CSR 形式的整数数组。
+    Task 只是表中一行的视图，遍历父子任务和文件时直接切片这些数组，不再为每个文件创建字典。
+    """
+    DEMAND_DEFAULTS = (('cpu_demand', 1.0), ('ram_demand', 1.0), ('storage_demand', 1.0), ('bandwidth_demand', 0.0))
+
+    def __init__(self, task_ids, names, runtime, file_names, input_ptr, input_file, input_size,
+                 output_ptr, output_file, output_size, edges, demands=None):
+        self.task_ids = list(task_ids)
+        self.index = {task_id: i for i, task_id in enumerate(self.task_ids)}
+        self.names = list(names)
+        n = len(self.task_ids)
+        self.runtime = np.asarray(runtime, dtype=np.float64)
+        for name, default in self.DEMAND_DEFAULTS:
+            values = (demands or {}).get(name)
+            setattr(self, name, np.full(n, default) if values is None else np.asarray(values, dtype=np.float64))
+
+        # 文件表和任务对文件的使用(CSR)；同一文件在不同任务中记录的大小可能不同，大小按使用关系存储
+        self.file_names = list(file_names)
+        self.file_index = {file_name: i for i, file_name in enumerate(self.file_names)}
+        self.input_ptr = np.asarray(input_ptr, dtype=np.int64)
+        self.input_file = np.asarray(input_file, dtype=np.int32)
+        self.input_size = np.asarray(input_size, dtype=np.int64)
+        self.output_ptr = np.asarray(output_ptr, dtype=np.int64)
+        self.output_file = np.asarray(output_file, dtype=np.int32)
+        self.output_size = np.asarray(output_size, dtype=np.int64)
+
+        # 父子依赖(CSR)，顺序与依赖边出现的顺序一致
+        self.edges = np.asarray(edges, dtype=np.int32).reshape(-1, 2)
+        self.parent_ptr, self.parent_idx = _csr(self.edges[:, 1], self.edges[:, 0], n)
+        self.child_ptr, self.child_idx = _csr(self.edges[:, 0], self.edges[:, 1], n)
+
+        # 文件 -> 生产任务下标(-1 表示外部输入)；多个任务输出同一文件时以最后一个为准
+        self.producer = np.full(len(self.file_names), -1, dtype=np.int32)
+        for task, file in zip(np.repeat(np.arange(n), np.diff(self.output_ptr)).tolist(), self.output_file.tolist()):
+            self.producer[file] = task
+
+        from task.task import Task
+        self.tasks = {task_id: Task.view(self, i) for i, task_id in enumerate(self.task_ids)}
+
+    @classmethod
+    def from_records(cls, task_ids, names, runtimes, inputs, outputs, dependencies, demands=None):
+        """
+        由逐任务的记录构建任务表：inputs/outputs[i] 是第 i 个任务的 [(文件名, 大小)]，
+        dependencies 是 (父任务ID, 子任务ID) 列表。
+        """
+        file_index = {}
+        columns = []
+        for uses in (inputs, outputs):
+            ptr = np.zeros(len(uses) + 1, dtype=np.int64)
+            np.cumsum([len(files) for files in uses], out=ptr[1:])
+            files = [file_index.setdefault(file_name, len(file_index)) for files in uses for file_name, _ in files]
+            sizes = [size for files in uses for _, size in files]
+            columns.append((ptr, files, sizes))
+        index = {task_id: i for i, task_id in enumerate(task_ids)}
+        edges = [(index[parent_id], index[child_id]) for parent_id, child_id in dependencies]
+        return cls(task_ids, names, runtimes, list(file_index), *columns[0], *columns[1], edges, demands)
+
+    @classmethod
+    def from_tasks(cls, tasks, dependencies):
+        # 把一组(可能来自不同任务表的)任务复制到一张新表中，并把这些 Task 重新绑定到新表上
+        tasks = list(tasks)
+        demands = {name: [getattr(task, name) for task in tasks] for name, _ in cls.DEMAND_DEFAULTS}
+        table = cls.from_records([task.task_id for task in tasks], [task.name for task in tasks], [task.runtime for task in tasks],
+                                 [task.input_records() for task in tasks], [task.output_records() for task in tasks],
+                                 dependencies, demands)
+        for i, task in enumerate(tasks):
+            task.bind(table, i)
+            table.tasks[task.task_id] = task
+        return table
+
+    @classmethod
+    def of(cls, tasks, dependencies):
+        # tasks 正好是某张表的全部任务且顺序一致时直接复用该表，否则复制成新表
+        table = None
+        for i, task in enumerate(tasks.values()):
+            if table is None:
+                table = task.table
+            if task.table is not table or task.row != i:
+                return cls.from_tasks(tasks.values(), dependencies)
+        if table is None or len(table) != len(tasks):
+            return cls.from_tasks(tasks.values(), dependencies)
+        return table
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        # 由 to_arrays() 的结果(例如解析缓存)还原
+        demands = {name: arrays[name] for name, _ in cls.DEMAND_DEFAULTS if name in arrays}
+        return cls(arrays['task_ids'].tolist(), arrays['task_names'].tolist(), arrays['runtimes'], arrays['file_names'].tolist(),
+                   arrays['input_ptr'], arrays['input_file'], arrays['input_size'],
+                   arrays['output_ptr'], arrays['output_file'], arrays['output_size'], arrays['edges'], demands)
+
+    @classmethod
+    def concat(cls, tables, prefixes):
+        """
+        把多个工作流拼成一张表：第 k 张表的任务ID和文件名加上 prefixes[k] 前缀(不同实例的同名文件互不相干)，
+        任务、文件和使用关系的下标依次平移，每个工作流的任务在新表中占据一段连续的下标。
+        """
+        task_offsets = np.cumsum([0] + [len(table) for table in tables])
+        file_offsets = np.cumsum([0] + [len(table.file_names) for table in tables])
+        columns = {}
+        for side in ('input', 'output'):
+            use_offsets = np.cumsum([0] + [len(getattr(table, f'{side}_file')) for table in tables])
+            columns[f'{side}_ptr'] = np.concatenate([[0]] + [getattr(table, f'{side}_ptr')[1:] + use_offsets[k]
+                                                             for k, table in enumerate(tables)])
+            columns[f'{side}_file'] = np.concatenate([getattr(table, f'{side}_file') + file_offsets[k] for k, table in enumerate(tables)])
+            columns[f'{side}_size'] = np.concatenate([getattr(table, f'{side}_size') for table in tables])
+        demands = {name: np.concatenate([getattr(table, name) for table in tables]) for name, _ in cls.DEMAND_DEFAULTS}
+        return cls([f'{prefix}{task_id}' for prefix, table in zip(prefixes, tables) for task_id in table.task_ids],
+                   [name for table in tables for name in table.names],
+                   np.concatenate([table.runtime for table in tables]),
+                   [f'{prefix}{file_name}' for prefix, table in zip(prefixes, tables) for file_name in table.file_names],
+                   columns['input_ptr'], columns['input_file'], columns['input_size'],
+                   columns['output_ptr'], columns['output_file'], columns['output_size'],
+                   np.concatenate([table.edges + task_offsets[k] for k, table in enumerate(tables)]), demands)
+
+    def to_arrays(self):
+        arrays = {
+            'task_ids': np.array(self.task_ids, dtype=str),
+            'task_names': np.array(self.names, dtype=str),
+            'runtimes': self.runtime,
+            'file_names': np.array(self.file_names, dtype=str),
+            'input_ptr': self.input_ptr, 'input_file': self.input_file, 'input_size': self.input_size,
+            'output_ptr': self.output_ptr, 'output_file': self.output_file, 'output_size': self.output_size,
+            'edges': self.edges,
+        }
+        for name, _ in self.DEMAND_DEFAULTS:
+            arrays[name] = getattr(self, name)
+        return arrays
+
+    @property
+    def input_task(self):
+        # 每个输入使用关系所属的任务下标
+        return np.repeat(np.arange(len(self), dtype=np.int32), np.diff(self.input_ptr))
+
+    def input_consumers(self):
+        # 文件 -> 读取它的输入使用下标(CSR)，用于从生产任务直接找到下游的输入
+        return _csr(self.input_file, np.arange(len(self.input_file)), len(self.file_names))
+
+    def topological_order(self):
+        # Kahn 算法：父任务总是排在子任务之前；存在环时抛出 ValueError
+        indegree = np.diff(self.parent_ptr).tolist()
+        child_ptr = self.child_ptr.tolist()
+        child_idx = self.child_idx.tolist()
+        order = [i for i, degree in enumerate(indegree) if degree == 0]
+        for i in order:
+            for child in child_idx[child_ptr[i]:child_ptr[i + 1]]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    order.append(child)
+        if len(order) != len(self):
+            raise ValueError("Workflow dependencies contain a cycle.")
+        return np.array(order, dtype=np.int64)
+
+    def bottom_levels(self):
+        # 每个任务从开始执行到工作流结束至少需要的时间：自身运行时间 + 子任务中最大的 bottom level(不含传输)
+        runtime = self.runtime.tolist()
+        child_ptr = self.child_ptr.tolist()
+        child_idx = self.child_idx.tolist()
+        level = [0.0] * len(self)
+        for i in self.topological_order()[::-1].tolist():
+            level[i] = runtime[i] + max((level[c] for c in child_idx[child_ptr[i]:child_ptr[i + 1]]), default=0.0)
+        return np.array(level, dtype=np.float64)
+
+    def child_bytes(self):
+        # 与 child_idx 对齐：每条 父 -> 子 依赖边上传输的字节数(子任务读取的、由父任务生产的所有文件)
+        n = len(self)
+        producer = self.producer[self.input_file].astype(np.int64)
+        produced = producer >= 0
+        keys, inverse = np.unique(producer[produced] * n + self.input_task[produced], return_inverse=True)
+        sums = np.bincount(inverse, weights=self.input_size[produced], minlength=len(keys))
+        if not len(keys):
+            return np.zeros(len(self.child_idx), dtype=np.float64)
+        parents = np.repeat(np.arange(n, dtype=np.int64), np.diff(self.child_ptr))
+        edge_keys = parents * n + self.child_idx
+        pos = np.minimum(np.searchsorted(keys, edge_keys), len(keys) - 1)
+        return np.where(keys[pos] == edge_keys, sums[pos], 0.0)
+
+    def nbytes(self):
+        return sum(value.nbytes for value in vars(self).values() if isinstance(value, np.ndarray))
+
+    def __len__(self):
+        return len(self.task_ids)
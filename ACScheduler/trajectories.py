@@ -0,0 +1,205 @@
+"""
+列式轨迹存储：训练时产生的 (观测, 动作掩码, 动作, 奖励, 状态价值, 是否结束) 按列追加写入目录中的原始二进制文件，
+每个episode是文件中连续的一段(块)，episodes 索引记录每块的起止行。读取端用 np.memmap 映射这些文件，
+按块打乱顺序、在有限大小的缓冲区内再打乱行，流式给出小批量，内存占用只与缓冲区大小有关，与存储的总量无关。
+不依赖 TensorFlow。
+
+    writer = TrajectoryWriter('runs/montage', observation_dim, action_dim)
+    train_distributed_actor_critic(env, agent, recorder=writer)
+    writer.close()
+
+    store = TrajectoryStore('runs/montage')
+    for batch in store.minibatches(256, columns=('observations', 'masks', 'actions', 'next_observations')):
+        ...
+
+目录结构：每列一个 <列名>.bin(行优先，行宽见 manifest.json)，manifest.json 记录列的类型和形状、
+已提交的行数以及每个episode的 [起始行, 行数] 和摘要信息。只有写完整的episode才会计入 manifest，
+写到一半中断的数据在读取时被忽略，再次打开写入时会被截掉。
+"""
+import json
+import os
+
+import numpy as np
+
+MANIFEST = 'manifest.json'
+FORMAT_VERSION = 1
+
+
+def trajectory_columns(observation_dim, action_dim):
+    # 列名 -> (dtype, 每行的形状)
+    return {
+        'observations': ('<f4', (observation_dim,)),
+        'masks': ('|b1', (action_dim,)),
+        'actions': ('<i4', ()),
+        'rewards': ('<f4', ()),
+        'values': ('<f4', ()),
+        'dones': ('|b1', ()),
+    }
+
+
+def read_manifest(directory):
+    with open(os.path.join(directory, MANIFEST)) as file:
+        manifest = json.load(file)
+    if manifest.get('version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported trajectory store version {manifest.get('version')!r} in {directory}.")
+    return manifest
+
+
+class TrajectoryWriter:
+    """
+    追加写入轨迹。append/append_batch 先写进预分配的内存缓冲区，满 flush_rows 行或episode结束时整块追加到各列文件；
+    end_episode 提交当前episode并更新 manifest。目录已存在时在原有数据之后继续追加(列定义必须一致)。
+    没有价值估计时 values 记为 NaN。
+    """
+    def __init__(self, directory, observation_dim, action_dim, flush_rows=4096):
+        self.directory = directory
+        self.columns = trajectory_columns(observation_dim, action_dim)
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(os.path.join(directory, MANIFEST)):
+            self.manifest = read_manifest(directory)
+            expected = {name: [dtype, list(shape)] for name, (dtype, shape) in self.columns.items()}
+            if self.manifest['columns'] != expected:
+                raise ValueError(f"Trajectory store {directory} has different columns: {self.manifest['columns']}.")
+        else:
+            self.manifest = {'version': FORMAT_VERSION, 'rows': 0, 'episodes': [],
+                             'columns': {name: [dtype, list(shape)] for name, (dtype, shape) in self.columns.items()}}
+        self.files = {}
+        for name, (dtype, shape) in self.columns.items():
+            path = os.path.join(directory, f'{name}.bin')
+            file = open(path, 'ab')
+            # 丢弃上次中断时未提交的行
+            file.truncate(self.manifest['rows'] * np.dtype(dtype).itemsize * int(np.prod(shape, dtype=np.int64)))
+            self.files[name] = file
+        self.buffers = {name: np.zeros((flush_rows,) + shape, dtype=dtype) for name, (dtype, shape) in self.columns.items()}
+        self.buffers['values'][:] = np.nan
+        self.buffered = 0
+        self.episode_start = self.manifest['rows']
+        self.written = self.manifest['rows']  # 已写入文件(含未提交)的行数
+
+    def append(self, observation, mask, action, reward, done, value=np.nan):
+        self.append_batch(np.asarray(observation)[None], np.asarray(mask)[None], [action], [reward], [done], [value])
+
+    def append_batch(self, observations, masks, actions, rewards, dones, values=None):
+        rows = {'observations': observations, 'masks': masks, 'actions': actions, 'rewards': rewards, 'dones': dones,
+                'values': values}
+        count = len(actions)
+        offset = 0
+        while offset < count:
+            take = min(count - offset, len(self.buffers['actions']) - self.buffered)
+            target = slice(self.buffered, self.buffered + take)
+            for name, data in rows.items():
+                if data is None:
+                    self.buffers[name][target] = np.nan
+                else:
+                    self.buffers[name][target] = data[offset:offset + take]
+            self.buffered += take
+            offset += take
+            if self.buffered == len(self.buffers['actions']):
+                self.flush()
+
+    def flush(self):
+        for name, buffer in self.buffers.items():
+            self.files[name].write(buffer[:self.buffered].tobytes())
+        self.written += self.buffered
+        self.buffered = 0
+
+    def end_episode(self, **info):
+        # 当前episode的所有行成为一个块并写入 manifest；info 中的标量(回报、makespan 等)一并记录
+        self.flush()
+        for file in self.files.values():
+            file.flush()
+        if self.written == self.episode_start:
+            return
+        self.manifest['episodes'].append({'start': self.episode_start, 'length': self.written - self.episode_start,
+                                          **{key: float(value) for key, value in info.items()}})
+        self.manifest['rows'] = self.written
+        self.episode_start = self.written
+        temporary = os.path.join(self.directory, MANIFEST + '.tmp')
+        with open(temporary, 'w') as file:
+            json.dump(self.manifest, file)
+        os.replace(temporary, os.path.join(self.directory, MANIFEST))
+
+    def close(self):
+        # 未结束的episode不提交
+        for file in self.files.values():
+            file.close()
+        self.files = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class TrajectoryStore:
+    """
+    只读地映射一个轨迹目录：columns[name] 是 (行数, ...) 的 memmap，episodes 是 (episode数, 2) 的 [起始行, 行数]。
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        self.manifest = read_manifest(directory)
+        self.rows = self.manifest['rows']
+        self.columns = {}
+        for name, (dtype, shape) in self.manifest['columns'].items():
+            path = os.path.join(directory, f'{name}.bin')
+            self.columns[name] = (np.memmap(path, dtype=dtype, mode='r', shape=(self.rows,) + tuple(shape))
+                                  if self.rows else np.zeros((0,) + tuple(shape), dtype=dtype))
+        self.episodes = np.array([[episode['start'], episode['length']] for episode in self.manifest['episodes']],
+                                 dtype=np.int64).reshape(-1, 2)
+
+    def __len__(self):
+        return self.rows
+
+    def episode(self, k):
+        start, length = self.episodes[k]
+        return {name: column[start:start + length] for name, column in self.columns.items()}
+
+    def episode_info(self):
+        return self.manifest['episodes']
+
+    def gather(self, rows, columns):
+        """
+        按行号读取若干列；rows 应升序以便顺序读盘。
+        'next_observations' 是下一行的观测(episode最后一行取自身，配合 dones 使用)。
+        """
+        batch = {}
+        for name in columns:
+            if name == 'next_observations':
+                following = np.minimum(rows + 1, self.rows - 1)
+                following = np.where(self.columns['dones'][rows], rows, following)
+                batch[name] = self.columns['observations'][following]
+            else:
+                batch[name] = self.columns[name][rows]
+        return batch
+
+    def minibatches(self, batch_size, columns=('observations', 'masks', 'actions', 'rewards', 'values', 'dones'),
+                    shuffle_buffer=65536, seed=None, drop_last=False):
+        """
+        遍历一遍全部数据，产生打乱的小批量(每列一个数组的字典)。episode块的顺序随机，
+        依次读满 shuffle_buffer 行后在缓冲区内打乱并按批给出，剩余不足一批的行并入下一个缓冲区。
+        """
+        rng = np.random.default_rng(seed)
+        pending = np.zeros(0, dtype=np.int64)
+        order = rng.permutation(len(self.episodes))
+        k = 0
+        while k < len(order) or len(pending):
+            chunks = [pending]
+            size = len(pending)
+            while k < len(order) and size < shuffle_buffer:
+                start, length = self.episodes[order[k]]
+                chunks.append(np.arange(start, start + length))
+                size += length
+                k += 1
+            rows = np.concatenate(chunks)
+            rows = rows[rng.permutation(len(rows))]
+            usable = len(rows) if k == len(order) else len(rows) - len(rows) % batch_size
+            for first in range(0, usable, batch_size):
+                batch = rows[first:first + batch_size]
+                if len(batch) < batch_size and drop_last:
+                    break
+                order_in_batch = np.argsort(batch, kind='stable')
+                yield self.gather(batch[order_in_batch], columns)
+            pending = rows[usable:]
+            if k == len(order):
+                break